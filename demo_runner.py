@@ -6,7 +6,7 @@ Let users input their own numbers → instantly see the BEST strategy
 
 from retire_plan import PersonProfile
 from retire_plan.accounts import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
-from retire_plan.simulation.engine import Simulator
+from retire_plan.simulation.session import PlanningSession
 from retire_plan.strategies.policies import (
     contrib_max_tfsa_first,
     contrib_max_rrsp_first,
@@ -14,6 +14,7 @@ from retire_plan.strategies.policies import (
     strategy_spend_rrsp_first,
     strategy_smooth_with_tfsa,
 )
+from retire_plan.strategies.analysis import wealth_path
 
 import matplotlib.pyplot as plt
 
@@ -33,6 +34,18 @@ def get_float(prompt: str, default: float | None = None, min_val: float | None =
             print("   Please enter a valid number")
 
 
+def print_best(name: str, end_age: int, best: dict) -> None:
+    print("OPTIMAL STRATEGY FOUND".center(60, "="))
+    print(f"Name                  : {name}")
+    print(f"Best Contribution     : {best['contrib_strategy']}")
+    print(f"Best Withdrawal       : {best['withdraw_strategy']}")
+    print(f"Lifetime Tax Paid     : ${best['total_tax_paid']:,.0f}")
+    print(f"Final Wealth (Age {end_age}) : ${best['final_wealth']:,.0f}")
+    print(f"Peak Wealth           : ${best['peak_wealth']:,.0f}")
+    print(f"Success (Funds last)  : {'YES' if best['success'] else 'NO'}")
+    print("="*60)
+
+
 def main():
     print("\n" + "="*60)
     print("    RETIREMENT PLAN OPTIMIZER – Interactive Mode".center(60))
@@ -77,8 +90,8 @@ def main():
     print("   Testing all 6 strategy combinations...\n")
 
     # === Run Optimizer ===
-    results = Simulator.optimize(
-        base_profile=profile,
+    session = PlanningSession(
+        profile,
         contribution_strategies=[
             ("TFSA-First", contrib_max_tfsa_first),
             ("RRSP-First", contrib_max_rrsp_first),
@@ -92,24 +105,24 @@ def main():
         annual_savings=annual_savings,
         annual_spending=desired_spending,
     )
+    best = session.results()[0]
+    print_best(name, end_age, best)
 
-    best = results[0]
-
-    # === Results ===
-    print("OPTIMAL STRATEGY FOUND".center(60, "="))
-    print(f"Name                  : {name}")
-    print(f"Best Contribution     : {best['contrib_strategy']}")
-    print(f"Best Withdrawal       : {best['withdraw_strategy']}")
-    print(f"Lifetime Tax Paid     : ${best['total_tax_paid']:,.0f}")
-    print(f"Final Wealth (Age {end_age}) : ${best['final_wealth']:,.0f}")
-    print(f"Peak Wealth           : ${best['peak_wealth']:,.0f}")
-    print(f"Success (Funds last)  : {'YES' if best['success'] else 'NO'}")
-    print("="*60)
+    # === What-if: retirement-only changes rerun just the retirement years ===
+    while True:
+        value = input("\nWhat-if: new annual spending ($) [blank to finish]: ").strip()
+        if not value:
+            break
+        try:
+            spending = float(value.replace(",", "").replace("$", ""))
+            best = session.update(annual_spending=spending)[0]
+        except ValueError as exc:
+            print(f"   {exc}")
+            continue
+        print_best(name, end_age, best)
 
     # === Graph ===
-    history = best["history"]
-    ages = [y["age"] for y in history]
-    wealth = [y["total_wealth"] for y in history]
+    ages, wealth = wealth_path(best["history"])
 
     plt.figure(figsize=(15, 9))
     plt.plot(ages, wealth, color='green', linewidth=4, label="Your Optimal Path")
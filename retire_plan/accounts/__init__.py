@@ -6,9 +6,11 @@ This subpackage defines:
 - AccountBase: abstract base class for all investment / savings accounts
 - TaxDeferredAccount: e.g., RRSP / RRIF / LIRA / LIF (withdrawals fully taxable)
 - TaxFreeAccount: e.g., TFSA (withdrawals not taxable)
-- TaxableAccount: non-registered account (simplified tax behavior for now)
+- TaxableAccount: non-registered account (average-cost ACB, taxed on realized gains)
 - PersonProfile: container for a single retiree / household, holding
   all three account types plus basic demographic and benefit info.
+- cpp_adjustment / oas_adjustment: early/late start factors for CPP and OAS.
+- rrif_minimum_factor: prescribed RRIF minimum-withdrawal factor by age.
 
 Typical usage
 -------------
@@ -42,8 +44,11 @@ from .models import (
     TaxDeferredAccount,
     TaxFreeAccount,
     TaxableAccount,
+    taxable_gain_share,
 )
+from .benefits import cpp_adjustment, oas_adjustment
 from .profile import PersonProfile
+from .rrif import RRIF_CONVERSION_AGE, rrif_minimum_factor
 
 # What we export when someone does:
 #   from retire_plan.accounts import *
@@ -52,5 +57,10 @@ __all__ = [
     "TaxDeferredAccount",
     "TaxFreeAccount",
     "TaxableAccount",
+    "taxable_gain_share",
     "PersonProfile",
+    "cpp_adjustment",
+    "oas_adjustment",
+    "RRIF_CONVERSION_AGE",
+    "rrif_minimum_factor",
 ]
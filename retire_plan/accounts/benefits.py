@@ -0,0 +1,60 @@
+"""
+Government benefit start-age rules for the retire_plan package.
+
+CPP can start between 60 and 70 and OAS between 65 and 70.  The amount a
+person receives depends on when it starts, relative to the standard age 65:
+
+- CPP: reduced by 0.6% per month before 65 (36% less at 60), increased by
+  0.7% per month after 65 (42% more at 70)
+- OAS: increased by 0.6% per month after 65 (36% more at 70)
+
+Start ages are whole years, so each year of deferral is 12 months.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+STANDARD_START_AGE = 65
+
+CPP_EARLIEST_AGE = 60
+CPP_LATEST_AGE = 70
+CPP_EARLY_REDUCTION = 0.006   # per month before 65
+CPP_LATE_INCREASE = 0.007     # per month after 65
+
+OAS_EARLIEST_AGE = 65
+OAS_LATEST_AGE = 70
+OAS_LATE_INCREASE = 0.006     # per month after 65
+
+
+def _months_from_standard(start_age: Any, earliest: int, latest: int, benefit: str) -> np.ndarray:
+    ages = np.asarray(start_age)
+    if ((ages < earliest) | (ages > latest)).any():
+        raise ValueError(f"{benefit} start age must be between {earliest} and {latest}: {start_age}")
+    return (ages - STANDARD_START_AGE) * 12.0
+
+
+def cpp_adjustment(start_age: Any) -> Any:
+    """Multiplier on the age-65 CPP amount when CPP starts at ``start_age``.
+
+    Accepts a single age or an array of ages.
+
+    >>> round(cpp_adjustment(60), 4), round(cpp_adjustment(70), 4)
+    (0.64, 1.42)
+    """
+    months = _months_from_standard(start_age, CPP_EARLIEST_AGE, CPP_LATEST_AGE, "CPP")
+    factor = 1.0 + np.where(months < 0, CPP_EARLY_REDUCTION, CPP_LATE_INCREASE) * months
+    return float(factor) if factor.ndim == 0 else factor
+
+
+def oas_adjustment(start_age: Any) -> Any:
+    """Multiplier on the age-65 OAS amount when OAS starts at ``start_age``.
+
+    >>> round(oas_adjustment(70), 4)
+    1.36
+    """
+    months = _months_from_standard(start_age, OAS_EARLIEST_AGE, OAS_LATEST_AGE, "OAS")
+    factor = 1.0 + OAS_LATE_INCREASE * months
+    return float(factor) if factor.ndim == 0 else factor
@@ -3,16 +3,38 @@ Account models for the retire_plan package.
 
 Defines:
 - AccountBase: abstract base class
-- TaxDeferredAccount: e.g., RRSP/RRIF/LIRA/LIF (fully taxable withdrawals)
+- TaxDeferredAccount: e.g., RRSP/RRIF/LIRA/LIF (fully taxable withdrawals,
+  optional RRIF minimums)
 - TaxFreeAccount: e.g., TFSA (withdrawals not taxable)
-- TaxableAccount: non-registered account (simplified tax treatment for now)
+- TaxableAccount: non-registered account (average-cost ACB, taxed on
+  realized capital gains)
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .rrif import rrif_minimum_factor
+
+# Share of a realized capital gain that is taxable income
+CAPITAL_GAINS_INCLUSION = 0.5
+
+
+def taxable_gain_share(cost_base, balance):
+    """Taxable income per dollar withdrawn from a taxable account.
+
+    ``CAPITAL_GAINS_INCLUSION`` times the unrealized-gain share of the
+    balance; works on scalars and on ``(paths,)`` arrays alike.
+    """
+    cost = np.asarray(cost_base, dtype=float)
+    bal = np.asarray(balance, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain = np.where(bal > 0, 1.0 - cost / np.where(bal > 0, bal, 1.0), 0.0)
+    return CAPITAL_GAINS_INCLUSION * np.maximum(gain, 0.0)
 
 
 @dataclass
@@ -116,11 +138,25 @@ class AccountBase(ABC):
 class TaxDeferredAccount(AccountBase):
     """Tax-deferred account (e.g., RRSP / RRIF / LIRA / LIF).
 
-    Simplifying assumption for the skeleton:
+    Simplifying assumptions:
     - 100% of withdrawals are taxable income.
-    - No explicit withdrawal minimums/maximums yet (to be refined later).
+    - No withdrawal maximums.
+
+    Attributes
+    ----------
+    rrif_conversion_age : int or None
+        Age at which the account becomes a RRIF (usually 71, see
+        ``retire_plan.accounts.rrif``).  From the year starting at that age
+        the simulators withdraw at least ``rrif_minimum(age)``, whatever the
+        strategy planned.  ``None`` (default): no minimums.
     """
 
+    rrif_conversion_age: Optional[int] = None
+
+    def rrif_minimum(self, age: int) -> float:
+        """Prescribed minimum withdrawal for the year starting at ``age``."""
+        return rrif_minimum_factor(age, self.rrif_conversion_age) * max(self.balance, 0.0)
+
     def withdraw(self, amount: float) -> Tuple[float, float]:
         actual = self._clamp_withdrawal(amount)
         taxable_income = actual  # fully taxable
@@ -147,17 +183,39 @@ class TaxFreeAccount(AccountBase):
 class TaxableAccount(AccountBase):
     """Taxable (non-registered) account.
 
-    Skeleton assumption for now:
-    - Treat withdrawals as fully taxable (very conservative).
-    - Later we can refine to split principal vs. gains.
+    Tracks the adjusted cost base (ACB) as a single average-cost amount:
+    deposits add to it, and each withdrawal removes the same share of the
+    ACB as of the balance.  Only the realized capital gain is taxable, at
+    the ``CAPITAL_GAINS_INCLUSION`` rate; losses are not deducted.
 
-    TODO
-    ----
-    - Implement more realistic capital gains treatment if needed.
+    Attributes
+    ----------
+    cost_base : float or None
+        Adjusted cost base.  ``None`` (default) starts it at the opening
+        balance, i.e. no unrealized gains yet.
     """
 
+    cost_base: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.cost_base is None:
+            self.cost_base = float(self.balance)
+
+    def deposit(self, amount: float) -> None:
+        super().deposit(amount)
+        self.cost_base += float(amount)
+
+    def taxable_share(self) -> float:
+        """Share of a withdrawal that would be taxable income right now."""
+        return float(taxable_gain_share(self.cost_base, self.balance))
+
     def withdraw(self, amount: float) -> Tuple[float, float]:
+        before = self.balance
         actual = self._clamp_withdrawal(amount)
-        taxable_income = actual  # SIMPLE placeholder
+        if actual <= 0:
+            return 0.0, 0.0
+        removed = actual * (self.cost_base / before)
+        self.cost_base -= removed
+        taxable_income = CAPITAL_GAINS_INCLUSION * max(actual - removed, 0.0)
         cash_to_spend = actual
         return taxable_income, cash_to_spend
@@ -9,8 +9,9 @@ Defines:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
+from .benefits import cpp_adjustment, oas_adjustment
 from .models import AccountBase
 
 
@@ -38,6 +39,12 @@ class PersonProfile:
         Baseline annual CPP benefit (in today's dollars).
     oas_annual : float
         Baseline annual OAS benefit (in today's dollars).
+    cpp_start_age, oas_start_age : int or None
+        Age at which CPP (60-70) / OAS (65-70) starts.  When set, the
+        baseline amount is the age-65 entitlement; it is adjusted for early
+        or late start (see ``retire_plan.accounts.benefits``) and only paid
+        from that age on.  ``None`` (default) pays the baseline amount in
+        every simulated year.
     """
 
     name: str
@@ -50,6 +57,13 @@ class PersonProfile:
 
     cpp_annual: float = 0.0
     oas_annual: float = 0.0
+    cpp_start_age: Optional[int] = None
+    oas_start_age: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        # Validates the start ages (raises ValueError outside the legal range)
+        self.cpp_benefit()
+        self.oas_benefit()
 
     def all_balances(self) -> Dict[str, float]:
         """Return a dict of all account balances.
@@ -85,20 +99,59 @@ class PersonProfile:
         return diff
 
 
-    def annual_gov_benefits(self) -> float:
-        """Total annual government pension income (CPP + OAS)."""
-        return float(self.cpp_annual + self.oas_annual)
+    def cpp_benefit(self) -> float:
+        """Annual CPP once it is being paid, adjusted for the start age."""
+        if self.cpp_start_age is None:
+            return float(self.cpp_annual)
+        return float(self.cpp_annual) * cpp_adjustment(self.cpp_start_age)
+
+    def oas_benefit(self) -> float:
+        """Annual OAS once it is being paid, adjusted for the start age."""
+        if self.oas_start_age is None:
+            return float(self.oas_annual)
+        return float(self.oas_annual) * oas_adjustment(self.oas_start_age)
+
+    def cpp_income(self, age: int) -> float:
+        """CPP received in the year starting at ``age``."""
+        if self.cpp_start_age is not None and age < self.cpp_start_age:
+            return 0.0
+        return self.cpp_benefit()
+
+    def oas_income(self, age: int) -> float:
+        """OAS received in the year starting at ``age``."""
+        if self.oas_start_age is not None and age < self.oas_start_age:
+            return 0.0
+        return self.oas_benefit()
 
-    def snapshot(self) -> Dict[str, float]:
+    def annual_gov_benefits(self, age: Optional[int] = None) -> float:
+        """Total annual government pension income (CPP + OAS).
+
+        With ``age``, only the benefits already started by then count.
+        """
+        if age is None:
+            return self.cpp_benefit() + self.oas_benefit()
+        return self.cpp_income(age) + self.oas_income(age)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
         """Convenience method: one-line snapshot of this profile.
 
         Returns a flat dict that can be logged or turned into a DataFrame.
+        It holds every input the simulators read, so two profiles with the
+        same snapshot simulate identically.  Settings that are not in use
+        (no benefit start age, no RRIF conversion) are ``None``.
         """
-        data: Dict[str, float] = {
+        def optional(value: Optional[float]) -> Optional[float]:
+            return None if value is None else float(value)
+
+        data: Dict[str, Optional[float]] = {
             "current_age": float(self.current_age),
             "end_age": float(self.end_age),
             "cpp_annual": float(self.cpp_annual),
             "oas_annual": float(self.oas_annual),
+            "cpp_start_age": optional(self.cpp_start_age),
+            "oas_start_age": optional(self.oas_start_age),
+            "rrif_conversion_age": optional(getattr(self.tax_deferred, "rrif_conversion_age", None)),
+            "cost_base_taxable": optional(getattr(self.taxable, "cost_base", None)),
         }
         data.update({f"balance_{k}": v for k, v in self.all_balances().items()})
         return data
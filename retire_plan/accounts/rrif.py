@@ -0,0 +1,58 @@
+"""
+RRIF minimum-withdrawal rules for the retire_plan package.
+
+An RRSP must be converted to a RRIF by the end of the year its owner turns
+71; from then on a prescribed minimum has to come out every year.  The
+minimum is a factor times the balance at the start of the year, where the
+factor depends on the owner's age at the start of that year:
+
+- before 71: ``1 / (90 - age)``
+- from 71: the prescribed table below (5.28% at 71, up to 20% from 95)
+
+``RRIF_MINIMUM_FACTORS[age]`` holds the factor for every age up to
+``MAX_AGE``, so the engines look the whole year's factor up once and apply
+the minimum with a single ``max``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+RRIF_CONVERSION_AGE = 71
+MAX_AGE = 120
+
+# Prescribed factors for ages 71 to 94; 20% from 95 on
+_PRESCRIBED = {
+    71: 0.0528, 72: 0.0540, 73: 0.0553, 74: 0.0567, 75: 0.0582, 76: 0.0598,
+    77: 0.0617, 78: 0.0636, 79: 0.0658, 80: 0.0682, 81: 0.0708, 82: 0.0738,
+    83: 0.0771, 84: 0.0808, 85: 0.0851, 86: 0.0899, 87: 0.0955, 88: 0.1021,
+    89: 0.1099, 90: 0.1192, 91: 0.1306, 92: 0.1449, 93: 0.1634, 94: 0.1879,
+}
+
+
+def _factor_table() -> np.ndarray:
+    ages = np.arange(MAX_AGE + 1)
+    table = np.where(ages < 71, 1.0 / np.maximum(90 - ages, 1), 0.20)
+    for age, factor in _PRESCRIBED.items():
+        table[age] = factor
+    return table
+
+
+RRIF_MINIMUM_FACTORS = _factor_table()
+
+
+def rrif_minimum_factor(age: Any, conversion_age: int | None = RRIF_CONVERSION_AGE) -> Any:
+    """Minimum-withdrawal factor for the year starting at ``age``.
+
+    Zero before ``conversion_age`` (or always, when it is ``None``).
+    Accepts a single age or an array of ages.
+    """
+    ages = np.asarray(age)
+    if conversion_age is None:
+        factor = np.zeros(ages.shape)
+    else:
+        factor = np.where(ages >= conversion_age,
+                          RRIF_MINIMUM_FACTORS[np.clip(ages, 0, MAX_AGE)], 0.0)
+    return float(factor) if factor.ndim == 0 else factor
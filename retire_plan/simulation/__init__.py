@@ -4,19 +4,86 @@ simulation subpackage – Core engine and metrics.
 Exports:
     Simulator
     TaxCalculator
+    TaxSchedule
     calculate_shortfall_years
     project_tax_efficiency
+    ReturnModel
+    MultiAssetModel
+    MortalityTable
+    simulate_batch
+    run_chunked
+    run_monte_carlo
+    PartialResult
+    save_results
+    stress_test
+    optimize_benefit_start
+    sensitivity
+    success_surface
+    PlanningSession
+    check_backends
+    register_backend
+    load_results
+    run_sweep
+    lifecycle_sweep
 """
 
 from .engine import Simulator
 from .metrics import (
+    TaxCalculator,
+    TaxSchedule,
     calculate_shortfall_years,
     project_tax_efficiency,
 )
+from .scenarios import MultiAssetModel, ReturnModel, retime_returns
+from .batch import BatchResult, simulate_batch
+from .backends import BACKENDS, check_backends, get_backend, random_cases, register_backend
+from .benefits import optimize_benefit_start
+from .chunked import run_chunked
+from .mortality import MortalityTable
+from .montecarlo import run_monte_carlo, summarize_paths
+from .results import load_results, save_results
+from .sensitivity import SENSITIVITY_STEPS, sensitivity
+from .session import PlanningSession
+from .surface import success_surface
+from .stress import STRESS_SCENARIOS, StressScenario, stress_test
+from .partial import PartialResult, QuantileSketch, load_partials, merge_partials
+from .sweep import lifecycle_sweep, run_sweep, unit_seed
 
 __all__ = [
     "Simulator",
     "TaxCalculator",
+    "TaxSchedule",
     "calculate_shortfall_years",
     "project_tax_efficiency",
-]
\ No newline at end of file
+    "ReturnModel",
+    "MultiAssetModel",
+    "retime_returns",
+    "MortalityTable",
+    "BatchResult",
+    "simulate_batch",
+    "run_chunked",
+    "run_monte_carlo",
+    "summarize_paths",
+    "PartialResult",
+    "QuantileSketch",
+    "load_partials",
+    "merge_partials",
+    "save_results",
+    "load_results",
+    "STRESS_SCENARIOS",
+    "StressScenario",
+    "stress_test",
+    "optimize_benefit_start",
+    "SENSITIVITY_STEPS",
+    "sensitivity",
+    "success_surface",
+    "PlanningSession",
+    "BACKENDS",
+    "check_backends",
+    "get_backend",
+    "random_cases",
+    "register_backend",
+    "run_sweep",
+    "lifecycle_sweep",
+    "unit_seed",
+]
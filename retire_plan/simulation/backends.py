@@ -0,0 +1,320 @@
+"""
+simulation.backends – Interchangeable lifecycle engines and a checker for them.
+
+A backend runs one full lifecycle (``Simulator.run_full_lifecycle``
+semantics) and returns the same outcome dict, history included.  Two are
+built in:
+
+- ``"python"``: the reference, ``Simulator.run_accumulation`` followed by
+  ``Simulator.run_decumulation`` on account objects;
+- ``"numpy"``: ``simulate_batch`` on a single path, with the history rebuilt
+  from its trajectories.
+
+``Simulator(profile, backend="numpy")`` picks one per simulator, and
+``register_backend`` adds new ones.  Before production traffic moves to a new
+backend, ``check_backends`` runs randomized profiles, plans and strategies
+through it and the reference and reports, per outcome field, how far they
+diverge:
+
+>>> rows = check_backends(["numpy"], n_cases=200, seed=0)  # doctest: +SKIP
+>>> all(row["failures"] == 0 for row in rows)  # doctest: +SKIP
+True
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from retire_plan.accounts import PersonProfile
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.strategies.policies import (
+    contrib_max_rrsp_first,
+    contrib_max_tfsa_first,
+    gross_up,
+    strategy_smooth_with_tfsa,
+    strategy_spend_rrsp_first,
+    strategy_spend_taxable_first,
+)
+from retire_plan.strategies.spending import FloorCeiling, GuytonKlinger, PercentOfPortfolio
+from .batch import ACCOUNT_KEYS, simulate_batch
+from .engine import SimulationConfigError, Simulator, StrategyFunc, _as_schedule
+from .metrics import TaxCalculator
+
+# Runs one lifecycle: (profile, contribution_strategy, withdrawal_strategy,
+# tax_calculator=..., **plan) -> run_full_lifecycle outcome
+Backend = Callable[..., Dict[str, Any]]
+
+REFERENCE_BACKEND = "python"
+
+# Outcome fields compared by check_backends ("history": every field of every
+# year's record, account balances included)
+CHECKED_FIELDS = ("final_wealth", "total_tax_paid", "peak_wealth", "ruin_age", "success",
+                  "history")
+
+
+def _python_backend(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    tax_calculator: TaxCalculator | None = None,
+    **plan: Any,
+) -> Dict[str, Any]:
+    return Simulator(profile, tax_calculator).run_full_lifecycle(
+        contribution_strategy, withdrawal_strategy, **plan)
+
+
+def _numpy_backend(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    tax_calculator: TaxCalculator | None = None,
+    years_working: int = 35,
+    annual_savings: Any = 28_000,
+    annual_spending: float = 80_000,
+    accumulation_return: Any = 0.07,
+    decumulation_return: Any = 0.05,
+    inflation_rate: Any = 0.02,
+    spending_rule: Any = None,
+) -> Dict[str, Any]:
+    if years_working < 0:
+        raise SimulationConfigError("years_to_retirement cannot be negative")
+    years_retired = max(0, profile.end_age - profile.current_age - years_working)
+    returns = np.concatenate((
+        _as_schedule(accumulation_return, years_working, "return_rate", per_account=True),
+        _as_schedule(decumulation_return, years_retired, "return_rate", per_account=True),
+    ))
+    result = simulate_batch(
+        profile, contribution_strategy, withdrawal_strategy, returns[None],
+        years_working=years_working,
+        annual_savings=annual_savings,
+        annual_spending=annual_spending,
+        inflation_rate=inflation_rate,
+        tax_calculator=tax_calculator,
+        record=True,
+        spending_rule=spending_rule,
+    )
+
+    traj = result.trajectories
+    history = []
+    for t in range(years_working + years_retired):
+        record: Dict[str, Any] = {"age": int(traj["age"][t])}
+        if t < years_working:
+            record["phase"] = "accumulation"
+        else:
+            record["phase"] = "decumulation"
+            for key in ("spending", "gross_withdrawal", "tax_paid", "net_cash_flow"):
+                record[key] = float(traj[key][0, t])
+        record["total_wealth"] = float(traj["total_wealth"][0, t])
+        record["end_balances"] = {key: float(traj["end_balances"][0, t, i])
+                                  for i, key in enumerate(ACCOUNT_KEYS)}
+        history.append(record)
+
+    ruin_age = result.ruin_age[0]
+    return {
+        "final_wealth": float(result.final_wealth[0]),
+        "total_tax_paid": float(result.total_tax_paid[0]),
+        "ruin_age": None if np.isnan(ruin_age) else int(ruin_age),
+        "success": bool(result.success[0]),
+        "peak_wealth": float(result.peak_wealth[0]),
+        "history": history,
+    }
+
+
+BACKENDS: Dict[str, Backend] = {
+    "python": _python_backend,
+    "numpy": _numpy_backend,
+}
+
+
+def register_backend(name: str, backend: Backend, replace: bool = False) -> None:
+    """Make ``backend`` available as ``Simulator(..., backend=name)``.
+
+    Raises
+    ------
+    SimulationConfigError
+        If ``name`` is taken (unless ``replace``) or is the reference backend.
+    """
+    if name == REFERENCE_BACKEND:
+        raise SimulationConfigError(f"the reference backend {name!r} cannot be replaced")
+    if name in BACKENDS and not replace:
+        raise SimulationConfigError(f"backend {name!r} is already registered")
+    BACKENDS[name] = backend
+
+
+def get_backend(name: str) -> Backend:
+    """Registered backend ``name``; raises ``SimulationConfigError`` if unknown."""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise SimulationConfigError(
+            f"unknown backend {name!r}; expected one of {sorted(BACKENDS)}"
+        ) from None
+
+
+# ========================
+# DIFFERENTIAL CHECKER
+# ========================
+def random_cases(n_cases: int, seed: int | None = 0) -> List[Dict[str, Any]]:
+    """Randomized lifecycle inputs for ``check_backends``.
+
+    Each case is a dict with ``profile``, ``contribution_strategy``,
+    ``withdrawal_strategy``, ``tax_calculator`` and ``plan`` (keyword
+    arguments of ``run_full_lifecycle``).  Cases cover per-year schedules,
+    per-account returns, CPP/OAS start ages, RRIF conversion, embedded
+    capital gains, after-tax targets, scalar-only strategies and dynamic
+    spending rules.
+    """
+    rng = np.random.default_rng(seed)
+    provinces = sorted(TaxCalculator.PROVINCIAL_BRACKETS)
+    contributions = [contrib_max_tfsa_first, contrib_max_rrsp_first]
+    withdrawals = [strategy_spend_taxable_first, strategy_spend_rrsp_first,
+                   strategy_smooth_with_tfsa]
+    rules = [None, None, GuytonKlinger(), PercentOfPortfolio(), FloorCeiling()]
+
+    cases = []
+    for _ in range(n_cases):
+        current_age = int(rng.integers(25, 66))
+        end_age = int(rng.integers(max(current_age + 5, 75), 101))
+        taxable = float(rng.uniform(0, 300_000))
+        profile = PersonProfile(
+            name="Case",
+            current_age=current_age,
+            end_age=end_age,
+            tax_deferred=TaxDeferredAccount(
+                "RRSP", float(rng.uniform(0, 800_000)),
+                rrif_conversion_age=int(rng.choice([71, 75])) if rng.random() < 0.5 else None),
+            tax_free=TaxFreeAccount("TFSA", float(rng.uniform(0, 150_000))),
+            taxable=TaxableAccount("Taxable", taxable, cost_base=taxable * float(rng.uniform(0.3, 1))),
+            cpp_annual=float(rng.uniform(0, 16_000)),
+            oas_annual=float(rng.uniform(0, 9_000)),
+            cpp_start_age=int(rng.integers(60, 71)) if rng.random() < 0.5 else None,
+            oas_start_age=int(rng.integers(65, 71)) if rng.random() < 0.5 else None,
+        )
+        calc = TaxCalculator(province=str(rng.choice(provinces)),
+                             indexation_rate=0.02 if rng.random() < 0.5 else None)
+
+        years_working = int(rng.integers(0, end_age - current_age + 1))
+        years_retired = end_age - current_age - years_working
+        plan: Dict[str, Any] = {
+            "years_working": years_working,
+            "annual_savings": float(rng.uniform(0, 40_000)),
+            "annual_spending": float(rng.uniform(20_000, 120_000)),
+            "accumulation_return": float(rng.normal(0.06, 0.02)),
+            "decumulation_return": float(rng.normal(0.04, 0.02)),
+            "inflation_rate": float(rng.uniform(0.0, 0.04)),
+            "spending_rule": rules[int(rng.integers(len(rules)))],
+        }
+        if rng.random() < 0.3:
+            plan["annual_savings"] = rng.uniform(0, 40_000, years_working)
+            plan["accumulation_return"] = rng.normal(0.06, 0.1, (years_working, 3))
+            plan["decumulation_return"] = rng.normal(0.04, 0.1, years_retired)
+            plan["inflation_rate"] = rng.uniform(0.0, 0.05, years_retired)
+
+        withdraw = withdrawals[int(rng.integers(len(withdrawals)))]
+        kind = rng.random()
+        if kind < 0.2:
+            withdraw = gross_up(withdraw, calc)
+        elif kind < 0.3:
+            # Plain callable: no vectorized kernel
+            withdraw = (lambda strategy: lambda state: strategy(state))(withdraw)
+        cases.append({
+            "profile": profile,
+            "contribution_strategy": contributions[int(rng.integers(len(contributions)))],
+            "withdrawal_strategy": withdraw,
+            "tax_calculator": calc,
+            "plan": plan,
+        })
+    return cases
+
+
+def _relative(a: float, b: float) -> float:
+    return abs(float(a) - float(b)) / max(abs(float(a)), 1.0)
+
+
+def _record_divergence(expected: Dict[str, Any], actual: Dict[str, Any]) -> float:
+    """Largest relative difference over every field of one history record.
+
+    ``age`` and ``phase`` must match exactly, ``end_balances`` is compared
+    account by account, and a missing or extra field is ``inf``.
+    """
+    if expected.keys() != actual.keys():
+        return float("inf")
+    if expected["age"] != actual["age"] or expected.get("phase") != actual.get("phase"):
+        return float("inf")
+    gap = 0.0
+    for key, value in expected.items():
+        if key in ("age", "phase"):
+            continue
+        if key == "end_balances":
+            if value.keys() != actual[key].keys():
+                return float("inf")
+            gap = max([gap] + [_relative(value[k], actual[key][k]) for k in value])
+        else:
+            gap = max(gap, _relative(value, actual[key]))
+    return gap
+
+
+def _divergence(field: str, expected: Dict[str, Any], actual: Dict[str, Any]) -> float:
+    """Relative difference of one outcome field (``inf`` for a structural mismatch)."""
+    if field == "history":
+        if len(expected["history"]) != len(actual["history"]):
+            return float("inf")
+        return max([0.0] + [_record_divergence(a, b)
+                            for a, b in zip(expected["history"], actual["history"])])
+    a, b = expected[field], actual[field]
+    if a is None or b is None:
+        return 0.0 if a is b else float("inf")
+    return _relative(a, b)
+
+
+def check_backends(
+    backends: Sequence[str] | None = None,
+    n_cases: int = 100,
+    seed: int | None = 0,
+    tolerance: float = 1e-9,
+    reference: str = REFERENCE_BACKEND,
+) -> List[Dict[str, Any]]:
+    """Differential test of backends against the reference backend.
+
+    Runs every case of ``random_cases(n_cases, seed)`` through ``reference``
+    and each backend in ``backends`` (default: every other registered one).
+
+    Returns
+    -------
+    list of dict
+        One row per (backend, field in ``CHECKED_FIELDS``): ``backend``,
+        ``field``, ``max_divergence`` (relative to the reference value, at
+        least 1), ``failures`` (cases beyond ``tolerance``) and
+        ``worst_case`` (index into ``random_cases(n_cases, seed)``, or
+        ``None`` when nothing diverged).  A backend that raises where the
+        reference does not counts as an infinite divergence on every field.
+    """
+    if backends is None:
+        backends = [name for name in BACKENDS if name != reference]
+    runners = {name: get_backend(name) for name in backends}
+    reference_runner = get_backend(reference)
+
+    worst = {(name, field): (0.0, None) for name in runners for field in CHECKED_FIELDS}
+    failures = {key: 0 for key in worst}
+    for index, case in enumerate(random_cases(n_cases, seed)):
+        args = (case["profile"], case["contribution_strategy"], case["withdrawal_strategy"])
+        expected = reference_runner(*args, tax_calculator=case["tax_calculator"], **case["plan"])
+        for name, runner in runners.items():
+            try:
+                actual = runner(*args, tax_calculator=case["tax_calculator"], **case["plan"])
+            except Exception:
+                actual = None
+            for field in CHECKED_FIELDS:
+                gap = float("inf") if actual is None else _divergence(field, expected, actual)
+                if gap > tolerance:
+                    failures[name, field] += 1
+                if gap > worst[name, field][0]:
+                    worst[name, field] = (gap, index)
+
+    return [
+        {"backend": name, "field": field, "max_divergence": worst[name, field][0],
+         "failures": failures[name, field], "worst_case": worst[name, field][1]}
+        for name in runners for field in CHECKED_FIELDS
+    ]
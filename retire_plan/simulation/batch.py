@@ -0,0 +1,554 @@
+"""
+simulation.batch – Vectorized engine that runs many lifecycle paths at once.
+
+Every path follows exactly the same yearly rules as
+``Simulator.run_accumulation`` followed by ``Simulator.run_decumulation``;
+paths differ in the investment returns they see and, optionally, in their
+plan inputs (working years, spending, savings, inflation, starting balances,
+benefit start ages).  Account balances are
+kept in a ``(paths, 3)`` array so one year of the whole batch costs a handful
+of numpy operations instead of a Python loop over paths.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from retire_plan.accounts import PersonProfile
+from retire_plan.accounts.benefits import cpp_adjustment, oas_adjustment
+from retire_plan.accounts.models import CAPITAL_GAINS_INCLUSION, taxable_gain_share
+from retire_plan.accounts.rrif import rrif_minimum_factor
+from retire_plan.strategies.spending import SpendingRule
+from .engine import Schedule, SimulationConfigError, _portfolio_return
+from .metrics import TaxCalculator
+
+StrategyFunc = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+ACCOUNT_KEYS = ("tax_deferred", "tax_free", "taxable")
+_ACCOUNT_INDEX = {key: i for i, key in enumerate(ACCOUNT_KEYS)}
+
+# Share of a withdrawal that counts as taxable income, per account, when the
+# taxable account does not track its cost base
+_TAXABLE_SHARE = np.array([1.0, 0.0, 1.0])
+
+# Same threshold run_full_lifecycle uses to declare a path ruined
+RUIN_THRESHOLD = 1_000.0
+
+
+@dataclass
+class BatchResult:
+    """Per-path outcomes of a batch run.
+
+    Attributes
+    ----------
+    final_wealth, total_tax_paid, peak_wealth : np.ndarray
+        Arrays of shape ``(paths,)`` with the same meaning as the keys
+        returned by ``Simulator.run_full_lifecycle``.
+    ruin_age : np.ndarray
+        Age at which total wealth first fell below ``RUIN_THRESHOLD``;
+        ``nan`` for paths that never ran out.
+    trajectories : dict
+        Only filled when ``record=True``.  Year-by-year arrays of shape
+        ``(paths, years)`` (``end_balances`` is ``(paths, years, 3)``).
+    death_age : np.ndarray or None
+        Per-path death age when the run used ``death_ages``.
+    """
+
+    final_wealth: np.ndarray
+    total_tax_paid: np.ndarray
+    ruin_age: np.ndarray
+    peak_wealth: np.ndarray
+    trajectories: Dict[str, np.ndarray] = field(default_factory=dict)
+    death_age: np.ndarray | None = None
+
+    @property
+    def success(self) -> np.ndarray:
+        return np.isnan(self.ruin_age)
+
+    @property
+    def n_paths(self) -> int:
+        return int(self.final_wealth.shape[0])
+
+
+def _path_state(state: Dict[str, Any], p: int) -> Dict[str, Any]:
+    """Slice one path out of a batch state dict (for scalar strategies)."""
+    out: Dict[str, Any] = {}
+    for key, value in state.items():
+        if isinstance(value, dict):
+            out[key] = _path_state(value, p)
+        elif isinstance(value, np.ndarray) and value.ndim > 0:
+            out[key] = float(value[p])
+        else:
+            out[key] = value
+    return out
+
+
+def plan_array(strategy: StrategyFunc, state: Dict[str, Any], n_paths: int,
+               dtype: Any = np.float64) -> np.ndarray:
+    """Evaluate a strategy for every path and return a ``(paths, 3)`` plan.
+
+    Strategies that carry a ``vectorized`` kernel are called once for the
+    whole batch; any other callable is called once per path.
+    """
+    out = np.zeros((n_paths, len(ACCOUNT_KEYS)), dtype=dtype)
+    kernel = getattr(strategy, "vectorized", None)
+    if kernel is not None:
+        for key, amt in kernel(state).items():
+            out[:, _ACCOUNT_INDEX[key]] = amt
+        return out
+
+    for p in range(n_paths):
+        for key, amt in strategy(_path_state(state, p)).items():
+            out[p, _ACCOUNT_INDEX[key]] = amt
+    return out
+
+
+def _path_schedule(value: Schedule, n_paths: int, n_years: int, name: str,
+                   dtype: Any = np.float64) -> np.ndarray:
+    """Broadcast a constant, ``(years,)`` or ``(paths, years)`` schedule to ``(paths, years)``."""
+    arr = np.asarray(value, dtype=dtype)
+    try:
+        return np.broadcast_to(arr, (n_paths, n_years))
+    except ValueError:
+        raise SimulationConfigError(
+            f"{name} must be a constant, or have shape ({n_years},) or ({n_paths}, {n_years}); "
+            f"got {arr.shape}"
+        ) from None
+
+
+def _benefit(amount: float, start_age: Any, adjustment: Callable[[Any], Any],
+             n_paths: int, name: str) -> tuple[Any, np.ndarray | None]:
+    """Annual benefit once started, and per-path start ages (``None``: always paid)."""
+    if start_age is None:
+        return float(amount), None
+    try:
+        start = np.broadcast_to(np.asarray(start_age), (n_paths,))
+    except ValueError:
+        raise SimulationConfigError(
+            f"{name} must be one age or have shape ({n_paths},); got {np.shape(start_age)}"
+        ) from None
+    try:
+        return float(amount) * adjustment(start), start
+    except ValueError as exc:
+        raise SimulationConfigError(str(exc)) from None
+
+
+def _benefit_at(amount: Any, start: np.ndarray | None, age: int, rows: Any) -> Any:
+    if start is None:
+        return amount
+    return np.where(start[rows] <= age, amount[rows], 0.0)
+
+
+def _balances_dict(bal: np.ndarray) -> Dict[str, np.ndarray]:
+    return {key: bal[:, i].copy() for i, key in enumerate(ACCOUNT_KEYS)}
+
+
+def simulate_batch(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    returns: np.ndarray,
+    years_working: Any = 35,
+    annual_savings: Schedule = 28_000,
+    annual_spending: Any = 80_000,
+    inflation_rate: Schedule = 0.02,
+    tax_calculator: TaxCalculator | None = None,
+    record: bool = False,
+    death_ages: np.ndarray | None = None,
+    dtype: Any = np.float64,
+    cpp_start_age: Any = None,
+    oas_start_age: Any = None,
+    spending_rule: SpendingRule | None = None,
+    initial_balances: np.ndarray | None = None,
+    initial_cost_base: np.ndarray | None = None,
+    start_years: np.ndarray | None = None,
+) -> BatchResult:
+    """Run one lifecycle per row of ``returns``.
+
+    Parameters
+    ----------
+    profile : PersonProfile
+        Starting profile; it is read, never modified.
+    contribution_strategy, withdrawal_strategy : callable
+        Same strategy functions ``Simulator`` accepts.
+    returns : np.ndarray
+        Annual returns of shape ``(paths, years)`` (one rate for all
+        accounts) or ``(paths, years, 3)`` (one rate per account), where
+        ``years`` covers the working years followed by the retirement years.
+    years_working, annual_savings, annual_spending, inflation_rate
+        Same meaning as in ``Simulator.run_full_lifecycle``.
+        ``annual_savings`` and ``inflation_rate`` may also be per-year
+        schedules, shared by all paths (``(years,)``) or given per path
+        (``(paths, years)``); they are applied to every path at once.
+        ``years_working`` and ``annual_spending`` may also be ``(paths,)``
+        arrays.  With per-path working years every path runs to
+        ``end_age`` (``years`` is the full horizon), a path retires at its
+        own year and ``inflation_rate`` is counted from each path's
+        retirement; years in which some paths still work and others are
+        retired are split between the two phases.
+    record : bool
+        Keep year-by-year trajectories in ``BatchResult.trajectories``.
+    death_ages : np.ndarray, optional
+        ``(paths,)`` age at which each path's owner dies (see
+        ``retire_plan.simulation.mortality``).  A path is only simulated for
+        years starting at or before its death age; finished paths are dropped from
+        the working arrays, so the remaining years cost less.  Outcomes are
+        then as of death (``final_wealth`` is the estate) and ruin only
+        counts while alive.
+    dtype : numpy dtype
+        Precision of balances, returns and trajectories.  ``np.float32``
+        halves memory for large batches; per-path totals are still
+        accumulated in float64.
+    cpp_start_age, oas_start_age : int or np.ndarray, optional
+        Benefit start ages overriding the profile's, either one age for all
+        paths or ``(paths,)`` ages, so different start ages can be compared
+        in one batch (see ``retire_plan.simulation.benefits``).
+    spending_rule : SpendingRule, optional
+        Path-dependent retirement spending
+        (``retire_plan.strategies.spending``); each path's rule state is a
+        row of the rule's state arrays.
+    initial_balances : np.ndarray, optional
+        Starting balances overriding the profile's, ``(3,)`` or
+        ``(paths, 3)`` in ``ACCOUNT_KEYS`` order.  A taxable balance above
+        the profile's is added at cost.
+    initial_cost_base : float or np.ndarray, optional
+        Starting ACB of the taxable account, overriding the one derived from
+        the profile.
+    start_years : np.ndarray, optional
+        ``(paths,)`` year (``0`` = ``profile.current_age``) in which each
+        path starts; ``initial_balances`` and ``initial_cost_base`` are then
+        its state at the start of that year (e.g. a checkpoint from the
+        ``end_balances`` and ``cost_base`` trajectories of an earlier run),
+        and nothing is simulated or recorded for it before.
+
+    Raises
+    ------
+    SimulationConfigError
+        For the same invalid inputs ``Simulator`` rejects, or when the
+        ``returns`` array does not cover the full horizon.
+    """
+    per_path_work = np.ndim(years_working) > 0
+    if (np.asarray(years_working) < 0).any():
+        raise SimulationConfigError("years_to_retirement cannot be negative")
+    if (np.asarray(annual_savings) < 0).any():
+        raise SimulationConfigError(f"annual_savings cannot be negative: {annual_savings}")
+    if (np.asarray(annual_spending) <= 0).any():
+        raise SimulationConfigError(f"annual_spending must be positive: {annual_spending}")
+
+    tax_calc = tax_calculator or TaxCalculator()
+    horizon = profile.end_age - profile.current_age
+    if per_path_work:
+        work = np.asarray(years_working, dtype=int)
+        if (work > horizon).any():
+            raise SimulationConfigError(
+                f"per-path years_working cannot exceed the {horizon}-year horizon"
+            )
+        earliest, latest = int(work.min()), int(work.max())
+        n_years = horizon
+    else:
+        work = int(years_working)
+        earliest = latest = work
+        n_years = work + max(0, horizon - work)
+    tax_schedule = tax_calc.schedule(n_years)
+
+    returns = np.asarray(returns, dtype=dtype)
+    if returns.ndim == 2:
+        returns = returns[:, :, None]
+    if returns.ndim != 3 or returns.shape[1] != n_years:
+        raise SimulationConfigError(
+            f"returns must have shape (paths, {n_years}) or (paths, {n_years}, 3); "
+            f"got {returns.shape}"
+        )
+    growth = 1.0 + returns
+    n_paths = returns.shape[0]
+    if per_path_work and work.shape != (n_paths,):
+        raise SimulationConfigError(
+            f"years_working must be one value or have shape ({n_paths},); got {work.shape}"
+        )
+    savings = _path_schedule(annual_savings, n_paths, latest, "annual_savings", dtype)
+    # Indexed by retirement year, so paths retiring later use fewer columns
+    inflation = _path_schedule(inflation_rate, n_paths, n_years - earliest,
+                               "inflation_rate", dtype)
+    death = None
+    if death_ages is not None:
+        death = np.asarray(death_ages, dtype=float)
+        if death.shape != (n_paths,):
+            raise SimulationConfigError(
+                f"death_ages must have shape ({n_paths},); got {death.shape}"
+            )
+
+    initial = np.array([profile.all_balances()[key] for key in ACCOUNT_KEYS], dtype=float)
+    if initial_balances is None:
+        bal = np.tile(initial.astype(dtype), (n_paths, 1))
+    else:
+        try:
+            bal = np.broadcast_to(np.asarray(initial_balances, dtype=dtype),
+                                  (n_paths, len(ACCOUNT_KEYS))).copy()
+        except ValueError:
+            raise SimulationConfigError(
+                f"initial_balances must have shape (3,) or ({n_paths}, 3); "
+                f"got {np.shape(initial_balances)}"
+            ) from None
+    # Average-cost ACB of the taxable account (None: fully taxable withdrawals)
+    cost_base = getattr(profile.taxable, "cost_base", None)
+    acb = None
+    if initial_cost_base is not None:
+        acb = np.broadcast_to(np.asarray(initial_cost_base, dtype=float), (n_paths,)).copy()
+    elif cost_base is not None:
+        # A taxable balance other than the profile's is added (or removed) at cost
+        acb = np.maximum(float(cost_base) + (bal[:, 2] - initial[2]), 0.0)
+    try:
+        spending = np.broadcast_to(np.asarray(annual_spending, dtype=dtype), (n_paths,)).copy()
+    except ValueError:
+        raise SimulationConfigError(
+            f"annual_spending must be one amount or have shape ({n_paths},); "
+            f"got {np.shape(annual_spending)}"
+        ) from None
+    total_tax = np.zeros(n_paths)
+    peak = np.full(n_paths, -np.inf)
+    ruin_age = np.full(n_paths, np.nan)
+    final_wealth = (np.full(n_paths, initial.sum()) if initial_balances is None
+                    else bal.sum(axis=1, dtype=float))
+
+    traj: Dict[str, np.ndarray] = {}
+    if record:
+        # Years after a path's death stay NaN
+        fill = 0.0 if death is None else np.nan
+
+        def empty(shape: tuple) -> np.ndarray:
+            return np.full(shape, fill, dtype=dtype)
+
+        traj = {
+            "age": np.zeros(n_years, dtype=int),
+            "total_wealth": empty((n_paths, n_years)),
+            "spending": empty((n_paths, n_years)),
+            "gross_withdrawal": empty((n_paths, n_years)),
+            "tax_paid": empty((n_paths, n_years)),
+            "net_cash_flow": empty((n_paths, n_years)),
+            "end_balances": empty((n_paths, n_years, len(ACCOUNT_KEYS))),
+        }
+        if acb is not None:
+            traj["cost_base"] = empty((n_paths, n_years))
+
+    # Paths still being simulated.  Working arrays (bal, spending, acb, rule
+    # state) only hold these rows; per-path outputs and schedules are indexed
+    # through ``rows``.
+    alive = np.arange(n_paths)
+    rows: slice | np.ndarray = slice(None)
+    start = None
+    if start_years is not None:
+        start = np.asarray(start_years, dtype=int)
+        if start.shape != (n_paths,) or (start < 0).any():
+            raise SimulationConfigError(
+                f"start_years must be ({n_paths},) non-negative years; got {start_years}"
+            )
+        # Paths enter the working arrays in their start year
+        waiting = (bal, spending, acb)
+        alive = np.flatnonzero(start == 0)
+        bal, spending = bal[alive], spending[alive]
+        if acb is not None:
+            acb = acb[alive]
+        rows = alive
+    rule_state: Dict[str, np.ndarray] = {}
+    # RRIF minimum-withdrawal factor of each year (0 before conversion)
+    rrif_factors = rrif_minimum_factor(
+        profile.current_age + np.arange(n_years),
+        getattr(profile.tax_deferred, "rrif_conversion_age", None),
+    )
+    if cpp_start_age is None:
+        cpp_start_age = profile.cpp_start_age
+    if oas_start_age is None:
+        oas_start_age = profile.oas_start_age
+    cpp_amount, cpp_start = _benefit(profile.cpp_annual, cpp_start_age, cpp_adjustment,
+                                     n_paths, "cpp_start_age")
+    oas_amount, oas_start = _benefit(profile.oas_annual, oas_start_age, oas_adjustment,
+                                     n_paths, "oas_start_age")
+
+    def _survivors(age: int) -> np.ndarray | None:
+        """Mask of working rows still alive at ``age``, or None if nobody died."""
+        if death is None:
+            return None
+        keep = death[alive] >= age
+        return None if keep.all() else keep
+
+    def _split(working: Any) -> tuple[Any, Any]:
+        """Working-array index of the rows still working and of the retired
+        rows (``slice(None)`` for all of them, ``None`` for none)."""
+        if np.all(working):
+            return slice(None), None
+        if not np.any(working):
+            return None, slice(None)
+        return np.flatnonzero(working), np.flatnonzero(~working)
+
+    def _at(sub: Any) -> Any:
+        """Path index of the working-array rows ``sub``."""
+        return rows if isinstance(sub, slice) else alive[sub]
+
+    def _record(t: int, age: Any, label: int) -> None:
+        wealth = bal.sum(axis=1)
+        peak[rows] = np.maximum(peak[rows], wealth)
+        ruined = ruin_age[rows]
+        hit = np.isnan(ruined) & (wealth < RUIN_THRESHOLD)
+        ruined[hit] = age if np.ndim(age) == 0 else age[hit]
+        ruin_age[rows] = ruined
+        final_wealth[rows] = wealth
+        if record:
+            traj["age"][t] = label
+            traj["total_wealth"][rows, t] = wealth
+            traj["end_balances"][rows, t] = bal
+            if acb is not None:
+                traj["cost_base"][rows, t] = acb
+
+    def _contribute(w: Any, t: int, age: int) -> None:
+        """One working year (before growth) for working-array rows ``w``."""
+        held = bal[w]
+        state = {
+            "age": age,
+            "annual_savings_available": savings[_at(w), t],
+            "balances": _balances_dict(held),
+        }
+        plan = plan_array(contribution_strategy, state, held.shape[0], dtype)
+        bal[w] += np.where(plan > 0, plan, 0.0)
+        if acb is not None:
+            acb[w] += np.where(plan[:, 2] > 0, plan[:, 2], 0.0)
+
+    def _start_rule(r: Any, retired_for: Any) -> None:
+        """Start the spending rule for the rows of ``r`` retiring this year."""
+        nonlocal rule_state
+        local = np.arange(alive.size)[r]
+        s = local[np.broadcast_to(retired_for == 0, local.shape)]
+        first, state = spending_rule.start(spending[s].astype(float), bal[s].sum(axis=1))
+        spending[s] = first
+        if not rule_state:
+            rule_state = {key: np.zeros(alive.size, dtype=np.asarray(value).dtype)
+                          for key, value in state.items()}
+        for key, value in state.items():
+            rule_state[key][s] = value
+
+    def _withdraw(r: Any, t: int, age: int) -> np.ndarray:
+        """One retirement year (before growth) for working-array rows ``r``."""
+        idx = _at(r)
+        held = bal[r]
+        cpp = _benefit_at(cpp_amount, cpp_start, age, idx)
+        oas = _benefit_at(oas_amount, oas_start, age, idx)
+        state = {
+            "age": age,
+            "year": t,
+            "target_net_cash": spending[r],
+            "cpp_income": cpp,
+            "oas_income": oas,
+            "balances": _balances_dict(held),
+            "taxable_share": {
+                "tax_deferred": 1.0,
+                "tax_free": 0.0,
+                "taxable": 1.0 if acb is None else taxable_gain_share(acb[r], held[:, 2]),
+            },
+        }
+        plan = plan_array(withdrawal_strategy, state, held.shape[0], dtype)
+        excess = 0.0
+        if rrif_factors[t] > 0:
+            # RRIF minimum on top of the plan; the excess goes to the taxable account
+            minimum = rrif_factors[t] * np.maximum(held[:, 0], 0.0)
+            excess = np.maximum(minimum - np.maximum(plan[:, 0], 0.0), 0.0)
+            plan[:, 0] = np.maximum(plan[:, 0], minimum)
+        wanted = np.where(plan > 0, plan, 0.0)
+        actual = np.where(held > 0, np.minimum(wanted, held), 0.0)
+        if acb is None:
+            taxable_income = actual @ _TAXABLE_SHARE
+        else:
+            # Realized gain: the withdrawal minus its share of the ACB
+            cost = acb[r]
+            removed = actual[:, 2] * (cost / np.where(held[:, 2] > 0, held[:, 2], 1.0))
+            taxable_income = actual[:, 0] + CAPITAL_GAINS_INCLUSION * np.maximum(
+                actual[:, 2] - removed, 0.0)
+            acb[r] = cost - removed + excess
+        bal[r] -= actual
+        bal[r, 2] += excess
+        gross = actual.sum(axis=1)
+        tax = tax_schedule.tax(t, taxable_income).astype(dtype, copy=False)
+        total_tax[idx] += tax
+        if record:
+            traj["spending"][idx, t] = spending[r]
+            traj["gross_withdrawal"][idx, t] = gross
+            traj["tax_paid"][idx, t] = tax
+            traj["net_cash_flow"][idx, t] = gross - tax + cpp + oas - excess
+        return bal[r].sum(axis=1)
+
+    for t in range(n_years):
+        age = profile.current_age + t
+        if start is not None and t > 0:
+            entering = np.flatnonzero(start == t)
+            if entering.size:
+                alive = np.concatenate((alive, entering))
+                bal = np.concatenate((bal, waiting[0][entering]))
+                spending = np.concatenate((spending, waiting[1][entering]))
+                if acb is not None:
+                    acb = np.concatenate((acb, waiting[2][entering]))
+                rule_state = {key: np.concatenate((value, np.zeros(entering.size, value.dtype)))
+                              for key, value in rule_state.items()}
+                rows = alive
+        keep = _survivors(age)
+        if keep is not None:
+            alive, bal, spending = alive[keep], bal[keep], spending[keep]
+            if acb is not None:
+                acb = acb[keep]
+            rule_state = {key: value[keep] for key, value in rule_state.items()}
+            rows = alive
+        if not alive.size:
+            if start is not None and (start > t).any():
+                continue
+            break
+        working = t < (work[alive] if per_path_work else work)
+        w, r = _split(working)
+
+        # 1. Accumulation: contribute, then grow
+        if w is not None:
+            _contribute(w, t, age)
+
+        # 2. Decumulation: spending rule starts at retirement, withdraw, grow,
+        #    then next year's spending
+        retired_for = None
+        if r is not None:
+            retired_for = t - (work[alive[r]] if per_path_work else work)
+            if spending_rule is not None and np.any(retired_for == 0):
+                _start_rule(r, retired_for)
+            invested = _withdraw(r, t, age)
+
+        bal *= growth[rows, t]
+        if r is None:
+            _record(t, age + 1, age + 1)
+        elif w is None:
+            _record(t, age, age)
+        else:
+            _record(t, np.where(working, age + 1, age), age)
+
+        if r is not None:
+            infl = (inflation[rows, retired_for] if not per_path_work
+                    else inflation[alive[r], retired_for])
+            if spending_rule is None:
+                spending[r] = spending[r] * (1 + infl)
+            else:
+                wealth = bal[r].sum(axis=1)
+                sub = rule_state if isinstance(r, slice) else {
+                    key: value[r] for key, value in rule_state.items()}
+                spending[r] = spending_rule.update(
+                    spending[r], sub, wealth, _portfolio_return(invested, wealth),
+                    infl, n_years - t - 1,
+                )
+                for key, value in sub.items():
+                    rule_state[key][r] = value
+
+    # No simulated year (empty horizon, or death before the first year)
+    peak = np.where(np.isneginf(peak), final_wealth, peak)
+
+    return BatchResult(
+        final_wealth=final_wealth,
+        total_tax_paid=total_tax,
+        ruin_age=ruin_age,
+        peak_wealth=peak,
+        trajectories=traj,
+        death_age=death,
+    )
@@ -0,0 +1,134 @@
+"""
+simulation.chunked – Very large stochastic studies in bounded memory.
+
+``run_chunked`` simulates ``n_paths`` paths in blocks of ``chunk_size``, so
+only one block's ``(paths, years, accounts)`` arrays are ever in memory.
+Per-path outcomes (and, with ``record=True``, the year-by-year
+trajectories) are written into ``numpy.memmap``-backed ``.npy`` files under
+``spill_dir``, so a study scales with disk rather than RAM:
+
+>>> result = run_chunked(profile, contrib_max_tfsa_first,              # doctest: +SKIP
+...                      strategy_spend_taxable_first, n_paths=1_000_000,
+...                      spill_dir="runs/study-1", record=True)
+>>> summarize_paths(result)["success"]                                  # doctest: +SKIP
+
+The returns of consecutive blocks are consecutive draws from one generator,
+so the paths do not depend on ``chunk_size``.  With the default
+``dtype=np.float32`` balances and trajectories take half the space; summary
+statistics agree with a float64 run to within float32 rounding.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict
+
+import numpy as np
+
+from retire_plan.accounts import PersonProfile
+from .batch import ACCOUNT_KEYS, BatchResult, StrategyFunc, simulate_batch
+from .engine import SimulationConfigError
+from .metrics import TaxCalculator
+from .scenarios import ReturnModel
+
+# Per-path outcome arrays of a BatchResult, spilled as <name>.npy
+OUTCOMES = ("final_wealth", "total_tax_paid", "ruin_age", "peak_wealth")
+TRAJECTORIES = ("total_wealth", "spending", "gross_withdrawal", "tax_paid", "net_cash_flow",
+                "end_balances")
+
+
+def _allocate(shape: tuple, dtype: Any, spill_dir: str | os.PathLike | None,
+              name: str) -> np.ndarray:
+    if spill_dir is None:
+        return np.empty(shape, dtype=dtype)
+    path = os.path.join(spill_dir, f"{name}.npy")
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+
+def run_chunked(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    n_paths: int,
+    years_working: int = 35,
+    annual_savings: float = 28_000,
+    annual_spending: float = 80_000,
+    return_model: ReturnModel | None = None,
+    chunk_size: int = 10_000,
+    dtype: Any = np.float32,
+    spill_dir: str | os.PathLike | None = None,
+    record: bool = False,
+    seed: int | None = None,
+    inflation_rate: float = 0.02,
+    tax_calculator: TaxCalculator | None = None,
+) -> BatchResult:
+    """Simulate ``n_paths`` stochastic lifecycles, ``chunk_size`` at a time.
+
+    Parameters
+    ----------
+    n_paths, chunk_size : int
+        Total paths, and paths simulated together (peak memory scales with
+        ``chunk_size``, not ``n_paths``).
+    dtype : numpy dtype
+        Working precision passed to ``simulate_batch``; also the dtype of
+        the spilled trajectories.
+    spill_dir : path or None
+        Directory for the ``.npy`` memmaps (created if needed).  Outcomes go
+        to ``<outcome>.npy`` and trajectories to ``trajectory_<key>.npy``;
+        reopen them later with ``np.load(path, mmap_mode="r")``.  ``None``
+        keeps everything in memory.
+    record : bool
+        Also keep trajectories (only sensible with ``spill_dir`` for big runs).
+
+    Returns
+    -------
+    BatchResult
+        Backed by the memmaps when ``spill_dir`` is given.
+    """
+    if n_paths <= 0 or chunk_size <= 0:
+        raise SimulationConfigError("n_paths and chunk_size must be positive")
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+
+    model = return_model or ReturnModel()
+    rng = np.random.default_rng(seed)
+    years_retired = max(0, profile.end_age - profile.current_age - years_working)
+    n_years = years_working + years_retired
+    run_kwargs = dict(
+        years_working=years_working,
+        annual_savings=annual_savings,
+        annual_spending=annual_spending,
+        inflation_rate=inflation_rate,
+        tax_calculator=tax_calculator or TaxCalculator(),
+        record=record,
+        dtype=dtype,
+    )
+
+    outcomes = {name: _allocate((n_paths,), np.float64, spill_dir, name) for name in OUTCOMES}
+    traj: Dict[str, np.ndarray] = {}
+    if record:
+        for key in TRAJECTORIES:
+            shape = (n_paths, n_years, len(ACCOUNT_KEYS)) if key == "end_balances" else (n_paths, n_years)
+            traj[key] = _allocate(shape, dtype, spill_dir, f"trajectory_{key}")
+
+    for start in range(0, n_paths, chunk_size):
+        stop = min(start + chunk_size, n_paths)
+        returns = model.sample(stop - start, years_working, years_retired, rng).astype(dtype)
+        block = simulate_batch(profile, contribution_strategy, withdrawal_strategy,
+                               returns, **run_kwargs)
+        for name in OUTCOMES:
+            outcomes[name][start:stop] = getattr(block, name)
+        for key, arr in traj.items():
+            arr[start:stop] = block.trajectories[key]
+
+    for arr in (*outcomes.values(), *traj.values()):
+        if isinstance(arr, np.memmap):
+            arr.flush()
+    if record:
+        # Accumulation years are recorded at the age reached, retirement years
+        # at the age they start (as in simulate_batch)
+        traj["age"] = np.arange(profile.current_age + 1, profile.current_age + n_years + 1)
+        traj["age"][years_working:] -= 1
+        if spill_dir is not None:
+            np.save(os.path.join(spill_dir, "trajectory_age.npy"), traj["age"])
+    return BatchResult(trajectories=traj, **outcomes)
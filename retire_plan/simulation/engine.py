@@ -4,8 +4,11 @@ Simulation engine for the retire_plan package.
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Callable, Sequence
+from typing import List, Dict, Any, Callable, Iterator, Sequence
 import copy
+import heapq
+
+import numpy as np
 
 from retire_plan.accounts import PersonProfile
 from .metrics import TaxCalculator
@@ -16,19 +19,53 @@ from retire_plan.strategies.policies import (
     strategy_spend_rrsp_first,
     strategy_smooth_with_tfsa,
 )
+from retire_plan.strategies.specs import dedupe_strategies
+from retire_plan.strategies.spending import SpendingRule
 
 StrategyFunc = Callable[[Dict[str, Any]], Dict[str, float]]
+# A constant, or one value per year (returns may also be (years, 3): per account)
+Schedule = Any
 
 class SimulationConfigError(ValueError):
     """User-defined exception for invalid simulator configuration."""
     pass
 
 
+def _as_schedule(value: Schedule, n_years: int, name: str, per_account: bool = False) -> np.ndarray:
+    """Broadcast a constant or per-year schedule to ``(years,)`` or ``(years, 3)``."""
+    arr = np.asarray(value, dtype=float)
+    if per_account and arr.ndim == 1:
+        arr = arr[:, None]
+    shape = (n_years, 3) if per_account else (n_years,)
+    try:
+        return np.broadcast_to(arr, shape)
+    except ValueError:
+        raise SimulationConfigError(
+            f"{name} must be a constant or one value per year ({n_years} years); "
+            f"got shape {arr.shape}"
+        ) from None
+
+
+def _portfolio_return(invested: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+    """Overall return from wealth after withdrawals to wealth after growth."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(invested > 0, wealth / np.where(invested > 0, invested, 1.0) - 1.0, 0.0)
+
+
 class Simulator:
-    def __init__(self, profile: PersonProfile, tax_calculator: TaxCalculator | None = None):
+    def __init__(self, profile: PersonProfile, tax_calculator: TaxCalculator | None = None,
+                 backend: str = "python"):
+        """``backend`` names the engine ``run_full_lifecycle`` uses (see
+        ``retire_plan.simulation.backends``); ``"python"`` is the reference
+        implemented by ``run_accumulation`` and ``run_decumulation`` below.
+        """
+        from .backends import get_backend
+
         self.original_profile = profile
         self.profile = copy.deepcopy(profile)
         self.tax_calc = tax_calculator or TaxCalculator()
+        self.backend = backend
+        self._backend = get_backend(backend)
         self.history: List[Dict[str, Any]] = []  # Full lifecycle history
 
     def reset(self):
@@ -42,14 +79,22 @@ class Simulator:
         self,
         contribution_strategy: StrategyFunc,
         years_to_retirement: int,
-        annual_savings: float = 30_000,
-        return_rate: float = 0.07,
+        annual_savings: Schedule = 30_000,
+        return_rate: Schedule = 0.07,
     ) -> None:
+        """Simulate working years: contributions + growth.
+
+        ``annual_savings`` may be a constant or one amount per year, and
+        ``return_rate`` a constant, one rate per year, or a ``(years, 3)``
+        array with one rate per account (tax-deferred, tax-free, taxable).
+        """
         if years_to_retirement < 0:
             raise SimulationConfigError("years_to_retirement cannot be negative")
-        if annual_savings < 0:
+        savings = _as_schedule(annual_savings, years_to_retirement, "annual_savings")
+        if (savings < 0).any():
             raise SimulationConfigError(f"annual_savings cannot be negative: {annual_savings}")
-        
+        rates = _as_schedule(return_rate, years_to_retirement, "return_rate", per_account=True)
+
         age = self.profile.current_age
 
         for year in range(years_to_retirement):
@@ -57,7 +102,7 @@ class Simulator:
 
             state = {
                 "age": current_age,
-                "annual_savings_available": annual_savings,
+                "annual_savings_available": float(savings[year]),
                 "balances": self.profile.all_balances(),
             }
             plan = contribution_strategy(state)
@@ -72,8 +117,8 @@ class Simulator:
                     }[key].deposit(amt)
 
             # Grow accounts
-            for acc in (self.profile.tax_deferred, self.profile.tax_free, self.profile.taxable):
-                acc.annual_return = return_rate
+            for acc, rate in zip(self._accounts(), rates[year]):
+                acc.annual_return = float(rate)
                 acc.grow()
 
             # RECORD ACCUMULATION YEAR
@@ -94,26 +139,73 @@ class Simulator:
         self,
         withdrawal_strategy: StrategyFunc,
         annual_spending: float = 70_000,
-        inflation_rate: float = 0.02,
-        return_rate: float = 0.05,
+        inflation_rate: Schedule = 0.02,
+        return_rate: Schedule = 0.05,
+        spending_rule: SpendingRule | None = None,
     ) -> None:
-        """Simulate retirement years: withdrawals + tax + growth."""
+        """Simulate retirement years: withdrawals + tax + growth.
+
+        ``inflation_rate`` may be a constant or one rate per retirement
+        year; ``return_rate`` as in ``run_accumulation``.  A
+        ``spending_rule`` (``retire_plan.strategies.spending``) replaces the
+        plain inflation-indexed spending, starting from ``annual_spending``.
+        """
+        for _ in self._iter_decumulation(withdrawal_strategy, annual_spending,
+                                         inflation_rate, return_rate, spending_rule):
+            pass
+
+    def _iter_decumulation(
+        self,
+        withdrawal_strategy: StrategyFunc,
+        annual_spending: float,
+        inflation_rate: Schedule,
+        return_rate: Schedule,
+        spending_rule: SpendingRule | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Run decumulation one year at a time, yielding each year's record."""
         if annual_spending <= 0:
             raise SimulationConfigError(f"annual_spending must be positive: {annual_spending}")
+        horizon = self.profile.retirement_horizon()
+        inflation = _as_schedule(inflation_rate, horizon, "inflation_rate")
+        rates = _as_schedule(return_rate, horizon, "return_rate", per_account=True)
         current_age = self.profile.current_age
+        # Tax brackets are indexed from the start of the whole simulation
+        first_year = current_age - self.original_profile.current_age
+        tax_schedule = self.tax_calc.schedule(first_year + horizon)
         spending = annual_spending
+        if spending_rule is not None:
+            # Rules work on (paths,) arrays; here there is a single path
+            first, rule_state = spending_rule.start(
+                np.array([float(annual_spending)]), np.array([self.profile.total_balance()]))
+            spending = float(first[0])
 
-        for year in range(self.profile.retirement_horizon()):
+        for year in range(horizon):
             age = current_age + year
 
             state = {
                 "age": age,
+                "year": first_year + year,
                 "target_net_cash": spending,
-                "cpp_income": self.profile.cpp_annual,
-                "oas_income": self.profile.oas_annual,
+                "cpp_income": self.profile.cpp_income(age),
+                "oas_income": self.profile.oas_income(age),
                 "balances": self.profile.all_balances(),
+                "taxable_share": {
+                    "tax_deferred": 1.0,
+                    "tax_free": 0.0,
+                    "taxable": self.profile.taxable.taxable_share()
+                    if hasattr(self.profile.taxable, "taxable_share") else 1.0,
+                },
             }
             plan = withdrawal_strategy(state)
+            # RRIF minimum, enforced on top of the strategy's plan; the part
+            # nobody asked for is reinvested in the taxable account
+            excess = 0.0
+            rrif_minimum = getattr(self.profile.tax_deferred, "rrif_minimum", None)
+            if rrif_minimum is not None:
+                minimum = rrif_minimum(age)
+                excess = max(minimum - max(plan.get("tax_deferred", 0.0), 0.0), 0.0)
+                if excess > 0:
+                    plan = {**plan, "tax_deferred": minimum}
 
             taxable_income = gross_withdrawn = 0.0
             for key, amt in plan.items():
@@ -128,16 +220,19 @@ class Simulator:
                 taxable_income += inc
                 gross_withdrawn += cash
 
-            tax_paid = self.tax_calc.tax_on(taxable_income)
-            net_cash = gross_withdrawn - tax_paid + self.profile.annual_gov_benefits()
+            tax_paid = float(tax_schedule.tax(first_year + year, taxable_income))
+            net_cash = gross_withdrawn - tax_paid + self.profile.annual_gov_benefits(age) - excess
+            if excess > 0:
+                self.profile.taxable.deposit(excess)
 
             # Growth after withdrawal
-            for acc in (self.profile.tax_deferred, self.profile.tax_free, self.profile.taxable):
-                acc.annual_return = return_rate
+            invested = self.profile.total_balance()
+            for acc, rate in zip(self._accounts(), rates[year]):
+                acc.annual_return = float(rate)
                 acc.grow()
 
             # RECORD DECUMULATION YEAR
-            self.history.append({
+            record = {
                 "age": age,
                 "phase": "decumulation",
                 "spending": spending,
@@ -146,9 +241,22 @@ class Simulator:
                 "net_cash_flow": net_cash,
                 "total_wealth": self.profile.total_balance(),
                 "end_balances": self.profile.all_balances(),
-            })
+            }
+            self.history.append(record)
 
-            spending *= (1 + inflation_rate)
+            if spending_rule is None:
+                spending *= (1 + float(inflation[year]))
+            else:
+                wealth = np.array([record["total_wealth"]])
+                spending = float(spending_rule.update(
+                    np.array([spending]), rule_state, wealth,
+                    _portfolio_return(np.array([invested]), wealth),
+                    float(inflation[year]), horizon - year - 1,
+                )[0])
+            yield record
+
+    def _accounts(self) -> tuple:
+        return (self.profile.tax_deferred, self.profile.tax_free, self.profile.taxable)
 
     # --------------------------------------------------------------
     # 3. Full lifecycle – now preserves full history
@@ -158,13 +266,85 @@ class Simulator:
         contribution_strategy: StrategyFunc,
         withdrawal_strategy: StrategyFunc,
         years_working: int = 35,
-        annual_savings: float = 28_000,
+        annual_savings: Schedule = 28_000,
         annual_spending: float = 80_000,
+        accumulation_return: Schedule = 0.07,
+        decumulation_return: Schedule = 0.05,
+        inflation_rate: Schedule = 0.02,
+        spending_rule: SpendingRule | None = None,
     ) -> Dict[str, Any]:
+        """Accumulate, then decumulate, and summarize the whole lifecycle.
+
+        Every rate and ``annual_savings`` accepts a per-year schedule (see
+        ``run_accumulation`` and ``run_decumulation``), e.g. a glide path
+        ``np.linspace(0.07, 0.04, years_working)``.  ``spending_rule``
+        makes retirement spending depend on the portfolio (see
+        ``run_decumulation``).
+
+        With a backend other than ``"python"`` the lifecycle runs there;
+        ``history`` is filled in the same way but ``profile`` is left at
+        its starting state.
+        """
+        self.reset()
+        if self.backend != "python":
+            outcome = self._backend(
+                self.original_profile, contribution_strategy, withdrawal_strategy,
+                tax_calculator=self.tax_calc,
+                years_working=years_working,
+                annual_savings=annual_savings,
+                annual_spending=annual_spending,
+                accumulation_return=accumulation_return,
+                decumulation_return=decumulation_return,
+                inflation_rate=inflation_rate,
+                spending_rule=spending_rule,
+            )
+            self.history.extend(outcome["history"])
+            return {**outcome, "history": self.history}
+        self.run_accumulation(contribution_strategy, years_working, annual_savings,
+                              accumulation_return)
+        self.run_decumulation(withdrawal_strategy, annual_spending, inflation_rate,
+                              decumulation_return, spending_rule)
+        return self._lifecycle_outcome()
+
+    def _run_full_lifecycle_bounded(
+        self,
+        contribution_strategy: StrategyFunc,
+        withdrawal_strategy: StrategyFunc,
+        years_working: int,
+        annual_savings: float,
+        annual_spending: float,
+        decumulation_return: Schedule,
+        inflation_rate: Schedule,
+        incumbents: Sequence[tuple[float, float]],
+    ) -> Dict[str, Any] | None:
+        """``run_full_lifecycle`` that gives up once it is provably dominated.
+
+        After each retirement year the tax paid so far is a lower bound on
+        lifetime tax (tax is never negative), and current wealth compounded
+        at each remaining year's best account return with no further
+        withdrawals is an upper bound on final wealth.  If
+        both bounds are strictly worse than some finished candidate in
+        ``incumbents`` (``(total_tax_paid, final_wealth)`` pairs), the run
+        stops and returns ``None``.
+        """
         self.reset()
         self.run_accumulation(contribution_strategy, years_working, annual_savings)
-        self.run_decumulation(withdrawal_strategy, annual_spending)
 
+        horizon = self.profile.retirement_horizon()
+        rates = _as_schedule(decumulation_return, horizon, "return_rate", per_account=True)
+        # growth[y]: largest possible growth factor from the end of year y to the end
+        growth = np.append(np.cumprod((1 + rates.max(axis=1))[::-1])[::-1], 1.0)
+        tax_so_far = 0.0
+        records = self._iter_decumulation(withdrawal_strategy, annual_spending, inflation_rate,
+                                          decumulation_return)
+        for year, record in enumerate(records, start=1):
+            tax_so_far += record["tax_paid"]
+            wealth_bound = record["total_wealth"] * growth[year]
+            if any(tax_so_far > tax and wealth_bound < wealth for tax, wealth in incumbents):
+                return None
+        return self._lifecycle_outcome()
+
+    def _lifecycle_outcome(self) -> Dict[str, Any]:
         total_tax = sum(r.get("tax_paid", 0) for r in self.history if "tax_paid" in r)
         final_wealth = self.history[-1]["total_wealth"]
         ruin_age = next((r["age"] for r in self.history if r["total_wealth"] < 1_000), None)
@@ -179,7 +359,63 @@ class Simulator:
         }
 
     # --------------------------------------------------------------
-    # 4. Optimizer – unchanged
+    # 3b. Stochastic lifecycle – same outcome keys, estimated over paths
+    # --------------------------------------------------------------
+    def run_monte_carlo(
+        self,
+        contribution_strategy: StrategyFunc,
+        withdrawal_strategy: StrategyFunc,
+        years_working: int = 35,
+        annual_savings: float = 28_000,
+        annual_spending: float = 80_000,
+        **options: Any,
+    ) -> Dict[str, Any]:
+        """Stochastic counterpart of ``run_full_lifecycle``.
+
+        See ``retire_plan.simulation.montecarlo.run_monte_carlo`` for the
+        extra ``options`` (return model, time budget, precision targets).
+        """
+        from .montecarlo import run_monte_carlo
+
+        options.setdefault("tax_calculator", self.tax_calc)
+        return run_monte_carlo(
+            self.original_profile,
+            contribution_strategy,
+            withdrawal_strategy,
+            years_working=years_working,
+            annual_savings=annual_savings,
+            annual_spending=annual_spending,
+            **options,
+        )
+
+    def stress_test(
+        self,
+        contribution_strategy: StrategyFunc,
+        withdrawal_strategy: StrategyFunc,
+        years_working: int = 35,
+        annual_savings: float = 28_000,
+        annual_spending: float = 80_000,
+        **options: Any,
+    ) -> List[Dict[str, Any]]:
+        """Outcome of this plan under each named stress scenario, one row each.
+
+        See ``retire_plan.simulation.stress.stress_test`` for ``options``.
+        """
+        from .stress import stress_test
+
+        options.setdefault("tax_calculator", self.tax_calc)
+        return stress_test(
+            self.original_profile,
+            contribution_strategy,
+            withdrawal_strategy,
+            years_working=years_working,
+            annual_savings=annual_savings,
+            annual_spending=annual_spending,
+            **options,
+        )
+
+    # --------------------------------------------------------------
+    # 4. Optimizer – deterministic, or stochastic with common random numbers
     # --------------------------------------------------------------
     @staticmethod
     def optimize(
@@ -189,23 +425,154 @@ class Simulator:
         years_working: int = 35,
         annual_savings: float = 28_000,
         annual_spending: float = 80_000,
+        return_model: Any = None,
+        top_k: int | None = None,
+        objective: str | Callable[[Dict[str, Any]], float] = "total_tax_paid",
+        prune: bool = False,
+        decumulation_return: Schedule | None = None,
+        inflation_rate: Schedule = 0.02,
+        **stochastic_options: Any,
     ) -> List[Dict[str, Any]]:
+        """Evaluate every contribution/withdrawal pair, best ``objective`` first.
+
+        ``decumulation_return`` (default 0.05) and ``inflation_rate`` are the
+        retirement assumptions, as in ``run_full_lifecycle``; with a
+        ``return_model`` only ``inflation_rate`` applies.
+
+        ``objective`` is an outcome key or a function of the outcome dict;
+        lower is better (default: lowest lifetime tax first).
+
+        With ``top_k`` set, every candidate still gets its summary metrics,
+        but only the ``top_k`` best keep their ``history``; the others drop
+        it as soon as they fall out of a bounded heap, so memory per
+        candidate stays constant however large the grid is.
+
+        With ``prune=True`` candidates are evaluated incrementally and
+        abandoned mid-retirement once they are strictly worse than an
+        already finished candidate on both lifetime tax and final wealth
+        (see ``_run_full_lifecycle_bounded``).  Abandoned candidates are left
+        out of the results; the lowest-tax candidate and every candidate on
+        the (tax, final wealth) trade-off frontier are always kept.
+
+        Passing a ``return_model`` (``retire_plan.simulation.ReturnModel``)
+        switches to stochastic returns: all pairs share one scenario set and
+        report paired differences, see
+        ``retire_plan.simulation.montecarlo.optimize_stochastic``.  Add
+        ``successive_halving=True`` to race the pairs instead, dropping the
+        worse half each round (``montecarlo.race_strategies``).
+        Other keyword options are those of ``optimize_stochastic``; passing
+        any without a ``return_model`` raises ``SimulationConfigError``.
+
+        Equivalent strategies (same canonical ``strategy.spec``, or the same
+        function listed twice) are evaluated once; the duplicates are listed
+        right after the pair they are equivalent to, with copied outcomes.
+        With ``top_k`` set the copies carry no ``history``, so at most
+        ``top_k`` entries hold one.
+        """
+        contribution_strategies, c_aliases = dedupe_strategies(contribution_strategies)
+        withdrawal_strategies, w_aliases = dedupe_strategies(withdrawal_strategies)
+        results = Simulator._optimize_unique(
+            base_profile, contribution_strategies, withdrawal_strategies,
+            years_working, annual_savings, annual_spending, return_model,
+            top_k, objective, prune, decumulation_return, inflation_rate,
+            **stochastic_options,
+        )
+
+        expanded = []
+        for entry in results:
+            c_names = [entry["contrib_strategy"], *c_aliases[entry["contrib_strategy"]]]
+            w_names = [entry["withdraw_strategy"], *w_aliases[entry["withdraw_strategy"]]]
+            expanded.append(entry)
+            copied = entry
+            if top_k is not None:
+                copied = {key: value for key, value in entry.items() if key != "history"}
+            for c_name in c_names:
+                for w_name in w_names:
+                    if (c_name, w_name) != (c_names[0], w_names[0]):
+                        expanded.append({**copied, "contrib_strategy": c_name,
+                                         "withdraw_strategy": w_name})
+        return expanded
+
+    @staticmethod
+    def _optimize_unique(
+        base_profile: PersonProfile,
+        contribution_strategies: Sequence[tuple[str, StrategyFunc]],
+        withdrawal_strategies: Sequence[tuple[str, StrategyFunc]],
+        years_working: int,
+        annual_savings: float,
+        annual_spending: float,
+        return_model: Any,
+        top_k: int | None,
+        objective: str | Callable[[Dict[str, Any]], float],
+        prune: bool,
+        decumulation_return: Schedule | None,
+        inflation_rate: Schedule,
+        **stochastic_options: Any,
+    ) -> List[Dict[str, Any]]:
+        if return_model is None and stochastic_options:
+            raise SimulationConfigError(
+                f"{sorted(stochastic_options)} only apply with a return_model"
+            )
+        if return_model is not None:
+            if top_k is not None or prune or decumulation_return is not None:
+                raise SimulationConfigError(
+                    "top_k, prune and decumulation_return only apply to deterministic runs"
+                )
+            from .montecarlo import optimize_stochastic
+
+            return optimize_stochastic(
+                base_profile, contribution_strategies, withdrawal_strategies,
+                years_working=years_working,
+                annual_savings=annual_savings,
+                annual_spending=annual_spending,
+                return_model=return_model,
+                inflation_rate=inflation_rate,
+                **stochastic_options,
+            )
+        if decumulation_return is None:
+            decumulation_return = 0.05
+        if top_k is not None and top_k < 0:
+            raise SimulationConfigError(f"top_k cannot be negative: {top_k}")
+
+        score = objective if callable(objective) else (lambda r: r[objective])
         results = []
+        # Max-heap (by score, then by arrival) of the candidates holding histories
+        kept: List[tuple] = []
+        # (total_tax_paid, final_wealth) of finished candidates, for pruning
+        incumbents: List[tuple[float, float]] = []
         tax_calc = TaxCalculator()
 
         for c_name, c_strat in contribution_strategies:
             for w_name, w_strat in withdrawal_strategies:
                 sim = Simulator(base_profile, tax_calc)
-                outcome = sim.run_full_lifecycle(
-                    c_strat, w_strat,
-                    years_working=years_working,
-                    annual_savings=annual_savings,
-                    annual_spending=annual_spending,
-                )
-                results.append({
+                if prune:
+                    outcome = sim._run_full_lifecycle_bounded(
+                        c_strat, w_strat, years_working, annual_savings,
+                        annual_spending, decumulation_return, inflation_rate, incumbents,
+                    )
+                    if outcome is None:
+                        continue
+                    incumbents.append((outcome["total_tax_paid"], outcome["final_wealth"]))
+                else:
+                    outcome = sim.run_full_lifecycle(
+                        c_strat, w_strat,
+                        years_working=years_working,
+                        annual_savings=annual_savings,
+                        annual_spending=annual_spending,
+                        decumulation_return=decumulation_return,
+                        inflation_rate=inflation_rate,
+                    )
+                entry = {
                     "contrib_strategy": c_name,
                     "withdraw_strategy": w_name,
                     **outcome
-                })
+                }
+                results.append(entry)
+
+                if top_k is not None:
+                    heapq.heappush(kept, (-score(entry), -len(results), entry))
+                    if len(kept) > top_k:
+                        _, _, dropped = heapq.heappop(kept)
+                        del dropped["history"]
 
-        return sorted(results, key=lambda x: x["total_tax_paid"])
\ No newline at end of file
+        return sorted(results, key=score)
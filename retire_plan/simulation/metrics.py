@@ -4,14 +4,99 @@ simulation.metrics – Tax calculator + simulation metrics in one file
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+import numpy as np
+
+
+_INF = float("inf")
+
+
+@dataclass(frozen=True)
+class TaxSchedule:
+    """Combined federal + provincial brackets for every simulated year.
+
+    Attributes
+    ----------
+    thresholds : np.ndarray
+        ``(years, brackets)`` bracket floors, indexed from year 0.
+    base : np.ndarray
+        ``(years, brackets)`` tax owed on all income below each floor.
+    rates : np.ndarray
+        ``(brackets,)`` combined marginal rate of each bracket.
+    net_floors : np.ndarray
+        ``(years, brackets)`` after-tax income at each bracket floor, used
+        by ``gross_for_net`` (derived from ``thresholds`` and ``base``).
+    """
+
+    thresholds: np.ndarray
+    base: np.ndarray
+    rates: np.ndarray
+    net_floors: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if (self.rates >= 1).any():
+            raise ValueError("marginal tax rates must be below 100%")
+        object.__setattr__(self, "net_floors", self.thresholds - self.base)
+
+    @property
+    def n_years(self) -> int:
+        return int(self.thresholds.shape[0])
+
+    def tax(self, year: int, taxable_income):
+        """Tax owed on ``taxable_income`` (scalar or array) in ``year``.
+
+        One ``searchsorted`` over that year's bracket floors.
+        """
+        income = np.asarray(taxable_income, dtype=float)
+        lows = self.thresholds[year]
+        idx = np.clip(np.searchsorted(lows, income, side="right") - 1, 0, lows.size - 1)
+        total = self.base[year, idx] + (income - lows[idx]) * self.rates[idx]
+        return np.where(income > 0, total, 0.0)
+
+    def gross_for_net(self, year: int, net_income):
+        """Taxable income whose after-tax amount is ``net_income`` in ``year``.
+
+        Exact inverse of ``income - tax(year, income)``: after-tax income is
+        piecewise linear and increasing, so the bracket is found with one
+        ``searchsorted`` over ``net_floors`` and the gross is solved in
+        closed form.  Zero for non-positive ``net_income``.
+        """
+        net = np.asarray(net_income, dtype=float)
+        floors = self.net_floors[year]
+        idx = np.clip(np.searchsorted(floors, net, side="right") - 1, 0, floors.size - 1)
+        gross = self.thresholds[year, idx] + (net - floors[idx]) / (1.0 - self.rates[idx])
+        return np.where(net > 0, gross, 0.0)
+
+
+def _combine(*schedules: List[Tuple[float, float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Bracket floors and summed marginal rates of several bracket lists."""
+    lows = np.unique(np.concatenate([[low for low, _, _ in b] for b in schedules]))
+    rates = np.zeros(lows.size)
+    for brackets in schedules:
+        for low, high, rate in brackets:
+            rates[(lows >= low) & (lows < high)] += rate
+    return lows, rates
 
 
 @dataclass
 class TaxCalculator:
-    """Realistic Canadian tax model for retirement planning (2025 brackets)."""
+    """Realistic Canadian tax model for retirement planning (2025 brackets).
+
+    Attributes
+    ----------
+    province : str
+        Two-letter code selecting ``PROVINCIAL_BRACKETS`` (unknown codes
+        fall back to a flat 12%).
+    indexation_rate : float, array or None
+        Yearly growth of every bracket threshold, as a constant or one rate
+        per simulated year (the rate of year ``y`` moves the thresholds from
+        year ``y`` to ``y + 1``).  Year 0 – the profile's current age – uses
+        the 2025 thresholds.  ``None`` keeps them frozen.
+    """
     province: str = "ON"
+    indexation_rate: Any = None
 
     # Federal brackets (approx 2025)
     FEDERAL_BRACKETS = [
@@ -19,36 +104,101 @@ class TaxCalculator:
         (57_000, 114_000, 0.205),
         (114_000, 177_000, 0.26),
         (177_000, 246_000, 0.29),
-        (246_000, float("inf"), 0.33),
+        (246_000, _INF, 0.33),
     ]
 
-    PROVINCIAL_RATES = {
-        "ON": 0.115, "BC": 0.105, "QC": 0.185, "AB": 0.12, "MB": 0.13,
-        "SK": 0.125, "NS": 0.14, "NB": 0.14, "NL": 0.14, "PE": 0.14,
+    # Provincial brackets (approx 2025, surtaxes and credits ignored)
+    PROVINCIAL_BRACKETS = {
+        "ON": [(0, 52_886, 0.0505), (52_886, 105_775, 0.0915), (105_775, 150_000, 0.1116),
+               (150_000, 220_000, 0.1216), (220_000, _INF, 0.1316)],
+        "BC": [(0, 49_279, 0.0506), (49_279, 98_560, 0.077), (98_560, 113_158, 0.105),
+               (113_158, 137_407, 0.1229), (137_407, 186_306, 0.147),
+               (186_306, 259_829, 0.168), (259_829, _INF, 0.205)],
+        "QC": [(0, 53_255, 0.14), (53_255, 106_495, 0.19), (106_495, 129_590, 0.24),
+               (129_590, _INF, 0.2575)],
+        "AB": [(0, 60_000, 0.08), (60_000, 151_234, 0.10), (151_234, 181_481, 0.12),
+               (181_481, 241_974, 0.13), (241_974, 362_961, 0.14), (362_961, _INF, 0.15)],
+        "MB": [(0, 47_000, 0.108), (47_000, 100_000, 0.1275), (100_000, _INF, 0.174)],
+        "SK": [(0, 53_463, 0.105), (53_463, 152_750, 0.125), (152_750, _INF, 0.145)],
+        "NS": [(0, 30_507, 0.0879), (30_507, 61_015, 0.1495), (61_015, 95_883, 0.1667),
+               (95_883, 154_650, 0.175), (154_650, _INF, 0.21)],
+        "NB": [(0, 51_306, 0.094), (51_306, 102_614, 0.14), (102_614, 190_060, 0.16),
+               (190_060, _INF, 0.195)],
+        "NL": [(0, 44_192, 0.087), (44_192, 88_382, 0.145), (88_382, 157_792, 0.158),
+               (157_792, 220_910, 0.178), (220_910, 282_214, 0.198),
+               (282_214, 564_429, 0.208), (564_429, 1_128_858, 0.213),
+               (1_128_858, _INF, 0.218)],
+        "PE": [(0, 33_328, 0.095), (33_328, 64_656, 0.1347), (64_656, 105_000, 0.166),
+               (105_000, 140_000, 0.1762), (140_000, _INF, 0.19)],
     }
+    DEFAULT_PROVINCIAL_BRACKETS = [(0, _INF, 0.12)]
+
+    _schedule: TaxSchedule | None = field(default=None, init=False, repr=False, compare=False)
+    # (province, indexation_rate) the cached schedule was built for
+    _schedule_key: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def schedule(self, n_years: int) -> TaxSchedule:
+        """Indexed brackets for years ``0 .. n_years - 1`` as one table.
+
+        Built once and reused: later calls for the same or fewer years
+        return the cached table (its first rows are the same).  Changing
+        ``province`` or ``indexation_rate`` rebuilds it.
+        """
+        n_years = max(int(n_years), 1)
+        rate = self.indexation_rate
+        key = (self.province, tuple(np.ravel(rate).tolist()) if np.ndim(rate) else rate)
+        cached = self._schedule
+        if cached is not None and cached.n_years >= n_years and self._schedule_key == key:
+            return cached
+
+        provincial = self.PROVINCIAL_BRACKETS.get(self.province, self.DEFAULT_PROVINCIAL_BRACKETS)
+        lows, rates = _combine(self.FEDERAL_BRACKETS, provincial)
+        # Tax owed on all income below each bracket floor, in year-0 dollars
+        base = np.concatenate(([0.0], np.cumsum(np.diff(lows) * rates[:-1])))
+
+        factors = np.ones(n_years)
+        if self.indexation_rate is not None:
+            growth = np.asarray(self.indexation_rate, dtype=float)
+            if growth.ndim == 0:
+                growth = np.full(n_years - 1, float(growth))
+            elif growth.ndim != 1 or growth.size < n_years - 1:
+                raise ValueError(
+                    f"indexation_rate must be a constant or cover {n_years - 1} years; "
+                    f"got shape {growth.shape}"
+                )
+            factors[1:] = np.cumprod(1.0 + growth[:n_years - 1])
 
-    def effective_rate(self, taxable_income: float) -> float:
+        self._schedule_key = key
+        self._schedule = TaxSchedule(
+            thresholds=factors[:, None] * lows,
+            base=factors[:, None] * base,
+            rates=rates,
+        )
+        return self._schedule
+
+    def effective_rate(self, taxable_income: float, year: int = 0) -> float:
         if taxable_income <= 0:
             return 0.0
-        federal_tax = 0.0
-        remaining = taxable_income
-        prev = 0
-        for low, high, rate in self.FEDERAL_BRACKETS:
-            bracket_size = high - max(low, prev)
-            if remaining <= 0:
-                break
-            taxable_in_bracket = min(remaining, bracket_size)
-            federal_tax += taxable_in_bracket * rate
-            remaining -= taxable_in_bracket
-            prev = high
-
-        provincial_rate = self.PROVINCIAL_RATES.get(self.province, 0.12)
-        provincial_tax = taxable_income * provincial_rate
-        total_tax = federal_tax + provincial_tax
-        return total_tax / taxable_income
-
-    def tax_on(self, taxable_income: float) -> float:
-        return taxable_income * self.effective_rate(taxable_income)
+        return self.tax_on(taxable_income, year) / taxable_income
+
+    def tax_on(self, taxable_income: float, year: int = 0) -> float:
+        return float(self.tax_on_array(taxable_income, year))
+
+    def tax_on_array(self, taxable_income: np.ndarray, year: int = 0) -> np.ndarray:
+        """Vectorized ``tax_on`` for a batch of incomes.
+
+        One ``searchsorted`` over the cached bracket table (see
+        ``schedule``), so a whole batch of paths is taxed at once.
+        """
+        return self.schedule(year + 1).tax(year, taxable_income)
+
+    def gross_for_net(self, net_income: float, year: int = 0) -> float:
+        """Taxable income needed to keep ``net_income`` after tax."""
+        return float(self.gross_for_net_array(net_income, year))
+
+    def gross_for_net_array(self, net_income: np.ndarray, year: int = 0) -> np.ndarray:
+        """Vectorized ``gross_for_net`` (the exact inverse of ``tax_on_array``)."""
+        return self.schedule(year + 1).gross_for_net(year, net_income)
 
 
 # Metrics functions
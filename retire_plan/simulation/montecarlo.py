@@ -0,0 +1,729 @@
+"""
+simulation.montecarlo – Stochastic lifecycle studies on top of the batch engine.
+
+``run_monte_carlo`` simulates paths in blocks and stops as soon as the
+estimates are precise enough or the wall-clock budget is spent, so callers
+can ask for "an answer within 200 ms" instead of a fixed path count.
+
+Variance reduction
+------------------
+``variance_reduction`` accepts any combination of:
+
+- ``"antithetic"``: paths come in mirrored pairs (``z`` and ``-z``).
+- ``"control_variate"``: the cash flows of the deterministic (mean-return)
+  path are replayed on every stochastic return path.  The replayed final
+  wealth has a known expectation – the deterministic final wealth – and is
+  strongly correlated with the simulated outcomes, so it is used to correct
+  the mean-type estimates (success rate, tax, peak wealth).
+- ``"halton"`` or ``"sobol"``: randomized low-discrepancy draws instead of
+  pseudo-random ones; every block is an independent randomization.
+
+Standard errors are computed on the independent units (pairs, or blocks for
+low-discrepancy draws), so early stopping benefits from the reduction.
+
+Common random numbers
+---------------------
+``optimize_stochastic`` draws one scenario set and evaluates every
+contribution/withdrawal pair on it, so strategy differences are measured
+path by path (``paired_difference``) instead of being buried in sampling
+noise.  With ``workers > 1`` the scenarios live in one read-only
+shared-memory block that every worker process maps without copying.
+
+Successive halving
+------------------
+``race_strategies`` spends paths where they matter: every candidate is
+evaluated on a small path budget, the worse part of the field is dropped,
+and the survivors continue on twice as many paths (the same draws for all,
+so comparisons stay paired) until one is left or the budget runs out.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from retire_plan.accounts import PersonProfile
+from retire_plan.strategies.spending import SpendingRule
+from .batch import ACCOUNT_KEYS, BatchResult, StrategyFunc, simulate_batch
+from .engine import SimulationConfigError
+from .metrics import TaxCalculator
+from .mortality import MortalityTable
+from .scenarios import ReturnModel
+
+VARIANCE_REDUCTION = ("antithetic", "control_variate", "halton", "sobol")
+
+Estimate = Tuple[float, float, Tuple[float, float]]
+
+
+def _z_value(confidence: float) -> float:
+    if not 0 < confidence < 1:
+        raise SimulationConfigError(f"confidence must be in (0, 1): {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _proportion(successes: int, n: int, z: float) -> Estimate:
+    """Success rate, its standard error and a normal-approximation interval.
+
+    The standard error uses the add-one estimate so that a run where every
+    path succeeds (or fails) does not report zero uncertainty.
+    """
+    p = successes / n
+    p_adj = (successes + 1) / (n + 2)
+    se = float(np.sqrt(p_adj * (1 - p_adj) / n))
+    return p, se, (max(0.0, p - z * se), min(1.0, p + z * se))
+
+
+def _median(values: np.ndarray, z: float) -> Estimate:
+    """Median with a distribution-free (order statistic) confidence interval."""
+    n = values.shape[0]
+    ordered = np.sort(values)
+    half_width = z * np.sqrt(n) / 2
+    lo = ordered[max(0, int(np.floor(n / 2 - half_width)))]
+    hi = ordered[min(n - 1, int(np.ceil(n / 2 + half_width)))]
+    se = float((hi - lo) / (2 * z))
+    return float(np.median(ordered)), se, (float(lo), float(hi))
+
+
+def _group_means(values: np.ndarray, groups: np.ndarray | None) -> np.ndarray:
+    if groups is None:
+        return values
+    return np.bincount(groups, weights=values) / np.bincount(groups)
+
+
+def _mean(
+    values: np.ndarray,
+    z: float,
+    groups: np.ndarray | None = None,
+    control: np.ndarray | None = None,
+    control_mean: float = 0.0,
+) -> Estimate:
+    """Mean over independent units, optionally corrected by a control variate."""
+    y = _group_means(values.astype(float), groups)
+    if control is not None:
+        x = _group_means(control, groups)
+        var_x = x.var(ddof=1) if x.shape[0] > 1 else 0.0
+        if var_x > 0:
+            beta = np.cov(y, x)[0, 1] / var_x
+            y = y - beta * (x - control_mean)
+    n = y.shape[0]
+    mean = float(y.mean())
+    se = float(y.std(ddof=1) / np.sqrt(n)) if n > 1 else float("inf")
+    return mean, se, (mean - z * se, mean + z * se)
+
+
+def _median_ruin_age(ruin_age: np.ndarray) -> int | None:
+    """Median ruin age, treating paths that never ran out as 'never'."""
+    median = np.median(np.where(np.isnan(ruin_age), np.inf, ruin_age))
+    return None if np.isinf(median) else int(median)
+
+
+def summarize_paths(
+    result: BatchResult,
+    confidence: float = 0.95,
+    groups: np.ndarray | None = None,
+    control: np.ndarray | None = None,
+    control_mean: float = 0.0,
+) -> Dict[str, Any]:
+    """Collapse per-path outcomes into ``run_full_lifecycle``-style estimates.
+
+    Returns the usual outcome keys (``success`` is the probability of never
+    running out, ``final_wealth`` the median path, tax and peak wealth are
+    means) plus ``stderr`` and ``confidence_interval`` dicts keyed the same way.
+
+    Parameters
+    ----------
+    groups : np.ndarray, optional
+        Integer id of the independent unit each path belongs to (antithetic
+        pair, randomized point set).  Standard errors use unit means.
+    control, control_mean : optional
+        Per-path control variate and its exact expectation.
+    """
+    z = _z_value(confidence)
+    n = result.n_paths
+    success = result.success
+    if groups is None and control is None or success.all() or not success.any():
+        success_est = _proportion(int(success.sum()), n, z)
+    else:
+        p, se, _ = _mean(success, z, groups, control, control_mean)
+        p = min(1.0, max(0.0, p))
+        success_est = p, se, (max(0.0, p - z * se), min(1.0, p + z * se))
+
+    estimates = {
+        "success": success_est,
+        "final_wealth": _median(result.final_wealth, z),
+        "total_tax_paid": _mean(result.total_tax_paid, z, groups, control, control_mean),
+        "peak_wealth": _mean(result.peak_wealth, z, groups, control, control_mean),
+    }
+    return {
+        **{key: est[0] for key, est in estimates.items()},
+        "ruin_age": _median_ruin_age(result.ruin_age),
+        "stderr": {key: est[1] for key, est in estimates.items()},
+        "confidence_interval": {key: est[2] for key, est in estimates.items()},
+        "n_paths": n,
+    }
+
+
+def _concat(results: list[BatchResult]) -> BatchResult:
+    if len(results) == 1:
+        return results[0]
+    return BatchResult(
+        final_wealth=np.concatenate([r.final_wealth for r in results]),
+        total_tax_paid=np.concatenate([r.total_tax_paid for r in results]),
+        ruin_age=np.concatenate([r.ruin_age for r in results]),
+        peak_wealth=np.concatenate([r.peak_wealth for r in results]),
+        death_age=(None if results[0].death_age is None
+                   else np.concatenate([r.death_age for r in results])),
+    )
+
+
+def _parse_variance_reduction(options: str | Iterable[str] | None) -> set[str]:
+    if options is None:
+        return set()
+    chosen = {options} if isinstance(options, str) else set(options)
+    unknown = chosen - set(VARIANCE_REDUCTION)
+    if unknown:
+        raise SimulationConfigError(
+            f"unknown variance_reduction {sorted(unknown)}; expected {VARIANCE_REDUCTION}"
+        )
+    if {"halton", "sobol"} <= chosen:
+        raise SimulationConfigError("choose at most one of 'halton' and 'sobol'")
+    return chosen
+
+
+def deterministic_flows(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    mean_returns: np.ndarray,
+    **run_kwargs: Any,
+) -> Tuple[np.ndarray, float]:
+    """Net cash flow into each account along the deterministic path.
+
+    Returns ``(flows, final_wealth)`` where ``flows`` has shape
+    ``(years, 3)`` (deposits positive, withdrawals negative) and
+    ``final_wealth`` is the deterministic Simulator outcome.
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    result = simulate_batch(
+        profile, contribution_strategy, withdrawal_strategy,
+        mean_returns[None, :], record=True, **run_kwargs,
+    )
+    end = result.trajectories["end_balances"][0]
+    growth = 1.0 + (mean_returns[:, None] if mean_returns.ndim == 1 else mean_returns)
+    start = np.vstack((
+        [profile.all_balances()[key] for key in ACCOUNT_KEYS],
+        end[:-1],
+    ))
+    return end / growth - start, float(result.final_wealth[0])
+
+
+def replay_flows(initial: np.ndarray, flows: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """Final wealth of fixed cash ``flows`` compounded along each return path.
+
+    Linear in every year's growth factor, so for independent years its
+    expectation equals the deterministic path's final wealth exactly.
+    """
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 2:
+        returns = returns[:, :, None]
+    bal = np.tile(np.asarray(initial, dtype=float), (returns.shape[0], 1))
+    for t in range(flows.shape[0]):
+        bal = (bal + flows[t]) * (1.0 + returns[:, t])
+    return bal.sum(axis=1)
+
+
+def run_monte_carlo(
+    profile: PersonProfile,
+    contribution_strategy: StrategyFunc,
+    withdrawal_strategy: StrategyFunc,
+    years_working: int = 35,
+    annual_savings: float = 28_000,
+    annual_spending: float = 80_000,
+    return_model: ReturnModel | None = None,
+    inflation_rate: float = 0.02,
+    tax_calculator: TaxCalculator | None = None,
+    time_budget: float | None = None,
+    target_success_stderr: float = 0.005,
+    target_wealth_rel_stderr: float = 0.01,
+    block_size: int = 1_000,
+    max_paths: int = 100_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    variance_reduction: str | Iterable[str] | None = None,
+    mortality: MortalityTable | None = None,
+    spending_rule: SpendingRule | None = None,
+) -> Dict[str, Any]:
+    """Run stochastic lifecycles in blocks until precise enough or out of time.
+
+    Parameters
+    ----------
+    time_budget : float or None
+        Wall-clock budget in seconds.  A new block is only started if the
+        previous block's duration still fits in the remaining budget.
+    target_success_stderr : float
+        Stop once the standard error of the success probability is at or
+        below this value...
+    target_wealth_rel_stderr : float
+        ...and the standard error of the median final wealth, relative to
+        the median, is at or below this value.
+    block_size, max_paths : int
+        Paths per block, and a hard cap on the total (rounded down to whole
+        blocks, at least one).
+    variance_reduction : str or iterable of str, optional
+        Any of ``VARIANCE_REDUCTION`` (see module docstring).
+    return_model : ReturnModel or MultiAssetModel, optional
+        A model with ``sample_scenarios`` (``MultiAssetModel``) also draws
+        each path's inflation, replacing ``inflation_rate`` in the
+        simulation (the control variate still uses its mean).
+    mortality : MortalityTable, optional
+        Draw each path's death age from this table instead of ending every
+        path at ``profile.end_age``.  Paths stop at death, so ``success``
+        becomes the mortality-weighted probability of never running out of
+        money while alive and ``final_wealth`` is the estate at death.
+    spending_rule : SpendingRule, optional
+        Dynamic retirement spending (``retire_plan.strategies.spending``),
+        applied to each path from its own returns.
+
+    Returns
+    -------
+    dict
+        The ``summarize_paths`` estimates, plus ``elapsed`` (seconds) and
+        ``converged`` (whether both precision targets were met).  With
+        ``mortality`` also ``mortality_weighted_success`` (same as
+        ``success``) and ``median_death_age``.
+    """
+    if block_size <= 0 or max_paths <= 0:
+        raise SimulationConfigError("block_size and max_paths must be positive")
+    if time_budget is not None and time_budget <= 0:
+        raise SimulationConfigError(f"time_budget must be positive: {time_budget}")
+
+    methods = _parse_variance_reduction(variance_reduction)
+    antithetic = "antithetic" in methods
+    sampler = "halton" if "halton" in methods else "sobol" if "sobol" in methods else "mc"
+    block_size = min(block_size, max_paths)
+    if antithetic and block_size % 2:
+        raise SimulationConfigError(f"antithetic sampling needs an even block_size: {block_size}")
+    max_blocks = max(1, max_paths // block_size)
+
+    if mortality is not None:
+        # Simulate up to the end of the table; each path stops at its death age
+        profile = copy.deepcopy(profile)
+        profile.end_age = mortality.max_age
+    model = return_model or ReturnModel()
+    stochastic_inflation = hasattr(model, "sample_scenarios")
+    rng = np.random.default_rng(seed)
+    years_retired = max(0, profile.end_age - profile.current_age - years_working)
+    run_kwargs = dict(
+        years_working=years_working,
+        annual_savings=annual_savings,
+        annual_spending=annual_spending,
+        inflation_rate=model.inflation_mean if stochastic_inflation else inflation_rate,
+        tax_calculator=tax_calculator,
+        spending_rule=spending_rule,
+    )
+
+    flows = control_mean = None
+    if "control_variate" in methods:
+        if not getattr(model, "rebalance", True):
+            # Drifting weights make account growth path-dependent, so the
+            # replayed flows no longer have the deterministic path's mean.
+            raise SimulationConfigError("control_variate needs a model that rebalances yearly")
+        flows, control_mean = deterministic_flows(
+            profile, contribution_strategy, withdrawal_strategy,
+            model.mean_returns(years_working, years_retired), **run_kwargs,
+        )
+        initial = np.array([profile.all_balances()[key] for key in ACCOUNT_KEYS])
+
+    start = time.perf_counter()
+    blocks: list[BatchResult] = []
+    controls: list[np.ndarray] = []
+    groups: list[np.ndarray] = []
+    death_ages: list[np.ndarray] = []
+    while True:
+        block_start = time.perf_counter()
+        b = len(blocks)
+        block_kwargs = run_kwargs
+        if stochastic_inflation:
+            returns, inflation = model.sample_scenarios(
+                block_size, years_working, years_retired, rng,
+                sampler=sampler, antithetic=antithetic)
+            block_kwargs = {**run_kwargs, "inflation_rate": inflation}
+        else:
+            returns = model.sample(block_size, years_working, years_retired, rng,
+                                   sampler=sampler, antithetic=antithetic)
+        if mortality is not None:
+            death_ages.append(mortality.sample_death_ages(block_size, profile.current_age, rng))
+            block_kwargs = {**block_kwargs, "death_ages": death_ages[-1]}
+        blocks.append(simulate_batch(
+            profile, contribution_strategy, withdrawal_strategy, returns, **block_kwargs
+        ))
+        if flows is not None:
+            controls.append(replay_flows(initial, flows, returns))
+        if sampler != "mc":
+            groups.append(np.full(block_size, b))
+        elif antithetic:
+            half = block_size // 2
+            groups.append(np.tile(np.arange(half), 2) + b * half)
+
+        summary = summarize_paths(
+            _concat(blocks), confidence,
+            # A single randomized point set carries no replicate information;
+            # fall back to treating its points as independent (conservative).
+            groups=np.concatenate(groups) if groups and (sampler == "mc" or b > 0) else None,
+            control=np.concatenate(controls) if controls else None,
+            control_mean=control_mean or 0.0,
+        )
+        median = abs(summary["final_wealth"])
+        wealth_rel_se = summary["stderr"]["final_wealth"] / median if median > 0 else 0.0
+        converged = (
+            summary["stderr"]["success"] <= target_success_stderr
+            and wealth_rel_se <= target_wealth_rel_stderr
+        )
+
+        now = time.perf_counter()
+        out_of_time = (
+            time_budget is not None
+            and (now - start) + (now - block_start) > time_budget
+        )
+        if converged or out_of_time or len(blocks) >= max_blocks:
+            break
+
+    if mortality is not None:
+        summary["mortality_weighted_success"] = summary["success"]
+        summary["median_death_age"] = float(np.median(np.concatenate(death_ages)))
+    summary["elapsed"] = time.perf_counter() - start
+    summary["converged"] = converged
+    summary["variance_reduction"] = sorted(methods)
+    return summary
+
+
+def paired_difference(
+    candidate: np.ndarray,
+    baseline: np.ndarray,
+    confidence: float = 0.95,
+) -> Dict[str, Any]:
+    """Mean of ``candidate - baseline`` over paths evaluated on the same draws."""
+    diff = np.asarray(candidate, dtype=float) - np.asarray(baseline, dtype=float)
+    mean, se, ci = _mean(diff, _z_value(confidence))
+    return {"difference": mean, "stderr": se, "confidence_interval": ci}
+
+
+# Scenario array seen by the current process (set once per worker)
+_SCENARIOS: np.ndarray | None = None
+_SCENARIO_SHM: shared_memory.SharedMemory | None = None
+
+
+def _attach_scenarios(name: str, shape: Tuple[int, ...], dtype: str) -> None:
+    """Worker initializer: map the shared scenario block read-only."""
+    global _SCENARIOS, _SCENARIO_SHM
+    _SCENARIO_SHM = shared_memory.SharedMemory(name=name)
+    view = np.ndarray(shape, dtype=dtype, buffer=_SCENARIO_SHM.buf)
+    view.flags.writeable = False
+    _SCENARIOS = view
+
+
+def _evaluate_on_scenarios(task: Tuple[PersonProfile, StrategyFunc, StrategyFunc, Dict[str, Any]]) -> BatchResult:
+    profile, contrib, withdraw, run_kwargs = task
+    return simulate_batch(profile, contrib, withdraw, _SCENARIOS, **run_kwargs)
+
+
+# race_strategies options accepted by optimize_stochastic(successive_halving=True)
+HALVING_OPTIONS = frozenset({"initial_paths", "keep_fraction", "objective"})
+
+
+def optimize_stochastic(
+    base_profile: PersonProfile,
+    contribution_strategies: Sequence[tuple[str, StrategyFunc]],
+    withdrawal_strategies: Sequence[tuple[str, StrategyFunc]],
+    years_working: int = 35,
+    annual_savings: float = 28_000,
+    annual_spending: float = 80_000,
+    return_model: ReturnModel | None = None,
+    n_paths: int = 2_000,
+    seed: int | None = None,
+    workers: int = 1,
+    inflation_rate: float = 0.02,
+    tax_calculator: TaxCalculator | None = None,
+    confidence: float = 0.95,
+    successive_halving: bool = False,
+    **halving_options: Any,
+) -> List[Dict[str, Any]]:
+    """Stochastic ``Simulator.optimize`` using common random numbers.
+
+    Every strategy pair is evaluated on the same ``n_paths`` return
+    scenarios.  Results are sorted by mean lifetime tax, like the
+    deterministic optimizer, and each entry carries ``paired_vs_best``:
+    paired differences (candidate minus the first entry) of mean tax, mean
+    final wealth and success probability, with standard errors.
+
+    Parameters
+    ----------
+    return_model : ReturnModel or MultiAssetModel, optional
+        A model with ``sample_scenarios`` (``MultiAssetModel``) also draws
+        each path's inflation, shared by all candidates in place of
+        ``inflation_rate``.
+    workers : int
+        Number of worker processes.  With more than one, the scenarios are
+        placed in shared memory once and mapped read-only by every worker;
+        strategies must then be picklable (module-level functions).
+    successive_halving : bool
+        Race the candidates with ``race_strategies`` instead, using
+        ``n_paths`` as the per-candidate path cap; ``halving_options`` are
+        passed through (``initial_paths``, ``keep_fraction``, ``objective``).
+        Races run in-process, so ``workers`` must stay 1.
+
+    Raises
+    ------
+    SimulationConfigError
+        For an unknown option, halving options without
+        ``successive_halving``, or ``workers`` with ``successive_halving``.
+    """
+    unknown = set(halving_options) - HALVING_OPTIONS
+    if unknown:
+        raise SimulationConfigError(f"unknown stochastic options: {sorted(unknown)}")
+    if halving_options and not successive_halving:
+        raise SimulationConfigError(
+            f"{sorted(halving_options)} only apply with successive_halving=True")
+    if successive_halving and workers != 1:
+        raise SimulationConfigError("workers does not apply with successive_halving=True")
+    if successive_halving:
+        return race_strategies(
+            base_profile, contribution_strategies, withdrawal_strategies,
+            years_working=years_working,
+            annual_savings=annual_savings,
+            annual_spending=annual_spending,
+            return_model=return_model,
+            max_paths=n_paths,
+            seed=seed,
+            inflation_rate=inflation_rate,
+            tax_calculator=tax_calculator,
+            confidence=confidence,
+            **halving_options,
+        )
+    if n_paths <= 0:
+        raise SimulationConfigError(f"n_paths must be positive: {n_paths}")
+    if workers <= 0:
+        raise SimulationConfigError(f"workers must be positive: {workers}")
+
+    global _SCENARIOS
+    model = return_model or ReturnModel()
+    years_retired = max(0, base_profile.end_age - base_profile.current_age - years_working)
+    rng = np.random.default_rng(seed)
+    if hasattr(model, "sample_scenarios"):
+        # Every candidate shares the model's inflation paths too
+        scenarios, inflation_rate = model.sample_scenarios(
+            n_paths, years_working, years_retired, rng)
+    else:
+        scenarios = model.sample(n_paths, years_working, years_retired, rng)
+    scenarios.flags.writeable = False
+
+    run_kwargs = dict(
+        years_working=years_working,
+        annual_savings=annual_savings,
+        annual_spending=annual_spending,
+        inflation_rate=inflation_rate,
+        tax_calculator=tax_calculator,
+    )
+    names = [(c_name, w_name)
+             for c_name, _ in contribution_strategies
+             for w_name, _ in withdrawal_strategies]
+    tasks = [(base_profile, c_strat, w_strat, run_kwargs)
+             for _, c_strat in contribution_strategies
+             for _, w_strat in withdrawal_strategies]
+
+    if workers == 1:
+        previous, _SCENARIOS = _SCENARIOS, scenarios
+        try:
+            outcomes = [_evaluate_on_scenarios(task) for task in tasks]
+        finally:
+            _SCENARIOS = previous
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=scenarios.nbytes)
+        try:
+            np.ndarray(scenarios.shape, dtype=scenarios.dtype, buffer=shm.buf)[:] = scenarios
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_scenarios,
+                initargs=(shm.name, scenarios.shape, scenarios.dtype.str),
+            ) as pool:
+                outcomes = list(pool.map(_evaluate_on_scenarios, tasks))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    order = sorted(range(len(outcomes)), key=lambda i: float(outcomes[i].total_tax_paid.mean()))
+    best = outcomes[order[0]]
+    results = []
+    for i in order:
+        outcome = outcomes[i]
+        results.append({
+            "contrib_strategy": names[i][0],
+            "withdraw_strategy": names[i][1],
+            **summarize_paths(outcome, confidence),
+            "paired_vs_best": {
+                "total_tax_paid": paired_difference(
+                    outcome.total_tax_paid, best.total_tax_paid, confidence),
+                "final_wealth": paired_difference(
+                    outcome.final_wealth, best.final_wealth, confidence),
+                "success": paired_difference(
+                    outcome.success, best.success, confidence),
+            },
+        })
+    return results
+
+
+# Per-path score for each race objective (lower is better)
+RACE_OBJECTIVES: Dict[str, Callable[[BatchResult], np.ndarray]] = {
+    "total_tax_paid": lambda r: r.total_tax_paid,
+    "final_wealth": lambda r: -r.final_wealth,
+    "peak_wealth": lambda r: -r.peak_wealth,
+    "success": lambda r: -r.success.astype(float),
+}
+
+
+def race_strategies(
+    base_profile: PersonProfile,
+    contribution_strategies: Sequence[tuple[str, StrategyFunc]],
+    withdrawal_strategies: Sequence[tuple[str, StrategyFunc]],
+    years_working: int = 35,
+    annual_savings: float = 28_000,
+    annual_spending: float = 80_000,
+    return_model: ReturnModel | None = None,
+    initial_paths: int = 200,
+    max_paths: int = 12_800,
+    keep_fraction: float = 0.5,
+    objective: str = "total_tax_paid",
+    seed: int | None = None,
+    inflation_rate: float = 0.02,
+    tax_calculator: TaxCalculator | None = None,
+    confidence: float = 0.95,
+) -> List[Dict[str, Any]]:
+    """Rank strategy pairs by successive halving on common random numbers.
+
+    Round 0 evaluates every pair on ``initial_paths`` paths.  After each
+    round the best ``keep_fraction`` (by mean per-path ``objective``, at
+    least one) survive and the path count doubles, capped at ``max_paths``.
+    Survivors are only simulated on the paths they have not seen yet.
+    A ``return_model`` with ``sample_scenarios`` (``MultiAssetModel``) also
+    draws each path's inflation, used in place of ``inflation_rate``.
+
+    Returns
+    -------
+    list of dict
+        Winner first, then the other candidates from last to first
+        eliminated.  Each entry has the strategy names, the
+        ``summarize_paths`` estimates over the paths it was evaluated on and
+        ``eliminated_in_round`` (``None`` for the winner).  The winner also
+        carries ``confidence``: the paired objective difference to the
+        runner-up on their shared paths, its standard error and
+        ``probability_best`` (normal approximation).
+    """
+    if objective not in RACE_OBJECTIVES:
+        raise SimulationConfigError(
+            f"unknown objective {objective!r}; expected one of {sorted(RACE_OBJECTIVES)}"
+        )
+    if not 0 < keep_fraction < 1:
+        raise SimulationConfigError(f"keep_fraction must be in (0, 1): {keep_fraction}")
+    if initial_paths <= 0 or max_paths < initial_paths:
+        raise SimulationConfigError("need 0 < initial_paths <= max_paths")
+    score = RACE_OBJECTIVES[objective]
+
+    model = return_model or ReturnModel()
+    rng = np.random.default_rng(seed)
+    years_retired = max(0, base_profile.end_age - base_profile.current_age - years_working)
+    run_kwargs = dict(
+        years_working=years_working,
+        annual_savings=annual_savings,
+        annual_spending=annual_spending,
+        inflation_rate=inflation_rate,
+        tax_calculator=tax_calculator,
+    )
+    candidates = [(c_name, w_name, c_strat, w_strat)
+                  for c_name, c_strat in contribution_strategies
+                  for w_name, w_strat in withdrawal_strategies]
+
+    # (paths, years) or, per account, (paths, years, 3) like the model's samples
+    pool = np.empty((0,) + model.mean_returns(years_working, years_retired).shape)
+    # Per-path retirement inflation when the model draws it
+    stochastic_inflation = hasattr(model, "sample_scenarios")
+    pool_inflation = np.empty((0, years_retired))
+    chunks: List[List[BatchResult]] = [[] for _ in candidates]
+    seen = [0] * len(candidates)
+    eliminated: Dict[int, int] = {}
+    alive = list(range(len(candidates)))
+    n_target = initial_paths
+    round_no = 0
+
+    def mean_score(i: int) -> float:
+        return float(np.mean(np.concatenate([score(r) for r in chunks[i]])))
+
+    while True:
+        if pool.shape[0] < n_target:
+            if stochastic_inflation:
+                returns, inflation = model.sample_scenarios(
+                    n_target - pool.shape[0], years_working, years_retired, rng)
+                pool_inflation = np.concatenate((pool_inflation, inflation))
+            else:
+                returns = model.sample(n_target - pool.shape[0], years_working, years_retired, rng)
+            pool = np.concatenate((pool, returns))
+        for i in alive:
+            _, _, c_strat, w_strat = candidates[i]
+            paths = slice(seen[i], n_target)
+            kwargs = run_kwargs
+            if stochastic_inflation:
+                kwargs = {**run_kwargs, "inflation_rate": pool_inflation[paths]}
+            chunks[i].append(simulate_batch(base_profile, c_strat, w_strat,
+                                            pool[paths], **kwargs))
+            seen[i] = n_target
+
+        alive.sort(key=mean_score)
+        if len(alive) == 1 or n_target >= max_paths:
+            break
+        keep = max(1, math.ceil(len(alive) * keep_fraction))
+        for i in alive[keep:]:
+            eliminated[i] = round_no
+        alive = alive[:keep]
+        if len(alive) == 1:
+            break
+        n_target = min(2 * n_target, max_paths)
+        round_no += 1
+
+    losers = sorted(eliminated, key=lambda i: (-eliminated[i], mean_score(i)))
+    ranking = alive + losers
+    results = []
+    for i in ranking:
+        c_name, w_name, _, _ = candidates[i]
+        results.append({
+            "contrib_strategy": c_name,
+            "withdraw_strategy": w_name,
+            **summarize_paths(_concat(chunks[i]), confidence),
+            "eliminated_in_round": eliminated.get(i),
+        })
+
+    if len(ranking) > 1:
+        winner, runner_up = ranking[0], ranking[1]
+        shared = min(seen[winner], seen[runner_up])
+        diff = paired_difference(
+            np.concatenate([score(r) for r in chunks[runner_up]])[:shared],
+            np.concatenate([score(r) for r in chunks[winner]])[:shared],
+            confidence,
+        )
+        if diff["stderr"] > 0:
+            probability = NormalDist().cdf(diff["difference"] / diff["stderr"])
+        else:
+            probability = 1.0 if diff["difference"] > 0 else 0.5
+        results[0]["confidence"] = {
+            "objective": objective,
+            "runner_up": (results[1]["contrib_strategy"], results[1]["withdraw_strategy"]),
+            "shared_paths": shared,
+            **diff,
+            "probability_best": probability,
+        }
+    return results
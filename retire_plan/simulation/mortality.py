@@ -0,0 +1,101 @@
+"""
+simulation.mortality – Mortality tables and random lifespans.
+
+A ``MortalityTable`` holds one-year death probabilities ``q(x)`` by age.  It
+can be read from a local CSV file (columns ``age`` and ``qx``) or built from
+Gompertz's law.  The default Gompertz parameters give a life expectancy of
+about 83 at birth and 21 more years at 65, close to recent Canadian unisex
+figures, but they are an approximation, not an official table.
+
+``sample_death_ages`` draws one death age per path for
+``simulate_batch(..., death_ages=...)``.  A death age ``x`` means dying
+between ages ``x`` and ``x + 1``; the year starting at ``x`` is the last one
+simulated.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import SimulationConfigError
+
+
+@dataclass
+class MortalityTable:
+    """One-year death probabilities by age.
+
+    Attributes
+    ----------
+    start_age : int
+        Age of the first entry of ``qx``.
+    qx : np.ndarray
+        ``qx[i]`` is the probability that someone alive at ``start_age + i``
+        dies before ``start_age + i + 1``.  Nobody survives past the end of
+        the table.
+    """
+
+    start_age: int
+    qx: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.qx = np.asarray(self.qx, dtype=float)
+        if self.qx.ndim != 1 or not self.qx.size:
+            raise SimulationConfigError("qx must be a non-empty 1-D array")
+        if ((self.qx < 0) | (self.qx > 1)).any():
+            raise SimulationConfigError("qx values must be probabilities in [0, 1]")
+
+    @property
+    def max_age(self) -> int:
+        """Age by which everyone has died."""
+        return self.start_age + self.qx.size
+
+    @classmethod
+    def gompertz(
+        cls,
+        modal_age: float = 89.0,
+        dispersion: float = 10.0,
+        start_age: int = 0,
+        max_age: int = 110,
+    ) -> "MortalityTable":
+        """Table from Gompertz's law, force of mortality ``exp((x - m) / b) / b``."""
+        ages = np.arange(start_age, max_age)
+        hazard = np.exp((ages - modal_age) / dispersion) * math.expm1(1.0 / dispersion)
+        return cls(start_age, -np.expm1(-hazard))
+
+    @classmethod
+    def from_csv(cls, path: str | os.PathLike) -> "MortalityTable":
+        """Read a table with ``age`` and ``qx`` columns (consecutive ages)."""
+        with open(path, newline="", encoding="utf-8") as fh:
+            rows = sorted((int(r["age"]), float(r["qx"])) for r in csv.DictReader(fh))
+        if not rows:
+            raise SimulationConfigError(f"no rows in mortality table {path}")
+        ages = [age for age, _ in rows]
+        if ages != list(range(ages[0], ages[0] + len(ages))):
+            raise SimulationConfigError(f"mortality table {path} must list consecutive ages")
+        return cls(ages[0], np.array([q for _, q in rows]))
+
+    def survival(self, current_age: int) -> np.ndarray:
+        """Probability of being alive at ``current_age + k``, for ``k = 0 .. max_age - current_age``."""
+        if not self.start_age <= current_age < self.max_age:
+            raise SimulationConfigError(
+                f"current_age {current_age} is outside the table ({self.start_age}-{self.max_age - 1})"
+            )
+        q = self.qx[current_age - self.start_age:]
+        return np.concatenate(([1.0], np.cumprod(1.0 - q)))
+
+    def life_expectancy(self, current_age: int) -> float:
+        """Expected remaining whole years of life (curtate) at ``current_age``."""
+        return float(self.survival(current_age)[1:].sum())
+
+    def sample_death_ages(self, n_paths: int, current_age: int,
+                          rng: np.random.Generator) -> np.ndarray:
+        """Death ages for ``n_paths`` people alive at ``current_age``, shape ``(paths,)``."""
+        dead_by = 1.0 - self.survival(current_age)[1:]
+        dead_by[-1] = 1.0
+        years_lived = np.searchsorted(dead_by, rng.random(n_paths), side="right")
+        return current_age + years_lived
@@ -0,0 +1,364 @@
+"""
+simulation.partial – Mergeable partial results for sharded simulation runs.
+
+A shard worker turns its simulated paths into a ``PartialResult`` and writes
+it to a plain JSON file.  Partial results merge associatively (counts, sums,
+sums of squares, histograms and quantile sketches all add up), so a study can
+be split across processes or machines and reduced at the end:
+
+>>> shard = PartialResult.from_batch("TFSA-First", batch_result)  # doctest: +SKIP
+>>> shard.save("shards/part-007.json")                           # doctest: +SKIP
+>>> merged = load_partials(glob.glob("shards/*.json"))           # doctest: +SKIP
+>>> compare_strategies([p.to_summary() for p in merged.values()])  # doctest: +SKIP
+
+``to_summary`` gives the same dict ``summarize_results`` returns; for a single
+path it matches ``summarize_results`` on that path's history exactly (up to
+floating-point rounding), for many paths the fields are averages.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from .batch import RUIN_THRESHOLD, BatchResult
+
+# Per-path outcomes tracked with sums, sums of squares and a quantile sketch
+METRICS = ("final_wealth", "total_tax_paid", "peak_wealth")
+
+# summarize_results treats a balance at or below this as depleted
+DEPLETION_THRESHOLD = 1e-6
+
+
+@dataclass
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets ``(gamma**(i-1), gamma**i]``
+    (mirrored for negatives), so any quantile is returned within
+    ``relative_accuracy`` of the true value and two sketches merge by adding
+    bucket counts.
+    """
+
+    relative_accuracy: float = 0.01
+    positive: Dict[int, int] = field(default_factory=dict)
+    negative: Dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+
+    @property
+    def gamma(self) -> float:
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.positive.values()) + sum(self.negative.values())
+
+    def _bucket(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / math.log(self.gamma)).astype(int)
+
+    def add(self, values: Iterable[float]) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        zero = np.abs(values) <= DEPLETION_THRESHOLD
+        self.zero_count += int(zero.sum())
+        for store, mask in ((self.positive, values > DEPLETION_THRESHOLD),
+                            (self.negative, values < -DEPLETION_THRESHOLD)):
+            buckets, counts = np.unique(self._bucket(np.abs(values[mask])), return_counts=True)
+            for b, c in zip(buckets.tolist(), counts.tolist()):
+                store[b] = store.get(b, 0) + c
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative_accuracy")
+        merged = QuantileSketch(self.relative_accuracy, dict(self.positive),
+                                dict(self.negative), self.zero_count + other.zero_count)
+        for mine, theirs in ((merged.positive, other.positive), (merged.negative, other.negative)):
+            for b, c in theirs.items():
+                mine[b] = mine.get(b, 0) + c
+        return merged
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q``-quantile (``0 <= q <= 1``)."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be in [0, 1]: {q}")
+        total = self.count
+        if total == 0:
+            raise ValueError("quantile of an empty sketch")
+        rank = q * (total - 1)
+
+        def value(b: int) -> float:
+            return 2 * self.gamma ** b / (self.gamma + 1)
+
+        seen = 0
+        for b in sorted(self.negative, reverse=True):
+            seen += self.negative[b]
+            if seen > rank:
+                return -value(b)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for b in sorted(self.positive):
+            seen += self.positive[b]
+            if seen > rank:
+                return value(b)
+        return value(max(self.positive))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(b): c for b, c in self.positive.items()},
+            "negative": {str(b): c for b, c in self.negative.items()},
+            "zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        return cls(
+            relative_accuracy=float(data["relative_accuracy"]),
+            positive={int(b): int(c) for b, c in data["positive"].items()},
+            negative={int(b): int(c) for b, c in data["negative"].items()},
+            zero_count=int(data["zero_count"]),
+        )
+
+
+def _add_counts(a: Dict[int, int], b: Dict[int, int]) -> Dict[int, int]:
+    out = dict(a)
+    for k, v in b.items():
+        out[k] = out.get(k, 0) + v
+    return out
+
+
+def _median_age(histogram: Dict[int, int], never: int) -> int | None:
+    """Median age of a histogram where ``never`` paths did not reach the event."""
+    total = sum(histogram.values()) + never
+    seen = 0
+    for age in sorted(histogram):
+        seen += histogram[age]
+        if 2 * seen > total:
+            return age
+    return None
+
+
+@dataclass
+class PartialResult:
+    """Associatively mergeable summary of a set of simulated paths.
+
+    Attributes
+    ----------
+    name : str
+        Strategy label; only partial results with the same name merge.
+    n_paths : int
+        Number of paths summarized.
+    sums, sums_sq : dict
+        Sum and sum of squares of each per-path metric in ``METRICS``.
+    sketches : dict
+        A ``QuantileSketch`` per metric.
+    ruin_ages : dict
+        Histogram of the age at which wealth first fell below
+        ``RUIN_THRESHOLD`` (``run_full_lifecycle``'s rule); paths that never
+        did count as successes.
+    depletion_ages : dict
+        Histogram of the age at which the balance first hit zero
+        (``summarize_results``' rule).
+    cash_count, cash_sum, cash_sum_sq : int, float, float
+        Pooled moments of the yearly ``net_cash_flow`` over all path-years.
+    """
+
+    name: str
+    n_paths: int = 0
+    sums: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(METRICS, 0.0))
+    sums_sq: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(METRICS, 0.0))
+    sketches: Dict[str, QuantileSketch] = field(
+        default_factory=lambda: {m: QuantileSketch() for m in METRICS}
+    )
+    ruin_ages: Dict[int, int] = field(default_factory=dict)
+    depletion_ages: Dict[int, int] = field(default_factory=dict)
+    cash_count: int = 0
+    cash_sum: float = 0.0
+    cash_sum_sq: float = 0.0
+
+    # ---- construction --------------------------------------------------
+    @classmethod
+    def from_arrays(
+        cls,
+        name: str,
+        ages: np.ndarray,
+        total_wealth: np.ndarray,
+        tax_paid: np.ndarray,
+        net_cash_flow: np.ndarray,
+        relative_accuracy: float = 0.01,
+    ) -> "PartialResult":
+        """Build from year-by-year arrays of shape ``(paths, years)``."""
+        ages = np.broadcast_to(np.asarray(ages), np.shape(total_wealth))
+        wealth = np.atleast_2d(np.asarray(total_wealth, dtype=float))
+        tax = np.atleast_2d(np.asarray(tax_paid, dtype=float))
+        cash = np.atleast_2d(np.asarray(net_cash_flow, dtype=float))
+        ages = np.atleast_2d(ages)
+
+        metrics = {
+            "final_wealth": wealth[:, -1],
+            "total_tax_paid": tax.sum(axis=1),
+            "peak_wealth": wealth.max(axis=1),
+        }
+        part = cls(name=name, n_paths=wealth.shape[0])
+        for m, values in metrics.items():
+            part.sums[m] = float(values.sum())
+            part.sums_sq[m] = float((values ** 2).sum())
+            part.sketches[m] = QuantileSketch(relative_accuracy)
+            part.sketches[m].add(values)
+
+        for hist, hit in ((part.ruin_ages, wealth < RUIN_THRESHOLD),
+                          (part.depletion_ages, wealth <= DEPLETION_THRESHOLD)):
+            rows = hit.any(axis=1)
+            first = ages[rows, hit[rows].argmax(axis=1)]
+            for age, c in zip(*np.unique(first, return_counts=True)):
+                hist[int(age)] = int(c)
+
+        part.cash_count = int(cash.size)
+        part.cash_sum = float(cash.sum())
+        part.cash_sum_sq = float((cash ** 2).sum())
+        return part
+
+    @classmethod
+    def from_history(cls, name: str, history: List[Dict[str, Any]], **kwargs: Any) -> "PartialResult":
+        """Build from one ``Simulator`` history list."""
+        if not history:
+            raise ValueError("history must be a non-empty list")
+        return cls.from_arrays(
+            name,
+            ages=np.array([int(r["age"]) for r in history]),
+            total_wealth=np.array([sum(float(v) for v in r.get("end_balances", {}).values())
+                                   for r in history]),
+            tax_paid=np.array([float(r.get("tax_paid", 0.0)) for r in history]),
+            net_cash_flow=np.array([float(r.get("net_cash_flow", 0.0)) for r in history]),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_batch(cls, name: str, result: BatchResult, **kwargs: Any) -> "PartialResult":
+        """Build from a ``simulate_batch(..., record=True)`` result."""
+        traj = result.trajectories
+        if not traj:
+            raise ValueError("from_batch needs a result produced with record=True")
+        if result.death_age is not None:
+            raise ValueError("from_batch needs fixed-horizon paths (no death_ages)")
+        return cls.from_arrays(
+            name,
+            ages=traj["age"],
+            total_wealth=traj["end_balances"].sum(axis=2),
+            tax_paid=traj["tax_paid"],
+            net_cash_flow=traj["net_cash_flow"],
+            **kwargs,
+        )
+
+    # ---- merging -------------------------------------------------------
+    def merge(self, other: "PartialResult") -> "PartialResult":
+        """Combine two partial results (associative and commutative)."""
+        if other.name != self.name:
+            raise ValueError(f"cannot merge results for {self.name!r} and {other.name!r}")
+        return PartialResult(
+            name=self.name,
+            n_paths=self.n_paths + other.n_paths,
+            sums={m: self.sums[m] + other.sums[m] for m in METRICS},
+            sums_sq={m: self.sums_sq[m] + other.sums_sq[m] for m in METRICS},
+            sketches={m: self.sketches[m].merge(other.sketches[m]) for m in METRICS},
+            ruin_ages=_add_counts(self.ruin_ages, other.ruin_ages),
+            depletion_ages=_add_counts(self.depletion_ages, other.depletion_ages),
+            cash_count=self.cash_count + other.cash_count,
+            cash_sum=self.cash_sum + other.cash_sum,
+            cash_sum_sq=self.cash_sum_sq + other.cash_sum_sq,
+        )
+
+    # ---- statistics ----------------------------------------------------
+    def mean(self, metric: str) -> float:
+        return self.sums[metric] / self.n_paths
+
+    def std(self, metric: str) -> float:
+        """Population standard deviation of a per-path metric."""
+        mean = self.mean(metric)
+        return math.sqrt(max(self.sums_sq[metric] / self.n_paths - mean ** 2, 0.0))
+
+    def quantile(self, metric: str, q: float) -> float:
+        return self.sketches[metric].quantile(q)
+
+    @property
+    def successes(self) -> int:
+        return self.n_paths - sum(self.ruin_ages.values())
+
+    def success_probability(self) -> float:
+        return self.successes / self.n_paths
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Same keys as ``summarize_results``, averaged over the paths."""
+        if self.n_paths == 0:
+            raise ValueError("cannot summarize an empty partial result")
+        avg_cash = self.cash_sum / self.cash_count
+        var_cash = max(self.cash_sum_sq / self.cash_count - avg_cash ** 2, 0.0)
+        never_depleted = self.n_paths - sum(self.depletion_ages.values())
+        return {
+            "name": self.name,
+            "lifetime_tax": self.mean("total_tax_paid"),
+            "final_wealth": self.mean("final_wealth"),
+            "ruin_age": _median_age(self.depletion_ages, never_depleted),
+            "avg_net_cash": avg_cash,
+            "stdev_net_cash": math.sqrt(var_cash) if self.cash_count > 1 else 0.0,
+        }
+
+    # ---- serialization -------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "n_paths": self.n_paths,
+            "sums": self.sums,
+            "sums_sq": self.sums_sq,
+            "sketches": {m: s.to_dict() for m, s in self.sketches.items()},
+            "ruin_ages": {str(a): c for a, c in self.ruin_ages.items()},
+            "depletion_ages": {str(a): c for a, c in self.depletion_ages.items()},
+            "cash_count": self.cash_count,
+            "cash_sum": self.cash_sum,
+            "cash_sum_sq": self.cash_sum_sq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PartialResult":
+        return cls(
+            name=data["name"],
+            n_paths=int(data["n_paths"]),
+            sums={m: float(v) for m, v in data["sums"].items()},
+            sums_sq={m: float(v) for m, v in data["sums_sq"].items()},
+            sketches={m: QuantileSketch.from_dict(s) for m, s in data["sketches"].items()},
+            ruin_ages={int(a): int(c) for a, c in data["ruin_ages"].items()},
+            depletion_ages={int(a): int(c) for a, c in data["depletion_ages"].items()},
+            cash_count=int(data["cash_count"]),
+            cash_sum=float(data["cash_sum"]),
+            cash_sum_sq=float(data["cash_sum_sq"]),
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write to ``path`` atomically (temp file + rename)."""
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "PartialResult":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def merge_partials(parts: Iterable[PartialResult]) -> Dict[str, PartialResult]:
+    """Reduce partial results, one merged result per strategy name."""
+    merged: Dict[str, PartialResult] = {}
+    for part in parts:
+        merged[part.name] = merged[part.name].merge(part) if part.name in merged else part
+    return merged
+
+
+def load_partials(paths: Iterable[str | os.PathLike]) -> Dict[str, PartialResult]:
+    """Load shard files and reduce them (see ``merge_partials``)."""
+    return merge_partials(PartialResult.load(p) for p in paths)
@@ -0,0 +1,259 @@
+"""
+simulation.results – Compact binary storage for lifecycle results.
+
+``save_results`` writes the outcome of ``run_full_lifecycle`` (or the list
+returned by ``optimize``) to one file: a JSON header with the scalar
+outcome of every run and the column layout, followed by one contiguous
+binary array per history field (``end_balances`` is split into one column
+per account).  ``load_results`` reads only the header; each column is
+memory-mapped on first use.
+
+The loaded runs look like the originals – dicts with the same outcome keys –
+except that ``history`` is a ``HistoryColumns`` view.  Iterating it yields
+the same per-year dicts as before, while ``column(name)`` returns one field
+as an array without touching the others.  ``summarize_results``,
+``income_profile_by_age`` and ``wealth_path`` use the columns directly.
+
+>>> save_results("plan.rpr", Simulator.optimize(profile, contribs, withdrawals))  # doctest: +SKIP
+>>> best = load_results("plan.rpr")[0]                                           # doctest: +SKIP
+>>> ages, wealth = wealth_path(best["history"])                                  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+import numpy as np
+
+from .engine import SimulationConfigError
+
+MAGIC = b"RPLANRES"
+FORMAT_VERSION = 1
+_ALIGN = 64
+_HEADER_LEN = struct.Struct("<Q")
+# Separator between a dict-valued field and its keys in column names
+_SEP = "."
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _layout(records: Sequence[Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Column name -> kind (``float``, ``int`` or ``category``), in first-seen order."""
+    columns: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        for key, value in record.items():
+            items = ([(f"{key}{_SEP}{sub}", v) for sub, v in value.items()]
+                     if isinstance(value, Mapping) else [(key, value)])
+            for name, v in items:
+                if isinstance(v, str):
+                    kind = "category"
+                elif isinstance(v, (int, np.integer)) and not isinstance(v, bool):
+                    kind = "int"
+                else:
+                    kind = "float"
+                spec = columns.setdefault(name, {"kind": kind, "field": key})
+                if spec["kind"] != kind:
+                    if "category" in (spec["kind"], kind):
+                        raise SimulationConfigError(f"history field {name!r} mixes text and numbers")
+                    spec["kind"] = "float"
+    for name, spec in columns.items():
+        present = sum(1 for r in records if _lookup(r, name, spec) is not None)
+        if spec["kind"] == "int" and present < len(records):
+            spec["kind"] = "float"
+    return columns
+
+
+def _lookup(record: Mapping[str, Any], name: str, spec: Mapping[str, Any]) -> Any:
+    value = record.get(spec["field"])
+    if name != spec["field"]:
+        return None if value is None else value.get(name[len(spec["field"]) + 1:])
+    return value
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def save_results(path: str | os.PathLike, results: Mapping[str, Any] | Sequence[Mapping[str, Any]]) -> None:
+    """Write one outcome dict, or a list of them, to ``path``.
+
+    Every key except ``history`` must be JSON-serializable (numpy scalars
+    and arrays are converted).  Runs without a ``history`` (e.g. those
+    ``optimize(top_k=...)`` dropped) are stored without one.  The file is
+    written to a temporary name and renamed, so readers never see a partial
+    file.
+    """
+    runs = [results] if isinstance(results, Mapping) else list(results)
+    records: List[Mapping[str, Any]] = []
+    run_meta = []
+    for run in runs:
+        history = run.get("history")
+        start = len(records)
+        if history is not None:
+            records.extend(history)
+        run_meta.append({
+            "outcome": {k: v for k, v in run.items() if k != "history"},
+            "rows": None if history is None else [start, len(records)],
+        })
+
+    layout = _layout(records)
+    arrays: Dict[str, np.ndarray] = {}
+    for name, spec in layout.items():
+        values = [_lookup(r, name, spec) for r in records]
+        if spec["kind"] == "category":
+            categories = sorted({v for v in values if v is not None})
+            index = {c: i for i, c in enumerate(categories)}
+            spec["categories"] = categories
+            arrays[name] = np.array([-1 if v is None else index[v] for v in values], dtype=np.int32)
+        elif spec["kind"] == "int":
+            arrays[name] = np.array(values, dtype=np.int64)
+        else:
+            arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    def header_bytes(data_start: int) -> bytes:
+        offset = data_start
+        for name, spec in layout.items():
+            spec["dtype"] = arrays[name].dtype.str
+            spec["offset"] = offset
+            offset += arrays[name].nbytes + _pad(arrays[name].nbytes)
+        header = {"version": FORMAT_VERSION, "n_rows": len(records),
+                  "runs": run_meta, "columns": layout}
+        return json.dumps(header, default=_to_json).encode("utf-8")
+
+    # The header stores absolute offsets, so size it until it stops moving
+    prefix = len(MAGIC) + _HEADER_LEN.size
+    data_start = 0
+    while True:
+        header = header_bytes(data_start)
+        needed = prefix + len(header) + _pad(prefix + len(header))
+        if needed == data_start:
+            break
+        data_start = needed
+
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER_LEN.pack(len(header)))
+        fh.write(header)
+        fh.write(b"\0" * _pad(prefix + len(header)))
+        for name in layout:
+            raw = arrays[name].tobytes()
+            fh.write(raw)
+            fh.write(b"\0" * _pad(len(raw)))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class ResultFile(Sequence[Dict[str, Any]]):
+    """Runs of a file written by ``save_results``; columns load on demand."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise SimulationConfigError(f"{self.path} is not a retire_plan result file")
+            (length,) = _HEADER_LEN.unpack(fh.read(_HEADER_LEN.size))
+            header = json.loads(fh.read(length))
+        if header["version"] != FORMAT_VERSION:
+            raise SimulationConfigError(f"unsupported result file version in {self.path}")
+        self.n_rows: int = header["n_rows"]
+        self.layout: Dict[str, Dict[str, Any]] = header["columns"]
+        self._runs = header["runs"]
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column over all runs (memory-mapped, read-only)."""
+        if name not in self._columns:
+            if name not in self.layout:
+                raise KeyError(name)
+            spec = self.layout[name]
+            self._columns[name] = np.memmap(self.path, dtype=np.dtype(spec["dtype"]), mode="r",
+                                            offset=spec["offset"], shape=(self.n_rows,))
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        meta = self._runs[index]
+        run = dict(meta["outcome"])
+        if meta["rows"] is not None:
+            run["history"] = HistoryColumns(self, *meta["rows"])
+        return run
+
+
+class HistoryColumns(Sequence[Dict[str, Any]]):
+    """One run's history, read column by column from a ``ResultFile``."""
+
+    def __init__(self, source: ResultFile, start: int, stop: int):
+        self._source = source
+        self._start = start
+        self._stop = stop
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._source.layout)
+
+    def column(self, name: str) -> np.ndarray:
+        """One field for every year (``NaN`` / ``None`` where a year lacks it).
+
+        Category columns (e.g. ``phase``) come back as an object array of
+        strings; dict fields are addressed as ``"end_balances.taxable"``.
+        """
+        raw = self._source.column(name)[self._start:self._stop]
+        spec = self._source.layout[name]
+        if spec["kind"] == "category":
+            labels = np.array(spec["categories"] + [None], dtype=object)
+            return labels[raw]
+        return raw
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        row = self._start + index
+        record: Dict[str, Any] = {}
+        for name, spec in self._source.layout.items():
+            value = self._source.column(name)[row]
+            if spec["kind"] == "category":
+                if value < 0:
+                    continue
+                value = spec["categories"][value]
+            elif spec["kind"] == "int":
+                value = int(value)
+            elif np.isnan(value):
+                continue
+            else:
+                value = float(value)
+            if name == spec["field"]:
+                record[name] = value
+            else:
+                record.setdefault(spec["field"], {})[name[len(spec["field"]) + 1:]] = value
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+def load_results(path: str | os.PathLike) -> ResultFile:
+    """Open a result file; only the header is read until columns are used."""
+    return ResultFile(path)
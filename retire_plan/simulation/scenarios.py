@@ -0,0 +1,323 @@
+"""
+simulation.scenarios – Random return scenarios for the batch engine.
+
+Standard normal draws can come from plain pseudo-random numbers, antithetic
+pairs, or randomized low-discrepancy point sets (Halton, Sobol).  All
+samplers keep the N(0, 1) marginals, so the return models built on top of
+them have the same expected path whichever sampler is used.
+
+``ReturnModel`` draws one return per year for all accounts.
+``MultiAssetModel`` draws correlated asset-class returns and inflation and
+mixes them per account according to each account's allocation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .engine import SimulationConfigError
+
+SAMPLERS = ("mc", "halton", "sobol")
+
+# Coefficients of Acklam's rational approximation to the normal quantile
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    """Vectorized inverse standard normal CDF (Acklam, rel. error < 1.2e-9)."""
+    u = np.clip(np.asarray(u, dtype=float), 1e-12, 1 - 1e-12)
+    out = np.empty_like(u)
+    low = u < 0.02425
+    high = u > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    num = ((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]
+    den = ((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1
+    out[mid] = q * num / den
+
+    for mask, sign, p in ((low, 1.0, u[low]), (high, -1.0, 1 - u[high])):
+        q = np.sqrt(-2 * np.log(p))
+        num = ((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]
+        den = (((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1
+        out[mask] = sign * num / den
+    return out
+
+
+def _first_primes(n: int) -> list[int]:
+    primes: list[int] = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def halton(n_points: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """Randomized Halton points in [0, 1), shape ``(n_points, dims)``.
+
+    Each call uses a random starting index and a random (Cranley-Patterson)
+    shift, so independent calls give independent unbiased replicates.
+    """
+    start = int(rng.integers(0, 2**20))
+    index = np.arange(start + 1, start + n_points + 1)
+    points = np.empty((n_points, dims))
+    for d, base in enumerate(_first_primes(dims)):
+        remaining = index.copy()
+        value = np.zeros(n_points)
+        scale = 1.0 / base
+        while remaining.any():
+            value += scale * (remaining % base)
+            remaining //= base
+            scale /= base
+        points[:, d] = value
+    return (points + rng.random(dims)) % 1.0
+
+
+def sobol(n_points: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """Scrambled Sobol points in [0, 1) (needs the optional scipy package)."""
+    try:
+        from scipy.stats import qmc
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError("Sobol sampling requires scipy (pip install scipy)") from exc
+    return qmc.Sobol(d=dims, scramble=True, seed=rng).random(n_points)
+
+
+def standard_normals(
+    n_paths: int,
+    dims: int,
+    rng: np.random.Generator,
+    sampler: str = "mc",
+    antithetic: bool = False,
+) -> np.ndarray:
+    """Draw N(0, 1) variates of shape ``(n_paths, dims)``.
+
+    With ``antithetic=True`` the second half of the rows mirrors the first
+    (row ``i + n_paths // 2`` is ``-row i``), so ``n_paths`` must be even.
+    """
+    if sampler not in SAMPLERS:
+        raise SimulationConfigError(f"unknown sampler {sampler!r}; expected one of {SAMPLERS}")
+    if antithetic and n_paths % 2:
+        raise SimulationConfigError(f"antithetic sampling needs an even path count: {n_paths}")
+
+    n_draw = n_paths // 2 if antithetic else n_paths
+    if sampler == "mc":
+        z = rng.standard_normal((n_draw, dims))
+    elif sampler == "halton":
+        z = norm_ppf(halton(n_draw, dims, rng))
+    else:
+        z = norm_ppf(sobol(n_draw, dims, rng))
+    return np.concatenate((z, -z)) if antithetic else z
+
+
+@dataclass
+class ReturnModel:
+    """Independent normal annual returns around the Simulator's default rates.
+
+    Attributes
+    ----------
+    accumulation_return : float or array_like
+        Mean annual return while working (``run_accumulation`` default), or
+        one mean per working year (e.g. a glide path).
+    decumulation_return : float or array_like
+        Mean annual return in retirement (``run_decumulation`` default), or
+        one mean per retirement year.
+    volatility : float
+        Standard deviation of each year's return.
+    """
+
+    accumulation_return: float | np.ndarray = 0.07
+    decumulation_return: float | np.ndarray = 0.05
+    volatility: float = 0.12
+
+    def mean_returns(self, years_working: int, years_retired: int) -> np.ndarray:
+        """Deterministic return path, shape ``(years,)``."""
+        try:
+            return np.concatenate((
+                np.broadcast_to(np.asarray(self.accumulation_return, dtype=float), (years_working,)),
+                np.broadcast_to(np.asarray(self.decumulation_return, dtype=float), (years_retired,)),
+            ))
+        except ValueError:
+            raise SimulationConfigError(
+                f"return schedules must have {years_working} working and "
+                f"{years_retired} retirement years"
+            ) from None
+
+    def sample(
+        self,
+        n_paths: int,
+        years_working: int,
+        years_retired: int,
+        rng: np.random.Generator,
+        sampler: str = "mc",
+        antithetic: bool = False,
+    ) -> np.ndarray:
+        """Draw ``n_paths`` return paths, shape ``(paths, years)``.
+
+        ``sampler`` and ``antithetic`` are passed to ``standard_normals``.
+        """
+        mean = self.mean_returns(years_working, years_retired)
+        z = standard_normals(n_paths, mean.shape[0], rng, sampler, antithetic)
+        return mean + self.volatility * z
+
+
+@dataclass
+class MultiAssetModel:
+    """Correlated asset-class returns and inflation, mixed per account.
+
+    Each year's asset returns and inflation are jointly normal with the
+    covariance built from ``volatilities``, ``inflation_volatility`` and
+    ``correlation`` (drawn through its Cholesky factor); years are
+    independent.  Account returns are the allocation-weighted asset returns.
+
+    Attributes
+    ----------
+    expected_returns, volatilities : sequence of float
+        Mean and standard deviation of each asset class's annual return.
+    correlation : sequence of sequences
+        ``(assets + 1, assets + 1)`` correlation matrix; the last row and
+        column belong to inflation.
+    allocations : sequence of sequences
+        ``(3, assets)`` weights of the tax-deferred, tax-free and taxable
+        accounts; each row sums to 1.
+    inflation_mean, inflation_volatility : float
+        Mean and standard deviation of annual inflation.
+    rebalance : bool
+        Reset every account to its allocation each year.  Without
+        rebalancing the weights drift with returns (contributions and
+        withdrawals are assumed to follow the account's current weights).
+    """
+
+    expected_returns: Sequence[float] = (0.07, 0.035)
+    volatilities: Sequence[float] = (0.16, 0.06)
+    correlation: Sequence[Sequence[float]] = (
+        (1.0, 0.1, -0.1),
+        (0.1, 1.0, -0.3),
+        (-0.1, -0.3, 1.0),
+    )
+    allocations: Sequence[Sequence[float]] = ((0.6, 0.4), (0.6, 0.4), (0.6, 0.4))
+    inflation_mean: float = 0.02
+    inflation_volatility: float = 0.01
+    rebalance: bool = True
+    _cholesky: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        mu = np.asarray(self.expected_returns, dtype=float)
+        vol = np.asarray(self.volatilities, dtype=float)
+        corr = np.asarray(self.correlation, dtype=float)
+        weights = np.asarray(self.allocations, dtype=float)
+        n_assets = mu.shape[0]
+        if mu.ndim != 1 or vol.shape != mu.shape:
+            raise SimulationConfigError("expected_returns and volatilities must be 1-D and the same length")
+        if corr.shape != (n_assets + 1, n_assets + 1) or not np.allclose(corr, corr.T):
+            raise SimulationConfigError(
+                f"correlation must be a symmetric {n_assets + 1}x{n_assets + 1} matrix "
+                "(assets, then inflation)"
+            )
+        if weights.shape != (3, n_assets) or not np.allclose(weights.sum(axis=1), 1.0):
+            raise SimulationConfigError(
+                f"allocations must be a (3, {n_assets}) array whose rows sum to 1"
+            )
+        try:
+            self._cholesky = np.linalg.cholesky(self.covariance())
+        except np.linalg.LinAlgError:
+            raise SimulationConfigError("correlation matrix is not positive definite") from None
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.expected_returns)
+
+    def covariance(self) -> np.ndarray:
+        """Covariance of one year's ``(asset returns..., inflation)``."""
+        std = np.append(np.asarray(self.volatilities, dtype=float), self.inflation_volatility)
+        return np.asarray(self.correlation, dtype=float) * np.outer(std, std)
+
+    def mean_returns(self, years_working: int, years_retired: int) -> np.ndarray:
+        """Expected account returns under the target allocation, shape ``(years, 3)``."""
+        mean = np.asarray(self.allocations, dtype=float) @ np.asarray(self.expected_returns, dtype=float)
+        return np.tile(mean, (years_working + years_retired, 1))
+
+    def sample_scenarios(
+        self,
+        n_paths: int,
+        years_working: int,
+        years_retired: int,
+        rng: np.random.Generator,
+        sampler: str = "mc",
+        antithetic: bool = False,
+        out: np.ndarray | None = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw account returns and retirement inflation together.
+
+        Returns
+        -------
+        returns : np.ndarray
+            ``(paths, years, 3)`` account returns, written into ``out`` when
+            a preallocated array of that shape is given.
+        inflation : np.ndarray
+            ``(paths, years_retired)`` inflation for the retirement years,
+            ready for ``simulate_batch(..., inflation_rate=inflation)``.
+        """
+        n_years = years_working + years_retired
+        n_factors = self.n_assets + 1
+        shape = (n_paths, n_years, 3)
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape:
+            raise SimulationConfigError(f"out must have shape {shape}; got {out.shape}")
+
+        z = standard_normals(n_paths, n_years * n_factors, rng, sampler, antithetic)
+        draws = z.reshape(n_paths, n_years, n_factors) @ self._cholesky.T
+        assets = draws[..., :-1] + np.asarray(self.expected_returns, dtype=float)
+        inflation = draws[..., -1] + self.inflation_mean
+
+        weights = np.asarray(self.allocations, dtype=float)
+        if self.rebalance:
+            np.matmul(assets, weights.T, out=out)
+        else:
+            held = np.broadcast_to(weights, (n_paths, 3, self.n_assets)).copy()
+            for t in range(n_years):
+                growth = 1.0 + assets[:, t, None, :]
+                out[:, t] = np.einsum("pka,pka->pk", held, growth) - 1.0
+                held *= growth / (1.0 + out[:, t, :, None])
+        return out, inflation[:, years_working:]
+
+    def sample(
+        self,
+        n_paths: int,
+        years_working: int,
+        years_retired: int,
+        rng: np.random.Generator,
+        sampler: str = "mc",
+        antithetic: bool = False,
+    ) -> np.ndarray:
+        """Account returns only, shape ``(paths, years, 3)``."""
+        return self.sample_scenarios(n_paths, years_working, years_retired, rng,
+                                     sampler, antithetic)[0]
+
+
+def retime_returns(model, returns: np.ndarray, years_working: int, new_years_working: int) -> np.ndarray:
+    """Move sampled return paths to a different retirement year.
+
+    ``returns`` were drawn with ``years_working`` working years; the result
+    keeps every path's deviations from the model's mean but uses the mean
+    returns of ``new_years_working`` working years (same total horizon).
+    Years whose mean does not change are returned bit for bit, so plans
+    retiring at different ages share the same scenarios.
+    """
+    n_years = returns.shape[1]
+    mean = model.mean_returns(years_working, n_years - years_working)
+    new_mean = model.mean_returns(new_years_working, n_years - new_years_working)
+    return np.where(new_mean == mean, returns, returns - mean + new_mean)
@@ -0,0 +1,215 @@
+"""
+simulation.session – What-if planning with incremental recompute.
+
+``Simulator.optimize`` reruns every strategy pair from scratch.  In an
+interactive planner most tweaks only touch retirement (spending, inflation,
+CPP/OAS), so ``PlanningSession`` keeps what does not change:
+
+- one accumulation checkpoint per contribution strategy (the profile at
+  retirement and the working-years history), which depends only on the
+  accumulation inputs and the starting profile;
+- one outcome per (contribution, withdrawal) pair.
+
+``update`` works out which of the two each change invalidates.  A
+decumulation-only change reruns just the retirement years of each pair from
+the cached checkpoints; replacing one strategy only reruns the pairs that use
+it.  Results are identical to ``Simulator.optimize`` with the same inputs.
+
+>>> session = PlanningSession(profile, contribs, withdrawals)  # doctest: +SKIP
+>>> session.results()[0]["withdraw_strategy"]  # doctest: +SKIP
+>>> session.update(annual_spending=65_000)[0]  # only retirement is rerun  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from retire_plan.accounts import PersonProfile
+from retire_plan.strategies.spending import SpendingRule
+from .engine import Schedule, SimulationConfigError, Simulator, StrategyFunc
+from .metrics import TaxCalculator
+
+# Plan inputs by the phase they affect
+ACCUMULATION_INPUTS = frozenset({"years_working", "annual_savings", "accumulation_return"})
+DECUMULATION_INPUTS = frozenset({"annual_spending", "inflation_rate", "decumulation_return",
+                                 "spending_rule"})
+# Profile fields that only matter once retired; any other field resets everything
+DECUMULATION_PROFILE_FIELDS = frozenset({"end_age", "cpp_annual", "oas_annual",
+                                         "cpp_start_age", "oas_start_age"})
+_PROFILE_FIELDS = frozenset(f.name for f in dataclasses.fields(PersonProfile))
+
+
+class PlanningSession:
+    """Strategy comparison for one plan, recomputing only what a change affects.
+
+    Parameters
+    ----------
+    profile : PersonProfile
+        Starting profile; it is never modified.
+    contribution_strategies, withdrawal_strategies : sequence of (name, callable)
+        Same as ``Simulator.optimize``; names must be unique.
+    years_working, annual_savings, annual_spending, accumulation_return,
+    decumulation_return, inflation_rate, spending_rule
+        Same as ``Simulator.run_full_lifecycle``.
+    tax_calculator : TaxCalculator, optional
+    objective : str or callable
+        Ranking, as in ``Simulator.optimize`` (lower is better).
+
+    Attributes
+    ----------
+    runs : dict
+        Number of accumulation and decumulation phases simulated so far.
+    """
+
+    def __init__(
+        self,
+        profile: PersonProfile,
+        contribution_strategies: Sequence[Tuple[str, StrategyFunc]],
+        withdrawal_strategies: Sequence[Tuple[str, StrategyFunc]],
+        years_working: int = 35,
+        annual_savings: Schedule = 28_000,
+        annual_spending: float = 80_000,
+        accumulation_return: Schedule = 0.07,
+        decumulation_return: Schedule = 0.05,
+        inflation_rate: Schedule = 0.02,
+        spending_rule: SpendingRule | None = None,
+        tax_calculator: TaxCalculator | None = None,
+        objective: str | Callable[[Dict[str, Any]], float] = "total_tax_paid",
+    ):
+        self.profile = profile
+        self.tax_calc = tax_calculator or TaxCalculator()
+        self.objective = objective
+        self.inputs: Dict[str, Any] = {
+            "years_working": years_working,
+            "annual_savings": annual_savings,
+            "accumulation_return": accumulation_return,
+            "annual_spending": annual_spending,
+            "inflation_rate": inflation_rate,
+            "decumulation_return": decumulation_return,
+            "spending_rule": spending_rule,
+        }
+        self.contribution_strategies = self._named(contribution_strategies)
+        self.withdrawal_strategies = self._named(withdrawal_strategies)
+        # contribution name -> (profile at retirement, working-years history)
+        self._checkpoints: Dict[str, Tuple[PersonProfile, List[Dict[str, Any]]]] = {}
+        # (contribution name, withdrawal name) -> lifecycle outcome
+        self._outcomes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.runs = {"accumulation": 0, "decumulation": 0}
+
+    @staticmethod
+    def _named(strategies: Sequence[Tuple[str, StrategyFunc]]) -> Dict[str, StrategyFunc]:
+        named = dict(strategies)
+        if len(named) != len(strategies):
+            raise SimulationConfigError("strategy names must be unique")
+        return named
+
+    def update(self, **changes: Any) -> List[Dict[str, Any]]:
+        """Change plan inputs, profile fields or strategy lists; return the new ranking.
+
+        Keywords are plan inputs (``ACCUMULATION_INPUTS`` and
+        ``DECUMULATION_INPUTS``), ``PersonProfile`` fields, or
+        ``contribution_strategies`` / ``withdrawal_strategies``.
+
+        If the change is rejected (an unknown keyword, or a value the
+        profile or simulator refuses), the session is left as it was.
+
+        Raises
+        ------
+        SimulationConfigError
+            For an unknown keyword or an invalid value.
+        """
+        saved = (self.profile, dict(self.inputs), self.contribution_strategies,
+                 self.withdrawal_strategies, dict(self._checkpoints), dict(self._outcomes))
+        try:
+            self._apply(changes)
+            return self.results()
+        except Exception:
+            (self.profile, self.inputs, self.contribution_strategies,
+             self.withdrawal_strategies, self._checkpoints, self._outcomes) = saved
+            raise
+
+    def _apply(self, changes: Dict[str, Any]) -> None:
+        unknown = set(changes) - ACCUMULATION_INPUTS - DECUMULATION_INPUTS - _PROFILE_FIELDS - {
+            "contribution_strategies", "withdrawal_strategies"}
+        if unknown:
+            raise SimulationConfigError(f"unknown session inputs: {sorted(unknown)}")
+
+        reset_accumulation = bool(ACCUMULATION_INPUTS & set(changes))
+        reset_decumulation = bool(DECUMULATION_INPUTS & set(changes))
+        profile_changes = {k: v for k, v in changes.items() if k in _PROFILE_FIELDS}
+        if profile_changes:
+            # replace() re-runs the profile's own validation
+            self.profile = dataclasses.replace(self.profile, **profile_changes)
+            reset_decumulation = True
+            reset_accumulation |= bool(set(profile_changes) - DECUMULATION_PROFILE_FIELDS)
+        for key in ACCUMULATION_INPUTS | DECUMULATION_INPUTS:
+            if key in changes:
+                self.inputs[key] = changes[key]
+
+        if reset_accumulation:
+            self._checkpoints.clear()
+        if reset_accumulation or reset_decumulation:
+            self._outcomes.clear()
+
+        if "contribution_strategies" in changes:
+            new = self._named(changes["contribution_strategies"])
+            for name, strategy in self.contribution_strategies.items():
+                if new.get(name) is not strategy:
+                    self._checkpoints.pop(name, None)
+                    self._drop_outcomes(lambda c, w: c == name)
+            self.contribution_strategies = new
+        if "withdrawal_strategies" in changes:
+            new = self._named(changes["withdrawal_strategies"])
+            for name, strategy in self.withdrawal_strategies.items():
+                if new.get(name) is not strategy:
+                    self._drop_outcomes(lambda c, w: w == name)
+            self.withdrawal_strategies = new
+
+    def _drop_outcomes(self, stale: Callable[[str, str], bool]) -> None:
+        for key in [key for key in self._outcomes if stale(*key)]:
+            del self._outcomes[key]
+
+    def _checkpoint(self, name: str) -> Tuple[PersonProfile, List[Dict[str, Any]]]:
+        """Profile and history at retirement for one contribution strategy."""
+        if name not in self._checkpoints:
+            sim = Simulator(self.profile, self.tax_calc)
+            sim.run_accumulation(self.contribution_strategies[name],
+                                 self.inputs["years_working"],
+                                 self.inputs["annual_savings"],
+                                 self.inputs["accumulation_return"])
+            self._checkpoints[name] = (sim.profile, sim.history)
+            self.runs["accumulation"] += 1
+        return self._checkpoints[name]
+
+    def _outcome(self, c_name: str, w_name: str) -> Dict[str, Any]:
+        key = (c_name, w_name)
+        if key not in self._outcomes:
+            retired, history = self._checkpoint(c_name)
+            sim = Simulator(self.profile, self.tax_calc)
+            sim.profile = copy.deepcopy(retired)
+            for field in DECUMULATION_PROFILE_FIELDS:
+                setattr(sim.profile, field, getattr(self.profile, field))
+            sim.history = list(history)
+            sim.run_decumulation(self.withdrawal_strategies[w_name],
+                                 self.inputs["annual_spending"],
+                                 self.inputs["inflation_rate"],
+                                 self.inputs["decumulation_return"],
+                                 self.inputs["spending_rule"])
+            self._outcomes[key] = sim._lifecycle_outcome()
+            self.runs["decumulation"] += 1
+        return self._outcomes[key]
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Every strategy pair with its outcome, best ``objective`` first
+        (same rows as ``Simulator.optimize``)."""
+        objective = self.objective
+        score = objective if callable(objective) else (lambda r: r[objective])
+        entries = [
+            {"contrib_strategy": c_name, "withdraw_strategy": w_name,
+             **self._outcome(c_name, w_name)}
+            for c_name in self.contribution_strategies
+            for w_name in self.withdrawal_strategies
+        ]
+        return sorted(entries, key=score)
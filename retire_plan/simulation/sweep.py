@@ -0,0 +1,196 @@
+"""
+simulation.sweep – Checkpointed parameter sweeps that survive preemption.
+
+A sweep is an ordered set of work units, each with a unique key and a
+JSON-serializable parameter dict.  ``run_sweep`` evaluates the units in
+order and appends each finished unit to a local JSON-lines checkpoint as a
+single write followed by ``fsync``.  A line is either complete or, if the job
+died mid-write, detected as torn and discarded on resume, so a killed job
+loses at most the unit that was running.  Re-running with the same
+checkpoint path skips finished units.
+
+Results are normalized through JSON whether they were just computed or read
+back from the checkpoint, so a resumed sweep returns exactly the same output
+as an uninterrupted one.  Stochastic units should take their seed from
+``unit_seed`` (derived from the unit key, not from execution order).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from retire_plan.accounts import PersonProfile
+from .engine import SimulationConfigError, Simulator, StrategyFunc
+
+CHECKPOINT_VERSION = 1
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _normalize(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=_to_json))
+
+
+def unit_seed(base_seed: int, key: str) -> int:
+    """Stable per-unit seed: same key and base seed give the same seed."""
+    digest = hashlib.sha256(f"{base_seed}:{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def _load_checkpoint(path: str | os.PathLike) -> Dict[str, Dict[str, Any]]:
+    """Read finished units, dropping a torn trailing line if there is one."""
+    if not os.path.exists(path):
+        return {}
+    done: Dict[str, Dict[str, Any]] = {}
+    good_bytes = 0
+    with open(path, "rb") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            if "version" in record:
+                if record["version"] != CHECKPOINT_VERSION:
+                    raise SimulationConfigError(f"unsupported checkpoint version in {path}")
+            else:
+                done[record["key"]] = record
+            good_bytes += len(line)
+    if good_bytes < os.path.getsize(path):
+        with open(path, "r+b") as fh:
+            fh.truncate(good_bytes)
+    return done
+
+
+def _append_checkpoint(path: str | os.PathLike, record: Dict[str, Any]) -> None:
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    lines = ""
+    if new_file:
+        lines += json.dumps({"version": CHECKPOINT_VERSION}) + "\n"
+    lines += json.dumps(record) + "\n"
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(lines)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def run_sweep(
+    units: Mapping[str, Dict[str, Any]],
+    evaluate: Callable[[Dict[str, Any]], Any],
+    checkpoint_path: str | os.PathLike | None = None,
+) -> Dict[str, Any]:
+    """Evaluate every unit, checkpointing after each one.
+
+    Parameters
+    ----------
+    units : mapping
+        ``{key: params}`` in the order the units should run.  ``params``
+        must be JSON-serializable; it is stored next to the result so that
+        resuming against a different sweep is detected.
+    evaluate : callable
+        ``evaluate(params) -> result``; the result must be JSON-serializable
+        (numpy scalars and arrays are converted).
+    checkpoint_path : path or None
+        Local checkpoint file.  ``None`` disables checkpointing.
+
+    Returns
+    -------
+    dict
+        ``{key: result}`` in unit order.
+
+    Raises
+    ------
+    SimulationConfigError
+        If the checkpoint holds a unit with the same key but different params.
+    """
+    done = _load_checkpoint(checkpoint_path) if checkpoint_path is not None else {}
+
+    results: Dict[str, Any] = {}
+    for key, params in units.items():
+        params = _normalize(params)
+        if key in done:
+            if done[key]["params"] != params:
+                raise SimulationConfigError(
+                    f"checkpoint unit {key!r} was run with different params"
+                )
+        else:
+            done[key] = {"key": key, "params": params, "result": _normalize(evaluate(params))}
+            if checkpoint_path is not None:
+                _append_checkpoint(checkpoint_path, done[key])
+        results[key] = done[key]["result"]
+    return results
+
+
+def lifecycle_sweep(
+    profiles: Mapping[str, PersonProfile],
+    contribution_strategies: Sequence[tuple[str, StrategyFunc]],
+    withdrawal_strategies: Sequence[tuple[str, StrategyFunc]],
+    spending_levels: Sequence[float],
+    checkpoint_path: str | os.PathLike | None = None,
+    years_working: int = 35,
+    annual_savings: float = 28_000,
+) -> List[Dict[str, Any]]:
+    """Checkpointed sweep of ``run_full_lifecycle`` over profiles x strategies x spending.
+
+    Each unit stores the lifecycle outcome without its ``history``; the
+    profile's ``snapshot()`` is part of the unit params, so resuming after a
+    profile was edited is rejected instead of mixing old and new results.
+
+    Returns
+    -------
+    list of dict
+        One row per unit, in sweep order, with ``profile``,
+        ``contrib_strategy``, ``withdraw_strategy`` and ``annual_spending``
+        alongside the ``run_full_lifecycle`` outcome keys.
+    """
+    contribs = dict(contribution_strategies)
+    withdrawals = dict(withdrawal_strategies)
+
+    units = {}
+    for p_name in profiles:
+        for c_name in contribs:
+            for w_name in withdrawals:
+                for spending in spending_levels:
+                    key = f"{p_name}|{c_name}|{w_name}|{float(spending)!r}"
+                    units[key] = {
+                        "profile": p_name,
+                        "profile_snapshot": profiles[p_name].snapshot(),
+                        "contrib_strategy": c_name,
+                        "withdraw_strategy": w_name,
+                        "annual_spending": float(spending),
+                        "years_working": years_working,
+                        "annual_savings": annual_savings,
+                    }
+
+    def evaluate(params: Dict[str, Any]) -> Dict[str, Any]:
+        outcome = Simulator(profiles[params["profile"]]).run_full_lifecycle(
+            contribs[params["contrib_strategy"]],
+            withdrawals[params["withdraw_strategy"]],
+            years_working=params["years_working"],
+            annual_savings=params["annual_savings"],
+            annual_spending=params["annual_spending"],
+        )
+        outcome.pop("history")
+        return outcome
+
+    results = run_sweep(units, evaluate, checkpoint_path)
+    return [
+        {
+            **{k: units[key][k] for k in ("profile", "contrib_strategy",
+                                          "withdraw_strategy", "annual_spending")},
+            **result,
+        }
+        for key, result in results.items()
+    ]
@@ -4,6 +4,8 @@ strategies subpackage
 Provides:
 - Withdrawal strategy functions in policies.py
 - Analysis / summary functions in analysis.py
+- Declarative strategy specs in specs.py
+- Dynamic spending rules in spending.py
 
 Implementation is intentionally left to Student C.
 """
@@ -13,18 +15,42 @@ from .policies import (
     strategy_spend_taxable_first,
     strategy_spend_rrsp_first,
     strategy_smooth_with_tfsa,
+    gross_up,
+)
+from .specs import (
+    Step,
+    StrategySpec,
+    compile_spec,
+    dedupe_strategies,
+)
+from .spending import (
+    SpendingRule,
+    GuytonKlinger,
+    PercentOfPortfolio,
+    FloorCeiling,
 )
 from .analysis import (
     summarize_results,
     compare_strategies,
     income_profile_by_age,
+    wealth_path,
 )
 
 __all__ = [
     "strategy_spend_taxable_first",
     "strategy_spend_rrsp_first",
     "strategy_smooth_with_tfsa",
+    "gross_up",
+    "Step",
+    "StrategySpec",
+    "compile_spec",
+    "dedupe_strategies",
+    "SpendingRule",
+    "GuytonKlinger",
+    "PercentOfPortfolio",
+    "FloorCeiling",
     "summarize_results",
     "compare_strategies",
     "income_profile_by_age",
+    "wealth_path",
 ]
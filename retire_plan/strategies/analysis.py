@@ -3,6 +3,9 @@ Analysis utilities for retire_plan strategies.
 
 All functions operate only on the results list returned by run_simulation().
 Implementation details are left to Student C.
+
+Histories loaded from a binary result file (``HistoryColumns``) expose
+``column(name)``; for those, only the needed columns are read.
 """
 
 from __future__ import annotations
@@ -26,6 +29,8 @@ def summarize_results(name: str, results: List[Dict[str, Any]]) -> Dict[str, Any
     """
     if not results:
         raise ValueError("results must be a non-empty list")
+    if hasattr(results, "column"):
+        return _summarize_columns(name, results)
 
     lifetime_tax = sum(float(r.get("tax_paid", 0.0)) for r in results)
 
@@ -54,6 +59,44 @@ def summarize_results(name: str, results: List[Dict[str, Any]]) -> Dict[str, Any
     }
 
 
+def _column_list(results: Any, name: str) -> List[float]:
+    """A float column as a list, with missing years (or column) read as 0.0."""
+    if name not in results.names:
+        return [0.0] * len(results)
+    return [0.0 if v != v else v for v in results.column(name).tolist()]
+
+
+def _summarize_columns(name: str, results: Any) -> Dict[str, Any]:
+    """summarize_results for a columnar history (same arithmetic, same result)."""
+    lifetime_tax = sum(_column_list(results, "tax_paid"))
+
+    balance_names = [n for n in results.names if n.startswith("end_balances.")]
+    totals = 0.0
+    for col in balance_names:
+        totals = totals + results.column(col)
+    totals = totals.tolist() if balance_names else [0.0] * len(results)
+    final_wealth = sum(float(results.column(col)[-1]) for col in balance_names)
+
+    ruin_age = None
+    for age, total_balance in zip(results.column("age").tolist(), totals):
+        if total_balance <= 1e-6:
+            ruin_age = int(age)
+            break
+
+    net_flows = _column_list(results, "net_cash_flow")
+    avg_net_cash = statistics.mean(net_flows)
+    stdev_net_cash = statistics.pstdev(net_flows) if len(net_flows) > 1 else 0.0
+
+    return {
+        "name": name,
+        "lifetime_tax": lifetime_tax,
+        "final_wealth": final_wealth,
+        "ruin_age": ruin_age,
+        "avg_net_cash": avg_net_cash,
+        "stdev_net_cash": stdev_net_cash,
+    }
+
+
 def compare_strategies(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Compare multiple strategy summaries.
 
@@ -92,6 +135,10 @@ def income_profile_by_age(
     Student C: implement how to transform the raw results into a sequence
     of (age, net_cash_flow) tuples.
     """
+    if hasattr(results, "column"):
+        ages = [int(a) for a in results.column("age").tolist()]
+        return list(zip(ages, _column_list(results, "net_cash_flow")))
+
     profile: List[Tuple[int, float]] = []
 
     for r in results:
@@ -100,3 +147,11 @@ def income_profile_by_age(
         profile.append((age, net_cash_flow))
 
     return profile
+
+
+def wealth_path(results: List[Dict[str, Any]]) -> Tuple[List[int], List[float]]:
+    """Ages and total wealth, e.g. for plotting a history."""
+    if hasattr(results, "column"):
+        return ([int(a) for a in results.column("age").tolist()],
+                results.column("total_wealth").tolist())
+    return [int(r["age"]) for r in results], [float(r["total_wealth"]) for r in results]
@@ -6,6 +6,10 @@ from __future__ import annotations
 
 from typing import Dict, Any
 
+import numpy as np
+
+from .specs import Step, StrategySpec, compile_spec
+
 
 # ========================
 # CONTRIBUTION STRATEGIES
@@ -115,4 +119,100 @@ def strategy_smooth_with_tfsa(state: Dict[str, Any]) -> Dict[str, float]:
     if remaining > 0:
         plan["tax_free"] = min(remaining, balances.get("tax_free", 0))
 
-    return plan
\ No newline at end of file
+    return plan
+
+# ========================
+# AFTER-TAX TARGETS
+# ========================
+# Share of a withdrawal that counts as taxable income, per account; the
+# engines pass the taxable account's current gain share in
+# state["taxable_share"]
+TAXABLE_SHARE = {"tax_deferred": 1.0, "tax_free": 0.0, "taxable": 1.0}
+
+
+def _taxable_part(plan: Dict[str, Any], share: Dict[str, Any] = TAXABLE_SHARE):
+    total = 0.0
+    for key in ("tax_deferred", "tax_free", "taxable"):
+        total = total + np.maximum(plan.get(key, 0.0), 0.0) * share[key]
+    return total
+
+
+def gross_up(strategy, tax_calculator):
+    """Wrap a withdrawal strategy so ``target_net_cash`` is met after tax.
+
+    The built-in strategies size withdrawals as if they were tax-free, so
+    the tax on them leaves ``net_cash_flow`` short of the target.  The
+    wrapper runs the strategy once, grosses its taxable withdrawals up with
+    ``tax_calculator.gross_for_net`` (the exact inverse of the tax schedule
+    for the year in ``state["year"]``) and runs it again with the target
+    raised by the difference – no iteration.  The result is exact whenever
+    the extra withdrawal comes from the RRSP; from the TFSA it slightly
+    overshoots, and from the taxable account (where only the realized gain
+    is taxed) it falls slightly short.  A ``vectorized`` kernel is attached
+    when the strategy has one.
+    """
+    def wrapped(state: Dict[str, Any]) -> Dict[str, float]:
+        plan = strategy(state)
+        taxable = float(_taxable_part(plan, state.get("taxable_share", TAXABLE_SHARE)))
+        extra = tax_calculator.gross_for_net(taxable, state.get("year", 0)) - taxable
+        if extra <= 0:
+            return plan
+        return strategy({**state, "target_net_cash": float(state.get("target_net_cash", 0)) + extra})
+
+    kernel = getattr(strategy, "vectorized", None)
+    if kernel is not None:
+        def wrapped_kernel(state: Dict[str, Any]) -> Dict[str, np.ndarray]:
+            taxable = _taxable_part(kernel(state), state.get("taxable_share", TAXABLE_SHARE))
+            extra = tax_calculator.gross_for_net_array(taxable, state.get("year", 0)) - taxable
+            target = np.asarray(state.get("target_net_cash", 0), dtype=float)
+            return kernel({**state, "target_net_cash": target + np.maximum(extra, 0.0)})
+
+        wrapped.vectorized = wrapped_kernel
+    wrapped.__name__ = f"{getattr(strategy, '__name__', 'strategy')}_gross_up"
+    return wrapped
+
+
+# ========================
+# DECLARATIVE SPECS
+# ========================
+# The same rules as the functions above, as ``StrategySpec`` objects.  The
+# compiled kernel is attached to each scalar strategy as
+# ``strategy.vectorized`` so the batch engine can evaluate every path in one
+# call, and ``strategy.spec`` lets the optimizer recognise user-built specs
+# that duplicate a built-in.  Strategies without a kernel still work in the
+# batch engine, they are just called once per path.
+contrib_max_tfsa_first.spec = StrategySpec("contribution", (
+    Step("tax_free", cap=7500),
+    Step("tax_deferred", cap=35000),
+    Step("taxable"),
+))
+contrib_max_rrsp_first.spec = StrategySpec("contribution", (
+    Step("tax_deferred", cap=35000),
+    Step("tax_free", cap=7500),
+    Step("taxable"),
+))
+strategy_spend_taxable_first.spec = StrategySpec("withdrawal", (
+    Step("taxable"),
+    Step("tax_deferred"),
+    Step("tax_free"),
+))
+strategy_spend_rrsp_first.spec = StrategySpec("withdrawal", (
+    Step("tax_deferred"),
+    Step("taxable"),
+    Step("tax_free"),
+))
+strategy_smooth_with_tfsa.spec = StrategySpec("withdrawal", (
+    Step("tax_deferred", pct_of_balance=0.04),
+    Step("taxable"),
+    Step("tax_free"),
+))
+
+for _strategy in (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_spend_rrsp_first,
+    strategy_smooth_with_tfsa,
+):
+    _strategy.vectorized = compile_spec(_strategy.spec).vectorized
+del _strategy
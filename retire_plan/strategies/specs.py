@@ -0,0 +1,228 @@
+"""
+strategies.specs – Declarative contribution and withdrawal strategies
+
+A ``StrategySpec`` describes a strategy as an ordered list of ``Step`` rules:
+each step moves as much of the remaining amount as it can into (or out of)
+one account, limited by an optional yearly cap, an optional percentage of the
+account balance and an optional age window.  ``compile_spec`` turns a spec
+into a regular strategy function with a numpy ``vectorized`` kernel attached,
+so it works in both ``Simulator`` and the batch engine.
+
+Specs that describe the same rules in different ways have the same
+``canonical()`` form; ``dedupe_strategies`` uses it to keep the optimizer
+from evaluating one strategy twice.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+ACCOUNTS = ("tax_deferred", "tax_free", "taxable")
+KINDS = ("contribution", "withdrawal")
+
+StrategyFunc = Callable[[Dict[str, Any]], Dict[str, float]]
+
+
+@dataclass(frozen=True)
+class Step:
+    """One rule of a strategy spec.
+
+    Attributes
+    ----------
+    account : str
+        ``"tax_deferred"``, ``"tax_free"`` or ``"taxable"``.
+    cap : float or None
+        Most this step moves in one year (``None``: no cap).
+    pct_of_balance : float or None
+        Withdrawals only: most this step takes, as a fraction of the
+        account's balance at the start of the year.
+    from_age, before_age : int or None
+        The step only applies when ``from_age <= age < before_age``.
+    """
+
+    account: str
+    cap: float | None = None
+    pct_of_balance: float | None = None
+    from_age: int | None = None
+    before_age: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.account not in ACCOUNTS:
+            raise ValueError(f"unknown account {self.account!r}; expected one of {ACCOUNTS}")
+        if self.cap is not None and self.cap < 0:
+            raise ValueError(f"cap cannot be negative: {self.cap}")
+        if self.pct_of_balance is not None and self.pct_of_balance < 0:
+            raise ValueError(f"pct_of_balance cannot be negative: {self.pct_of_balance}")
+
+    @property
+    def unconditional(self) -> bool:
+        return self.from_age is None and self.before_age is None
+
+    @property
+    def never_applies(self) -> bool:
+        return (self.from_age is not None and self.before_age is not None
+                and self.from_age >= self.before_age)
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """Ordered account priority for a contribution or withdrawal strategy.
+
+    Contribution specs allocate ``annual_savings_available``; withdrawal
+    specs cover the shortfall of ``target_net_cash`` over CPP and OAS,
+    never taking more than an account holds.
+    """
+
+    kind: str
+    steps: Tuple[Step, ...]
+
+    def __post_init__(self) -> None:
+        if self.kind not in KINDS:
+            raise ValueError(f"unknown kind {self.kind!r}; expected one of {KINDS}")
+        object.__setattr__(self, "steps", tuple(self.steps))
+        if self.kind == "contribution" and any(s.pct_of_balance is not None for s in self.steps):
+            raise ValueError("pct_of_balance only applies to withdrawal specs")
+
+    def canonical(self) -> StrategySpec:
+        """Equivalent spec in normal form (equal specs behave identically).
+
+        Drops steps that can never move money, percentage limits that the
+        balance limit already implies, steps that come after the amount (or,
+        for withdrawals, the account) has been exhausted, and merges
+        consecutive capped steps on the same account and age window.
+        """
+        steps: List[Step] = []
+        exhausted_accounts = set()
+        for step in self.steps:
+            if step.pct_of_balance is not None and step.pct_of_balance >= 1:
+                step = replace(step, pct_of_balance=None)
+            if step.never_applies or step.cap == 0 or step.pct_of_balance == 0:
+                continue
+            if step.account in exhausted_accounts:
+                continue
+
+            prev = steps[-1] if steps else None
+            if (prev is not None and prev.account == step.account
+                    and prev.pct_of_balance is None and step.pct_of_balance is None
+                    and (prev.from_age, prev.before_age) == (step.from_age, step.before_age)):
+                cap = None if prev.cap is None or step.cap is None else prev.cap + step.cap
+                steps[-1] = replace(prev, cap=cap)
+            else:
+                steps.append(step)
+
+            last = steps[-1]
+            if last.unconditional and last.cap is None and last.pct_of_balance is None:
+                if self.kind == "contribution":
+                    break
+                exhausted_accounts.add(last.account)
+        return StrategySpec(self.kind, tuple(steps))
+
+
+def _rules(spec: StrategySpec) -> Tuple[tuple, ...]:
+    return tuple(
+        (
+            s.account,
+            math.inf if s.cap is None else float(s.cap),
+            s.pct_of_balance,
+            -math.inf if s.from_age is None else s.from_age,
+            math.inf if s.before_age is None else s.before_age,
+        )
+        for s in spec.canonical().steps
+    )
+
+
+def compile_spec(spec: StrategySpec) -> StrategyFunc:
+    """Compile a spec into a strategy function with a ``vectorized`` kernel.
+
+    The returned function also carries the spec as ``strategy.spec``.
+    """
+    rules = _rules(spec)
+    withdrawal = spec.kind == "withdrawal"
+
+    def strategy(state: Dict[str, Any]) -> Dict[str, float]:
+        if withdrawal:
+            benefits = float(state.get("cpp_income", 0)) + float(state.get("oas_income", 0))
+            remaining = max(float(state.get("target_net_cash", 0)) - benefits, 0)
+            balances = state.get("balances", {})
+        else:
+            remaining = state["annual_savings_available"]
+        age = state.get("age", 0)
+        plan = {"tax_deferred": 0.0, "tax_free": 0.0, "taxable": 0.0}
+
+        for account, cap, pct, lo, hi in rules:
+            if not lo <= age < hi:
+                continue
+            amount = min(remaining, cap)
+            if withdrawal:
+                balance = balances.get(account, 0)
+                amount = min(amount, balance - plan[account])
+                if pct is not None:
+                    amount = min(amount, pct * balance)
+            plan[account] += amount
+            remaining -= amount
+        return plan
+
+    def kernel(state: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        if withdrawal:
+            benefits = (np.asarray(state.get("cpp_income", 0), dtype=float)
+                        + np.asarray(state.get("oas_income", 0), dtype=float))
+            target = np.asarray(state.get("target_net_cash", 0), dtype=float)
+            remaining = np.maximum(target - benefits, 0.0)
+            balances = state.get("balances", {})
+        else:
+            remaining = np.asarray(state["annual_savings_available"], dtype=float)
+        age = np.asarray(state.get("age", 0))
+        plan = {key: np.zeros_like(remaining) for key in ACCOUNTS}
+
+        for account, cap, pct, lo, hi in rules:
+            amount = np.minimum(remaining, cap)
+            if withdrawal:
+                balance = np.asarray(balances.get(account, 0), dtype=float)
+                amount = np.minimum(amount, balance - plan[account])
+                if pct is not None:
+                    amount = np.minimum(amount, pct * balance)
+            if lo > -math.inf or hi < math.inf:
+                amount = np.where((lo <= age) & (age < hi), amount, 0.0)
+            plan[account] = plan[account] + amount
+            remaining = remaining - amount
+        return plan
+
+    strategy.vectorized = kernel
+    strategy.spec = spec
+    return strategy
+
+
+def strategy_key(strategy: StrategyFunc) -> Any:
+    """Equality key: the canonical spec if the strategy has one, else itself."""
+    spec = getattr(strategy, "spec", None)
+    return spec.canonical() if spec is not None else strategy
+
+
+def dedupe_strategies(
+    strategies: Sequence[tuple[str, StrategyFunc]],
+) -> tuple[List[tuple[str, StrategyFunc]], Dict[str, List[str]]]:
+    """Drop strategies equivalent to an earlier one in the list.
+
+    Returns
+    -------
+    unique : list of (name, strategy)
+        First occurrence of each distinct strategy, in input order.
+    aliases : dict
+        ``{kept_name: [names of dropped equivalents]}``.
+    """
+    unique: List[tuple[str, StrategyFunc]] = []
+    aliases: Dict[str, List[str]] = {}
+    seen: Dict[Any, str] = {}
+    for name, strategy in strategies:
+        key = strategy_key(strategy)
+        if key in seen:
+            aliases[seen[key]].append(name)
+        else:
+            seen[key] = name
+            aliases[name] = []
+            unique.append((name, strategy))
+    return unique, aliases
@@ -0,0 +1,164 @@
+"""
+strategies.spending – Dynamic spending rules for retirement
+
+By default retirement spending starts at ``annual_spending`` and grows with
+inflation whatever the portfolio does.  A spending rule instead sets each
+year's spending from the path's own history:
+
+- ``GuytonKlinger``: inflation-adjusted spending with guardrails – skip the
+  inflation raise after a losing year, cut 10% when the withdrawal rate
+  drifts 20% above its starting level, raise 10% when it drifts 20% below
+- ``PercentOfPortfolio``: a fixed share of the current portfolio
+- ``FloorCeiling``: a fixed share of the portfolio, kept between a floor and
+  a ceiling around the inflation-adjusted starting spending
+
+Rules are vectorized: all their per-path state lives in a dict of numpy
+arrays, so ``simulate_batch`` applies one rule to every path with a few
+array operations and ``Simulator`` uses the same code on one-element arrays.
+
+>>> sim.run_full_lifecycle(contrib, withdraw, spending_rule=GuytonKlinger())  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+RuleState = Dict[str, np.ndarray]
+
+
+class SpendingRule(ABC):
+    """Abstract base class: spending for the first year, then for each following year.
+
+    ``wealth`` is total wealth across the three accounts, ``portfolio_return``
+    the year's overall return (after withdrawals), ``inflation`` the year's
+    inflation rate and ``years_left`` the number of retirement years still to
+    simulate.  Every array argument has shape ``(paths,)``.
+    """
+
+    @abstractmethod
+    def start(self, spending: np.ndarray, wealth: np.ndarray) -> Tuple[np.ndarray, RuleState]:
+        """First-year spending and initial rule state, from the planned spending."""
+        raise NotImplementedError("Subclasses must implement start().")
+
+    @abstractmethod
+    def update(
+        self,
+        spending: np.ndarray,
+        state: RuleState,
+        wealth: np.ndarray,
+        portfolio_return: np.ndarray,
+        inflation: Any,
+        years_left: int,
+    ) -> np.ndarray:
+        """Next year's spending; ``state`` arrays may be updated in place."""
+        raise NotImplementedError("Subclasses must implement update().")
+
+
+def _rate(spending: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+    """Withdrawal rate (infinite once the portfolio is gone)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(wealth > 0, spending / np.where(wealth > 0, wealth, 1.0), np.inf)
+
+
+def _initial_rate(rate: float | None, spending: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+    if rate is not None:
+        return np.full(np.shape(wealth), float(rate))
+    return _rate(spending, wealth)
+
+
+@dataclass(frozen=True)
+class GuytonKlinger(SpendingRule):
+    """Guyton-Klinger decision rules.
+
+    Attributes
+    ----------
+    upper_guardrail, lower_guardrail : float
+        Relative drift of the withdrawal rate from its starting level that
+        triggers a cut (above) or a raise (below).
+    adjustment : float
+        Size of a cut or raise.
+    final_years : int
+        No cuts once this few retirement years remain.
+    """
+
+    upper_guardrail: float = 0.20
+    lower_guardrail: float = 0.20
+    adjustment: float = 0.10
+    final_years: int = 15
+
+    def __post_init__(self) -> None:
+        if self.upper_guardrail < 0 or not 0 <= self.lower_guardrail < 1:
+            raise ValueError("guardrails must be non-negative (lower below 1)")
+        if not 0 <= self.adjustment < 1:
+            raise ValueError(f"adjustment must be in [0, 1): {self.adjustment}")
+
+    def start(self, spending: np.ndarray, wealth: np.ndarray) -> Tuple[np.ndarray, RuleState]:
+        return spending, {"initial_rate": _rate(spending, wealth)}
+
+    def update(self, spending, state, wealth, portfolio_return, inflation, years_left):
+        initial_rate = state["initial_rate"]
+        # Inflation rule: no raise after a losing year with an elevated rate
+        freeze = (portfolio_return < 0) & (_rate(spending, wealth) > initial_rate)
+        proposed = np.where(freeze, spending, spending * (1 + inflation))
+
+        rate = _rate(proposed, wealth)
+        cut = rate > initial_rate * (1 + self.upper_guardrail)
+        if years_left <= self.final_years:
+            cut = np.zeros_like(cut)
+        boost = rate < initial_rate * (1 - self.lower_guardrail)
+        return np.where(cut, proposed * (1 - self.adjustment),
+                        np.where(boost, proposed * (1 + self.adjustment), proposed))
+
+
+@dataclass(frozen=True)
+class PercentOfPortfolio(SpendingRule):
+    """Spend ``rate`` times the portfolio each year.
+
+    ``rate=None`` uses the planned first-year spending's share of the
+    portfolio at retirement.
+    """
+
+    rate: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.rate is not None and not 0 < self.rate <= 1:
+            raise ValueError(f"rate must be in (0, 1]: {self.rate}")
+
+    def start(self, spending: np.ndarray, wealth: np.ndarray) -> Tuple[np.ndarray, RuleState]:
+        rate = _initial_rate(self.rate, spending, wealth)
+        return np.where(np.isfinite(rate), rate * wealth, spending), {"rate": rate}
+
+    def update(self, spending, state, wealth, portfolio_return, inflation, years_left):
+        return state["rate"] * np.maximum(wealth, 0.0)
+
+
+@dataclass(frozen=True)
+class FloorCeiling(SpendingRule):
+    """Percent of portfolio, clipped to ``[floor, ceiling]`` times the
+    inflation-adjusted first-year spending.
+    """
+
+    rate: float | None = None
+    floor: float = 0.90
+    ceiling: float = 1.25
+
+    def __post_init__(self) -> None:
+        if self.rate is not None and not 0 < self.rate <= 1:
+            raise ValueError(f"rate must be in (0, 1]: {self.rate}")
+        if not 0 <= self.floor <= 1 <= self.ceiling:
+            raise ValueError(f"need 0 <= floor <= 1 <= ceiling: {self.floor}, {self.ceiling}")
+
+    def start(self, spending: np.ndarray, wealth: np.ndarray) -> Tuple[np.ndarray, RuleState]:
+        rate = _initial_rate(self.rate, spending, wealth)
+        base = np.array(spending, dtype=float)
+        first = np.where(np.isfinite(rate), rate * wealth, base)
+        return np.clip(first, self.floor * base, self.ceiling * base), {"rate": rate, "base": base}
+
+    def update(self, spending, state, wealth, portfolio_return, inflation, years_left):
+        state["base"] = state["base"] * (1 + inflation)
+        base = state["base"]
+        return np.clip(state["rate"] * np.maximum(wealth, 0.0), self.floor * base, self.ceiling * base)
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+from typing import Optional
+
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+
+
+def make_profile(
+    current_age: int = 55,
+    end_age: int = 95,
+    rrsp: float = 400_000.0,
+    tfsa: float = 80_000.0,
+    taxable: float = 60_000.0,
+    cost_base: Optional[float] = None,
+    rrif_conversion_age: Optional[int] = None,
+    **overrides,
+) -> PersonProfile:
+    """A fresh profile with CPP 12,000 and OAS 8,000; ``overrides`` are
+    other ``PersonProfile`` fields (e.g. ``cpp_start_age``)."""
+    return PersonProfile(
+        name="Test",
+        current_age=current_age,
+        end_age=end_age,
+        tax_deferred=TaxDeferredAccount("RRSP", rrsp, rrif_conversion_age=rrif_conversion_age),
+        tax_free=TaxFreeAccount("TFSA", tfsa),
+        taxable=TaxableAccount("Taxable", taxable, cost_base=cost_base),
+        cpp_annual=12_000.0,
+        oas_annual=8_000.0,
+        **overrides,
+    )
@@ -6,6 +6,7 @@ Covers:
 - profile.py: PersonProfile
 """
 
+import dataclasses
 import unittest
 
 from retire_plan.accounts.models import (
@@ -154,15 +155,25 @@ class TestTaxableAccount(unittest.TestCase):
         expected = before * (1.0 + self.account.annual_return)
         self.assertAlmostEqual(self.account.balance, expected, places=6)
 
-    def test_withdraw_treated_as_taxable_placeholder(self) -> None:
-        taxable, cash = self.account.withdraw(5_000.0)
-        self.assertAlmostEqual(taxable, 5_000.0)
+    def test_withdraw_taxes_realized_gain(self) -> None:
+        account = TaxableAccount(name="Taxable", balance=20_000.0, cost_base=10_000.0)
+        taxable, cash = account.withdraw(5_000.0)
+        self.assertAlmostEqual(taxable, 0.5 * 2_500.0)
         self.assertAlmostEqual(cash, 5_000.0)
-        self.assertAlmostEqual(self.account.balance, 15_000.0)
+        self.assertAlmostEqual(account.balance, 15_000.0)
+        self.assertAlmostEqual(account.cost_base, 7_500.0)
+
+    def test_cost_base_defaults_to_balance_and_follows_deposits(self) -> None:
+        self.assertAlmostEqual(self.account.cost_base, 20_000.0)
+        self.assertAlmostEqual(self.account.taxable_share(), 0.0)
+        self.account.grow()
+        self.account.deposit(1_000.0)
+        self.assertAlmostEqual(self.account.cost_base, 21_000.0)
+        self.assertAlmostEqual(self.account.taxable_share(), 0.5 * 600.0 / 21_600.0)
 
     def test_withdraw_more_than_balance_clamps_to_balance(self) -> None:
         taxable, cash = self.account.withdraw(50_000.0)
-        self.assertAlmostEqual(taxable, 20_000.0)
+        self.assertAlmostEqual(taxable, 0.0)
         self.assertAlmostEqual(cash, 20_000.0)
         self.assertAlmostEqual(self.account.balance, 0.0)
 
@@ -282,6 +293,23 @@ class TestPersonProfile(unittest.TestCase):
         self.assertAlmostEqual(snap["balance_tax_free"], 50_000.0)
         self.assertAlmostEqual(snap["balance_taxable"], 20_000.0)
 
+    def test_snapshot_covers_simulation_inputs(self) -> None:
+        snap = self.profile.snapshot()
+        self.assertIsNone(snap["cpp_start_age"])
+        self.assertIsNone(snap["rrif_conversion_age"])
+        self.assertAlmostEqual(snap["cost_base_taxable"], 20_000.0)
+
+        changed = [
+            dataclasses.replace(self.profile, cpp_start_age=70),
+            dataclasses.replace(self.profile, oas_start_age=67),
+            dataclasses.replace(self.profile, tax_deferred=TaxDeferredAccount(
+                "RRSP", 100_000.0, rrif_conversion_age=71)),
+            dataclasses.replace(self.profile, taxable=TaxableAccount(
+                "Taxable", 20_000.0, cost_base=5_000.0)),
+        ]
+        for profile in changed:
+            self.assertNotEqual(profile.snapshot(), snap)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+"""
+Unit tests for retire_plan.simulation.backends.
+"""
+
+import unittest
+
+from retire_plan.simulation.backends import (
+    BACKENDS,
+    CHECKED_FIELDS,
+    check_backends,
+    random_cases,
+    register_backend,
+)
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.strategies.policies import contrib_max_rrsp_first, strategy_smooth_with_tfsa
+from retire_plan.strategies.spending import GuytonKlinger
+
+from tests.helpers import make_profile
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_numpy_backend_reproduces_reference(self) -> None:
+        kwargs = dict(years_working=12, annual_savings=20_000, annual_spending=65_000,
+                      spending_rule=GuytonKlinger())
+        expected = Simulator(make_profile(cost_base=30_000.0, rrif_conversion_age=71, cpp_start_age=68)).run_full_lifecycle(
+            contrib_max_rrsp_first, strategy_smooth_with_tfsa, **kwargs)
+        sim = Simulator(make_profile(cost_base=30_000.0, rrif_conversion_age=71, cpp_start_age=68), backend="numpy")
+        outcome = sim.run_full_lifecycle(contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                                         **kwargs)
+        self.assertEqual(outcome, expected)
+        self.assertIs(outcome["history"], sim.history)
+
+    def test_unknown_backend(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            Simulator(make_profile(cost_base=30_000.0, rrif_conversion_age=71, cpp_start_age=68), backend="fortran")
+
+    def test_registry_protects_names(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            register_backend("python", BACKENDS["numpy"])
+        with self.assertRaises(SimulationConfigError):
+            register_backend("numpy", BACKENDS["numpy"])
+
+
+class TestCheckBackends(unittest.TestCase):
+
+    def test_numpy_backend_matches(self) -> None:
+        rows = check_backends(["numpy"], n_cases=40, seed=3)
+        self.assertEqual([row["field"] for row in rows], list(CHECKED_FIELDS))
+        self.assertTrue(all(row["failures"] == 0 for row in rows))
+
+    def test_reports_divergence(self) -> None:
+        def off_by_a_dollar(*args, **kwargs):
+            outcome = BACKENDS["python"](*args, **kwargs)
+            return {**outcome, "final_wealth": outcome["final_wealth"] + 1.0}
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("not implemented")
+
+        register_backend("off_by_a_dollar", off_by_a_dollar)
+        register_backend("broken", broken)
+        self.addCleanup(BACKENDS.pop, "off_by_a_dollar")
+        self.addCleanup(BACKENDS.pop, "broken")
+        self.assertEqual(Simulator(make_profile(cost_base=30_000.0, rrif_conversion_age=71, cpp_start_age=68), backend="off_by_a_dollar").backend,
+                         "off_by_a_dollar")
+
+        rows = check_backends(["off_by_a_dollar", "broken"], n_cases=10, seed=1)
+        by_key = {(row["backend"], row["field"]): row for row in rows}
+        self.assertEqual(by_key["off_by_a_dollar", "final_wealth"]["failures"], 10)
+        self.assertIsNotNone(by_key["off_by_a_dollar", "final_wealth"]["worst_case"])
+        self.assertEqual(by_key["off_by_a_dollar", "total_tax_paid"]["failures"], 0)
+        self.assertEqual(by_key["broken", "history"]["max_divergence"], float("inf"))
+
+    def test_history_fields_are_compared(self) -> None:
+        def shift_balances(*args, **kwargs):
+            outcome = BACKENDS["python"](*args, **kwargs)
+            history = []
+            for record in outcome["history"]:
+                balances = dict(record["end_balances"])
+                balances["tax_free"] += 1.0
+                balances["taxable"] -= 1.0
+                history.append({**record, "end_balances": balances})
+            return {**outcome, "history": history}
+
+        def relabel(*args, **kwargs):
+            outcome = BACKENDS["python"](*args, **kwargs)
+            history = [{**record, "phase": "decumulation"} for record in outcome["history"]]
+            return {**outcome, "history": history}
+
+        register_backend("shift_balances", shift_balances)
+        register_backend("relabel", relabel)
+        self.addCleanup(BACKENDS.pop, "shift_balances")
+        self.addCleanup(BACKENDS.pop, "relabel")
+
+        rows = check_backends(["shift_balances", "relabel"], n_cases=10, seed=2)
+        by_key = {(row["backend"], row["field"]): row for row in rows}
+        self.assertEqual(by_key["shift_balances", "final_wealth"]["failures"], 0)
+        self.assertEqual(by_key["shift_balances", "history"]["failures"], 10)
+        self.assertGreater(by_key["relabel", "history"]["failures"], 0)
+        self.assertEqual(by_key["relabel", "history"]["max_divergence"], float("inf"))
+
+    def test_cases_are_reproducible(self) -> None:
+        first, second = random_cases(5, seed=9), random_cases(5, seed=9)
+        self.assertEqual([c["profile"].current_age for c in first],
+                         [c["profile"].current_age for c in second])
+
+
+if __name__ == "__main__":
+    unittest.main()
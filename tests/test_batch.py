@@ -0,0 +1,225 @@
+"""
+Unit tests for retire_plan.simulation.batch (vectorized engine).
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.metrics import TaxCalculator
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.strategies.policies import (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_smooth_with_tfsa,
+)
+from retire_plan.strategies.spending import FloorCeiling
+
+from tests.helpers import make_profile
+
+
+class TestSimulateBatch(unittest.TestCase):
+    """The batch engine must reproduce Simulator on deterministic returns."""
+
+    def _compare(self, profile, contrib, withdraw, years_working, savings, spending):
+        expected = Simulator(profile).run_full_lifecycle(
+            contrib, withdraw, years_working, savings, spending
+        )
+        years_retired = profile.end_age - profile.current_age - years_working
+        returns = ReturnModel(volatility=0.0).mean_returns(years_working, years_retired)
+        result = simulate_batch(
+            profile, contrib, withdraw, returns[None, :],
+            years_working=years_working,
+            annual_savings=savings,
+            annual_spending=spending,
+        )
+        self.assertAlmostEqual(result.final_wealth[0], expected["final_wealth"], places=4)
+        self.assertAlmostEqual(result.total_tax_paid[0], expected["total_tax_paid"], places=4)
+        self.assertAlmostEqual(result.peak_wealth[0], expected["peak_wealth"], places=4)
+        self.assertEqual(bool(result.success[0]), expected["success"])
+        if expected["ruin_age"] is not None:
+            self.assertEqual(int(result.ruin_age[0]), expected["ruin_age"])
+
+    def test_matches_simulator_when_successful(self) -> None:
+        self._compare(make_profile(35), contrib_max_tfsa_first,
+                      strategy_spend_taxable_first, 30, 28_000, 80_000)
+
+    def test_matches_simulator_when_ruined(self) -> None:
+        self._compare(make_profile(55), contrib_max_rrsp_first,
+                      strategy_spend_taxable_first, 5, 10_000, 90_000)
+
+    def test_scalar_strategy_fallback_matches_kernel(self) -> None:
+        returns = np.random.default_rng(0).normal(0.05, 0.1, size=(20, 60))
+        profile = make_profile(35)
+        fast = simulate_batch(profile, contrib_max_tfsa_first,
+                              strategy_smooth_with_tfsa, returns)
+        slow = simulate_batch(profile, contrib_max_tfsa_first,
+                              lambda state: strategy_smooth_with_tfsa(state), returns)
+        np.testing.assert_allclose(fast.final_wealth, slow.final_wealth)
+        np.testing.assert_allclose(fast.total_tax_paid, slow.total_tax_paid)
+
+    def test_record_keeps_trajectories(self) -> None:
+        returns = np.full((3, 60), 0.05)
+        result = simulate_batch(make_profile(35), contrib_max_tfsa_first,
+                                strategy_spend_taxable_first, returns, record=True)
+        self.assertEqual(result.trajectories["total_wealth"].shape, (3, 60))
+        np.testing.assert_allclose(result.trajectories["tax_paid"].sum(axis=1),
+                                   result.total_tax_paid)
+
+    def test_schedules_match_simulator(self) -> None:
+        profile = make_profile(45)
+        years_working, years_retired = 20, 30
+        acc = np.stack([np.linspace(0.08, 0.05, years_working),
+                        np.full(years_working, 0.06),
+                        np.linspace(0.07, 0.04, years_working)], axis=1)
+        dec = np.linspace(0.05, 0.03, years_retired)
+        savings = np.linspace(20_000, 40_000, years_working)
+        inflation = np.linspace(0.03, 0.02, years_retired)
+        expected = Simulator(profile).run_full_lifecycle(
+            contrib_max_rrsp_first, strategy_smooth_with_tfsa, years_working,
+            savings, 70_000, acc, dec, inflation)
+        returns = np.concatenate((acc, np.repeat(dec[:, None], 3, axis=1)))
+        result = simulate_batch(profile, contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                                returns[None], years_working, savings, 70_000, inflation)
+        self.assertEqual(result.final_wealth[0], expected["final_wealth"])
+        self.assertEqual(result.total_tax_paid[0], expected["total_tax_paid"])
+
+    def test_per_path_savings_schedule(self) -> None:
+        profile = make_profile(85)
+        savings = np.array([[0.0] * 5, [10_000.0] * 5])
+        result = simulate_batch(profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                np.zeros((2, 10)), years_working=5, annual_savings=savings,
+                                record=True)
+        wealth = result.trajectories["total_wealth"][:, 4]
+        self.assertEqual(wealth[1] - wealth[0], 50_000)
+
+    def test_death_ages_match_truncated_horizons(self) -> None:
+        profile = make_profile(55)
+        returns = np.random.default_rng(3).normal(0.05, 0.1, size=(4, 40))
+        death_ages = np.array([58, 70, 80, 94])
+        result = simulate_batch(profile, contrib_max_rrsp_first, strategy_spend_taxable_first,
+                                returns, years_working=5, annual_savings=20_000,
+                                annual_spending=60_000, death_ages=death_ages, record=True)
+        for p, death in enumerate(death_ages):
+            short = make_profile(55)
+            short.end_age = int(death) + 1
+            years = short.end_age - short.current_age
+            expected = simulate_batch(short, contrib_max_rrsp_first, strategy_spend_taxable_first,
+                                      returns[p:p + 1, :years], years_working=min(5, years),
+                                      annual_savings=20_000, annual_spending=60_000)
+            self.assertEqual(result.final_wealth[p], expected.final_wealth[0])
+            self.assertEqual(result.total_tax_paid[p], expected.total_tax_paid[0])
+            self.assertTrue(np.isnan(result.trajectories["total_wealth"][p, years:]).all())
+
+    def test_cost_base_matches_simulator(self) -> None:
+        returns = np.random.default_rng(5).normal(0.05, 0.1, size=(5, 40))
+        kwargs = dict(years_working=10, annual_savings=30_000, annual_spending=70_000)
+
+        def profile() -> PersonProfile:
+            base = make_profile(55)
+            base.taxable = TaxableAccount("Taxable", 200_000.0, cost_base=80_000.0)
+            return base
+
+        result = simulate_batch(profile(), contrib_max_rrsp_first, strategy_spend_taxable_first,
+                                returns, **kwargs)
+        for p in range(returns.shape[0]):
+            expected = Simulator(profile()).run_full_lifecycle(
+                contrib_max_rrsp_first, strategy_spend_taxable_first,
+                accumulation_return=returns[p, :10], decumulation_return=returns[p, 10:],
+                **kwargs)
+            self.assertAlmostEqual(result.final_wealth[p], expected["final_wealth"], places=4)
+            self.assertAlmostEqual(result.total_tax_paid[p], expected["total_tax_paid"], places=4)
+
+    def test_per_path_plan_inputs_match_separate_runs(self) -> None:
+        profile = make_profile(55)
+        returns = np.random.default_rng(6).normal(0.05, 0.1, size=(4, 40))
+        work = np.array([0, 5, 12, 5])
+        spending = np.array([50_000.0, 60_000.0, 70_000.0, 90_000.0])
+        start = np.array([[100_000.0, 50_000.0, 20_000.0]] * 3 + [[0.0, 0.0, 300_000.0]])
+        inflation = np.random.default_rng(7).normal(0.02, 0.01, size=(4, 40))
+        for rule in (None, FloorCeiling()):
+            result = simulate_batch(profile, contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                                    returns, years_working=work, annual_savings=20_000,
+                                    annual_spending=spending, inflation_rate=inflation,
+                                    initial_balances=start, spending_rule=rule, record=True)
+            for p in range(4):
+                single = make_profile(55)
+                single.tax_deferred.balance, single.tax_free.balance = start[p, :2]
+                single.taxable = TaxableAccount("Taxable", start[p, 2])
+                years = 40 - work[p]
+                expected = simulate_batch(single, contrib_max_rrsp_first,
+                                          strategy_smooth_with_tfsa, returns[p:p + 1],
+                                          years_working=int(work[p]), annual_savings=20_000,
+                                          annual_spending=float(spending[p]),
+                                          inflation_rate=inflation[p, :years],
+                                          spending_rule=rule, record=True)
+                self.assertEqual(result.final_wealth[p], expected.final_wealth[0])
+                self.assertEqual(result.total_tax_paid[p], expected.total_tax_paid[0])
+                np.testing.assert_array_equal(result.ruin_age[p], expected.ruin_age[0])
+                np.testing.assert_array_equal(result.trajectories["spending"][p],
+                                              expected.trajectories["spending"][0])
+
+    def test_start_years_resume_from_checkpoint(self) -> None:
+        profile = make_profile(55)
+        profile.taxable = TaxableAccount("Taxable", 50_000.0, cost_base=30_000.0)
+        returns = np.random.default_rng(8).normal(0.05, 0.1, size=(3, 40))
+        kwargs = dict(years_working=10, annual_savings=20_000, annual_spending=60_000)
+        full = simulate_batch(profile, contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                              returns, record=True, **kwargs)
+        traj = full.trajectories
+        resumed = simulate_batch(profile, contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                                 returns, initial_balances=traj["end_balances"][:, 9],
+                                 initial_cost_base=traj["cost_base"][:, 9],
+                                 start_years=np.full(3, 10), **kwargs)
+        np.testing.assert_array_equal(resumed.final_wealth, full.final_wealth)
+        np.testing.assert_array_equal(resumed.total_tax_paid, full.total_tax_paid)
+
+    def test_per_path_years_working_within_horizon(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            simulate_batch(make_profile(55), contrib_max_tfsa_first,
+                           strategy_spend_taxable_first, np.zeros((2, 40)),
+                           years_working=np.array([5, 41]))
+
+    def test_wrong_return_shape_raises(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            simulate_batch(make_profile(35), contrib_max_tfsa_first,
+                           strategy_spend_taxable_first, np.zeros((2, 10)))
+
+
+class TestTaxOnArray(unittest.TestCase):
+
+    def test_matches_scalar_tax(self) -> None:
+        calc = TaxCalculator(province="BC")
+        incomes = np.array([-5.0, 0.0, 20_000.0, 57_000.0, 150_000.0, 400_000.0])
+        expected = [calc.tax_on(x) if x > 0 else 0.0 for x in incomes]
+        np.testing.assert_allclose(calc.tax_on_array(incomes), expected)
+
+    def test_gross_for_net_inverts_tax(self) -> None:
+        calc = TaxCalculator(province="QC", indexation_rate=0.03)
+        net = np.array([0.0, 10_000.0, 45_000.0, 150_000.0, 2_000_000.0])
+        for year in (0, 25):
+            gross = calc.gross_for_net_array(net, year)
+            np.testing.assert_allclose(gross - calc.tax_on_array(gross, year), net, atol=1e-6)
+        self.assertEqual(calc.gross_for_net(45_000.0), calc.gross_for_net_array(45_000.0))
+
+    def test_indexed_brackets_match_simulator(self) -> None:
+        calc = TaxCalculator(indexation_rate=0.02)
+        profile = make_profile(55)
+        expected = Simulator(profile, calc).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, 10, 20_000, 70_000)
+        returns = ReturnModel(volatility=0.0).mean_returns(10, 30)
+        result = simulate_batch(profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                returns[None], 10, 20_000, 70_000, tax_calculator=calc)
+        self.assertEqual(result.total_tax_paid[0], expected["total_tax_paid"])
+        frozen = Simulator(profile).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, 10, 20_000, 70_000)
+        self.assertLess(expected["total_tax_paid"], frozen["total_tax_paid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for CPP/OAS start ages (retire_plan.accounts.benefits) and
+retire_plan.simulation.benefits.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.benefits import cpp_adjustment, oas_adjustment
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.benefits import optimize_benefit_start
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestAdjustmentFactors(unittest.TestCase):
+
+    def test_statutory_factors(self) -> None:
+        self.assertAlmostEqual(cpp_adjustment(60), 0.64)
+        self.assertAlmostEqual(cpp_adjustment(65), 1.0)
+        self.assertAlmostEqual(cpp_adjustment(70), 1.42)
+        self.assertAlmostEqual(oas_adjustment(65), 1.0)
+        self.assertAlmostEqual(oas_adjustment(70), 1.36)
+        np.testing.assert_allclose(cpp_adjustment(np.array([60, 66])), [0.64, 1.084])
+
+    def test_out_of_range_start_age(self) -> None:
+        with self.assertRaises(ValueError):
+            cpp_adjustment(59)
+        with self.assertRaises(ValueError):
+            oas_adjustment(64)
+        with self.assertRaises(ValueError):
+            make_profile(oas_start_age=71)
+
+
+class TestProfileBenefits(unittest.TestCase):
+
+    def test_default_keeps_flat_benefits(self) -> None:
+        profile = make_profile()
+        self.assertEqual(profile.cpp_income(50), 12_000.0)
+        self.assertEqual(profile.annual_gov_benefits(), 20_000.0)
+
+    def test_start_age_delays_and_scales(self) -> None:
+        profile = make_profile(cpp_start_age=70, oas_start_age=67)
+        self.assertEqual(profile.cpp_income(69), 0.0)
+        self.assertAlmostEqual(profile.cpp_income(70), 12_000.0 * 1.42)
+        self.assertEqual(profile.annual_gov_benefits(66), 0.0)
+        self.assertAlmostEqual(profile.annual_gov_benefits(67), 8_000.0 * 1.144)
+
+    def test_simulator_pays_from_start_age(self) -> None:
+        sim = Simulator(make_profile(cpp_start_age=62, oas_start_age=65))
+        outcome = sim.run_full_lifecycle(contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                         years_working=5, annual_savings=20_000,
+                                         annual_spending=40_000)
+        retired = [r for r in outcome["history"] if r["phase"] == "decumulation"]
+        by_age = {r["age"]: r for r in retired}
+        self.assertAlmostEqual(by_age[60]["gross_withdrawal"], 40_000.0)
+        self.assertAlmostEqual(by_age[62]["gross_withdrawal"],
+                               by_age[62]["spending"] - 12_000.0 * 0.784)
+
+
+class TestOptimizeBenefitStart(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kwargs = dict(years_working=5, annual_savings=20_000, annual_spending=40_000)
+
+    def test_grid_matches_simulator(self) -> None:
+        rows = optimize_benefit_start(make_profile(), contrib_max_tfsa_first,
+                                      strategy_spend_taxable_first,
+                                      cpp_ages=(60, 65, 70), oas_ages=(65, 70), **self.kwargs)
+        self.assertEqual(len(rows), 6)
+        wealth = [r["final_wealth"] for r in rows]
+        self.assertEqual(wealth, sorted(wealth, reverse=True))
+        for row in rows:
+            profile = make_profile(cpp_start_age=row["cpp_start_age"],
+                                   oas_start_age=row["oas_start_age"])
+            expected = Simulator(profile).run_full_lifecycle(
+                contrib_max_tfsa_first, strategy_spend_taxable_first, **self.kwargs)
+            self.assertAlmostEqual(row["final_wealth"], expected["final_wealth"], places=4)
+            self.assertAlmostEqual(row["total_tax_paid"], expected["total_tax_paid"], places=4)
+
+    def test_default_grid_is_every_legal_pair(self) -> None:
+        rows = optimize_benefit_start(make_profile(), contrib_max_tfsa_first,
+                                      strategy_spend_taxable_first, **self.kwargs)
+        self.assertEqual(len({(r["cpp_start_age"], r["oas_start_age"]) for r in rows}), 66)
+
+    def test_stochastic_shares_scenarios(self) -> None:
+        rows = optimize_benefit_start(make_profile(), contrib_max_tfsa_first,
+                                      strategy_spend_taxable_first,
+                                      cpp_ages=(65,), oas_ages=(65,), return_model=ReturnModel(),
+                                      n_paths=50, seed=3, objective="total_tax_paid",
+                                      **self.kwargs)
+        returns = ReturnModel().sample(50, 5, 35, np.random.default_rng(3))
+        batch = simulate_batch(make_profile(cpp_start_age=65, oas_start_age=65),
+                               contrib_max_tfsa_first, strategy_spend_taxable_first,
+                               returns, **self.kwargs)
+        self.assertAlmostEqual(rows[0]["total_tax_paid"], batch.total_tax_paid.mean())
+
+    def test_inflation_schedule(self) -> None:
+        inflation = np.linspace(0.0, 0.05, 35)
+        for n_paths in (None, 20):
+            rows = optimize_benefit_start(make_profile(), contrib_max_tfsa_first,
+                                          strategy_spend_taxable_first,
+                                          cpp_ages=(60, 70), oas_ages=(65,),
+                                          return_model=ReturnModel(), n_paths=n_paths, seed=4,
+                                          inflation_rate=inflation, **self.kwargs)
+            years_retired = 35
+            if n_paths is None:
+                returns = ReturnModel().mean_returns(5, years_retired)[None]
+            else:
+                returns = ReturnModel().sample(n_paths, 5, years_retired, np.random.default_rng(4))
+            for row in rows:
+                profile = make_profile(cpp_start_age=row["cpp_start_age"], oas_start_age=65)
+                batch = simulate_batch(profile, contrib_max_tfsa_first,
+                                       strategy_spend_taxable_first, returns,
+                                       inflation_rate=inflation, **self.kwargs)
+                self.assertAlmostEqual(row["final_wealth"], batch.final_wealth.mean(), places=4)
+
+    def test_per_path_start_ages_in_batch(self) -> None:
+        returns = np.full((2, 40), 0.05)
+        batch = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, returns,
+                               cpp_start_age=np.array([60, 70]), **self.kwargs)
+        self.assertNotEqual(batch.final_wealth[0], batch.final_wealth[1])
+        with self.assertRaises(SimulationConfigError):
+            simulate_batch(make_profile(), contrib_max_tfsa_first,
+                           strategy_spend_taxable_first, returns,
+                           cpp_start_age=np.array([60, 75]), **self.kwargs)
+
+    def test_unknown_objective(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            optimize_benefit_start(make_profile(), contrib_max_tfsa_first,
+                                   strategy_spend_taxable_first, objective="fun")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit tests for retire_plan.simulation.chunked.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.chunked import run_chunked
+from retire_plan.simulation.engine import SimulationConfigError
+from retire_plan.simulation.montecarlo import summarize_paths
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestRunChunked(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.profile = make_profile(45, 90)
+        self.kwargs = dict(years_working=20, annual_savings=25_000, annual_spending=75_000,
+                           seed=3)
+
+    def _run(self, **kwargs):
+        return run_chunked(self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                           n_paths=1_000, **self.kwargs, **kwargs)
+
+    def test_float64_chunks_match_one_batch(self) -> None:
+        chunked = self._run(chunk_size=128, dtype=np.float64, record=True)
+        returns = ReturnModel().sample(1_000, 20, 25, np.random.default_rng(3))
+        whole = simulate_batch(self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                               returns, 20, 25_000, 75_000, record=True)
+        np.testing.assert_array_equal(chunked.final_wealth, whole.final_wealth)
+        np.testing.assert_array_equal(chunked.ruin_age, whole.ruin_age)
+        np.testing.assert_array_equal(chunked.trajectories["age"], whole.trajectories["age"])
+        np.testing.assert_array_equal(chunked.trajectories["tax_paid"],
+                                      whole.trajectories["tax_paid"])
+
+    def test_float32_summary_within_tolerance(self) -> None:
+        single = summarize_paths(self._run(chunk_size=300))
+        double = summarize_paths(self._run(chunk_size=300, dtype=np.float64))
+        self.assertEqual(single["success"], double["success"])
+        for key in ("final_wealth", "total_tax_paid", "peak_wealth"):
+            self.assertAlmostEqual(single[key] / double[key], 1.0, places=5)
+
+    def test_spill_to_memmaps(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = self._run(chunk_size=400, spill_dir=tmp, record=True)
+            self.assertIsInstance(result.final_wealth, np.memmap)
+            self.assertEqual(result.trajectories["end_balances"].dtype, np.float32)
+            reloaded = np.load(os.path.join(tmp, "final_wealth.npy"), mmap_mode="r")
+            np.testing.assert_array_equal(reloaded, result.final_wealth)
+            wealth = np.load(os.path.join(tmp, "trajectory_total_wealth.npy"), mmap_mode="r")
+            self.assertEqual(wealth.shape, (1_000, 45))
+            del result, reloaded, wealth
+
+    def test_invalid_sizes(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            self._run(chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -68,3 +68,151 @@ class TestSimulator(unittest.TestCase):
             )
 
         
+
+
+class TestSchedules(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = PersonProfile(
+            name="Glide", current_age=60, end_age=70,
+            tax_deferred=TaxDeferredAccount("RRSP", 100_000),
+            tax_free=TaxFreeAccount("TFSA", 50_000),
+            taxable=TaxableAccount("Savings", 20_000),
+            cpp_annual=10_000, oas_annual=7_000,
+        )
+
+    def test_constant_schedule_matches_scalar(self):
+        scalar = Simulator(self.profile).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first,
+            years_working=5, annual_savings=20_000, annual_spending=40_000)
+        scheduled = Simulator(self.profile).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first,
+            years_working=5, annual_savings=[20_000] * 5, annual_spending=40_000,
+            accumulation_return=[0.07] * 5, decumulation_return=[[0.05] * 3] * 5,
+            inflation_rate=[0.02] * 5)
+        self.assertEqual(scalar["final_wealth"], scheduled["final_wealth"])
+        self.assertEqual(scalar["total_tax_paid"], scheduled["total_tax_paid"])
+
+    def test_per_account_returns(self):
+        sim = Simulator(self.profile)
+        sim.run_accumulation(contrib_max_tfsa_first, 2, annual_savings=[0, 0],
+                             return_rate=[[0.10, 0.0, -0.10], [0.10, 0.0, -0.10]])
+        self.assertAlmostEqual(sim.profile.tax_deferred.balance, 121_000)
+        self.assertAlmostEqual(sim.profile.tax_free.balance, 50_000)
+        self.assertAlmostEqual(sim.profile.taxable.balance, 16_200)
+
+    def test_yearly_savings_and_inflation(self):
+        sim = Simulator(self.profile)
+        sim.run_accumulation(contrib_max_tfsa_first, 2, annual_savings=[1_000, 3_000],
+                             return_rate=0.0)
+        self.assertEqual(sim.profile.tax_free.balance, 54_000)
+        sim.run_decumulation(strategy_spend_taxable_first, annual_spending=30_000,
+                             inflation_rate=[0.0, 0.10] + [0.0] * 6)
+        spending = [r["spending"] for r in sim.history if r["phase"] == "decumulation"]
+        self.assertEqual(spending[:3], [30_000, 30_000, 33_000])
+
+    def test_wrong_schedule_length_raises(self):
+        with self.assertRaises(ValueError):
+            Simulator(self.profile).run_accumulation(
+                contrib_max_tfsa_first, 3, return_rate=[0.05, 0.06])
+        with self.assertRaises(ValueError):
+            Simulator(self.profile).run_accumulation(
+                contrib_max_tfsa_first, 2, annual_savings=[1_000, -1])
+
+
+class TestOptimizeTopK(unittest.TestCase):
+    """Simulator.optimize keeps histories only for the best candidates."""
+
+    def setUp(self):
+        from retire_plan.strategies.policies import (
+            contrib_max_rrsp_first, strategy_spend_rrsp_first, strategy_smooth_with_tfsa,
+        )
+        self.profile = PersonProfile(
+            name="Grid", current_age=40, end_age=90,
+            tax_deferred=TaxDeferredAccount("RRSP", 80000),
+            tax_free=TaxFreeAccount("TFSA", 20000),
+            taxable=TaxableAccount("Savings", 10000),
+            cpp_annual=10000, oas_annual=7000,
+        )
+        self.contribs = [("TFSA", contrib_max_tfsa_first), ("RRSP", contrib_max_rrsp_first)]
+        self.withdrawals = [("Taxable", strategy_spend_taxable_first),
+                            ("RRSP", strategy_spend_rrsp_first),
+                            ("Smooth", strategy_smooth_with_tfsa)]
+
+    def test_top_k_keeps_history_for_best_only(self):
+        full = Simulator.optimize(self.profile, self.contribs, self.withdrawals, years_working=20)
+        bounded = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                     years_working=20, top_k=2)
+        self.assertEqual(len(bounded), len(full))
+        self.assertEqual([r["total_tax_paid"] for r in bounded],
+                         [r["total_tax_paid"] for r in full])
+        self.assertEqual(["history" in r for r in bounded], [True, True] + [False] * 4)
+        self.assertEqual(bounded[0]["history"], full[0]["history"])
+
+    def test_objective_orders_results(self):
+        results = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                     years_working=20, top_k=1,
+                                     objective=lambda r: -r["final_wealth"])
+        wealth = [r["final_wealth"] for r in results]
+        self.assertEqual(wealth, sorted(wealth, reverse=True))
+        self.assertIn("history", results[0])
+
+    def test_negative_top_k_raises(self):
+        with self.assertRaises(ValueError):
+            Simulator.optimize(self.profile, self.contribs, self.withdrawals, top_k=-1)
+
+
+class TestOptimizePruning(unittest.TestCase):
+    """Branch-and-bound pruning keeps the winner and the trade-off frontier."""
+
+    def setUp(self):
+        from functools import partial
+        from retire_plan.strategies.policies import contrib_max_rrsp_first
+
+        def rrsp_fraction(frac, state):
+            need = max(state["target_net_cash"] - state["cpp_income"] - state["oas_income"], 0)
+            bal = state["balances"]
+            td = min(need, frac * bal["tax_deferred"])
+            tx = min(need - td, bal["taxable"])
+            tf = min(need - td - tx, bal["tax_free"])
+            return {"tax_deferred": td, "taxable": tx, "tax_free": tf}
+
+        self.profile = PersonProfile(
+            name="Prune", current_age=40, end_age=95,
+            tax_deferred=TaxDeferredAccount("RRSP", 300000),
+            tax_free=TaxFreeAccount("TFSA", 50000),
+            taxable=TaxableAccount("Savings", 20000),
+            cpp_annual=12000, oas_annual=8000,
+        )
+        self.contribs = [("TFSA", contrib_max_tfsa_first), ("RRSP", contrib_max_rrsp_first)]
+        self.withdrawals = [(f"{f}%", partial(rrsp_fraction, f / 100)) for f in range(0, 20)]
+
+    def test_prune_keeps_best_and_frontier(self):
+        kwargs = dict(years_working=25, annual_spending=90000)
+        full = Simulator.optimize(self.profile, self.contribs, self.withdrawals, **kwargs)
+        pruned = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                    prune=True, **kwargs)
+        self.assertLess(len(pruned), len(full))
+        self.assertEqual(pruned[0]["total_tax_paid"], full[0]["total_tax_paid"])
+
+        kept = {(r["contrib_strategy"], r["withdraw_strategy"]) for r in pruned}
+        for r in full:
+            dominated = any(o["total_tax_paid"] < r["total_tax_paid"]
+                            and o["final_wealth"] > r["final_wealth"] for o in full)
+            if not dominated:
+                self.assertIn((r["contrib_strategy"], r["withdraw_strategy"]), kept)
+
+    def test_prune_uses_retirement_assumptions(self):
+        kwargs = dict(years_working=25, annual_spending=90000, inflation_rate=0.03,
+                      decumulation_return=[[0.02, 0.04, 0.01]] * 30)
+        full = Simulator.optimize(self.profile, self.contribs, self.withdrawals, **kwargs)
+        pruned = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                    prune=True, **kwargs)
+        self.assertEqual(pruned[0], full[0])
+        self.assertNotEqual(full[0]["total_tax_paid"],
+                            Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                               years_working=25,
+                                               annual_spending=90000)[0]["total_tax_paid"])
+        by_pair = {(r["contrib_strategy"], r["withdraw_strategy"]): r for r in full}
+        for r in pruned:
+            self.assertEqual(r, by_pair[r["contrib_strategy"], r["withdraw_strategy"]])
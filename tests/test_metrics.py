@@ -26,12 +26,46 @@ class TestMetrics(unittest.TestCase):
         rate300k = self.calc.effective_rate(300000)
 
         # Realistic Canadian effective rates (2025 brackets + ON tax)
-        self.assertGreater(rate40k, 0.22)      # ~26-28%
+        self.assertGreater(rate40k, 0.18)      # ~20% (15% federal + 5.05% ON)
         self.assertLess(rate40k, 0.35)
-        self.assertGreater(rate150k, 0.30)     # ~31-32%
+        self.assertGreater(rate150k, 0.25)     # ~28%
         self.assertLess(rate150k, 0.40)
-        self.assertGreater(rate300k, 0.35)     # ~36.3% → this is correct!
-        self.assertLess(rate300k, 0.45)        # marginal hits ~44.5%, effective stays under 45%
+        self.assertGreater(rate300k, 0.33)     # ~35.3%
+        self.assertLess(rate300k, 0.45)        # marginal hits ~46.2%, effective stays under 45%
+
+    def test_provincial_brackets(self):
+        print("    Running test_provincial_brackets")
+        federal = 57_000 * 0.15 + 3_000 * 0.205
+        # Ontario: 5.05% on the first 52,886, 9.15% above
+        self.assertAlmostEqual(self.calc.tax_on(60_000),
+                               federal + 52_886 * 0.0505 + 7_114 * 0.0915, places=6)
+        # Unknown provinces fall back to a flat 12%
+        self.assertAlmostEqual(TaxCalculator(province="XX").tax_on(60_000),
+                               federal + 0.12 * 60_000, places=6)
+
+    def test_indexed_schedule(self):
+        print("    Running test_indexed_schedule")
+        calc = TaxCalculator(province="ON", indexation_rate=0.02)
+        schedule = calc.schedule(30)
+        self.assertEqual(schedule.thresholds.shape[0], 30)
+        self.assertAlmostEqual(schedule.thresholds[10, 1] / schedule.thresholds[0, 1], 1.02 ** 10)
+        # Same real income pays the same real tax once brackets are indexed
+        self.assertAlmostEqual(calc.tax_on(80_000 * 1.02 ** 10, year=10) / 1.02 ** 10,
+                               calc.tax_on(80_000), places=6)
+        self.assertGreater(self.calc.tax_on(80_000 * 1.02 ** 10, year=10) / 1.02 ** 10,
+                           calc.tax_on(80_000))
+        self.assertIs(calc.schedule(20), schedule)
+
+    def test_schedule_follows_changed_settings(self):
+        print("    Running test_schedule_follows_changed_settings")
+        calc = TaxCalculator(province="ON")
+        ontario = calc.tax_on(60_000)
+        calc.province = "QC"
+        self.assertEqual(calc.tax_on(60_000), TaxCalculator(province="QC").tax_on(60_000))
+        self.assertGreater(calc.tax_on(60_000), ontario)
+        calc.indexation_rate = [0.02] * 9
+        self.assertEqual(calc.tax_on(100_000, year=9),
+                         TaxCalculator(province="QC", indexation_rate=0.02).tax_on(100_000, year=9))
 
     def test_shortfall_and_efficiency(self):
         print("    Running test_shortfall_and_efficiency")
@@ -0,0 +1,319 @@
+"""
+Unit tests for retire_plan.simulation.montecarlo.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.montecarlo import (
+    deterministic_flows,
+    race_strategies,
+    replay_flows,
+    run_monte_carlo,
+)
+from retire_plan.simulation.mortality import MortalityTable
+from retire_plan.simulation.scenarios import MultiAssetModel, ReturnModel
+from retire_plan.strategies.policies import (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_spend_rrsp_first,
+    strategy_smooth_with_tfsa,
+)
+
+
+class TestRunMonteCarlo(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.profile = PersonProfile(
+            name="MC",
+            current_age=35,
+            end_age=95,
+            tax_deferred=TaxDeferredAccount("RRSP", 100_000.0),
+            tax_free=TaxFreeAccount("TFSA", 50_000.0),
+            taxable=TaxableAccount("Taxable", 20_000.0),
+            cpp_annual=12_000.0,
+            oas_annual=8_000.0,
+        )
+
+    def test_outcome_keys_extend_full_lifecycle(self) -> None:
+        out = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                              strategy_spend_taxable_first, block_size=200,
+                              max_paths=400, seed=1)
+        for key in ("final_wealth", "total_tax_paid", "ruin_age", "success", "peak_wealth"):
+            self.assertIn(key, out)
+        lo, hi = out["confidence_interval"]["success"]
+        self.assertLessEqual(lo, out["success"])
+        self.assertGreaterEqual(hi, out["success"])
+        lo, hi = out["confidence_interval"]["final_wealth"]
+        self.assertLessEqual(lo, out["final_wealth"])
+        self.assertGreaterEqual(hi, out["final_wealth"])
+
+    def test_stops_at_max_paths_when_targets_unreachable(self) -> None:
+        out = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                              strategy_spend_taxable_first,
+                              target_success_stderr=0.0, block_size=100,
+                              max_paths=300, seed=2)
+        self.assertEqual(out["n_paths"], 300)
+        self.assertFalse(out["converged"])
+
+    def test_converges_early_with_loose_targets(self) -> None:
+        out = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                              strategy_spend_taxable_first,
+                              target_success_stderr=0.5, target_wealth_rel_stderr=1.0,
+                              block_size=100, max_paths=10_000, seed=3)
+        self.assertTrue(out["converged"])
+        self.assertEqual(out["n_paths"], 100)
+
+    def test_zero_volatility_matches_deterministic_run(self) -> None:
+        expected = Simulator(self.profile).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first)
+        out = Simulator(self.profile).run_monte_carlo(
+            contrib_max_tfsa_first, strategy_spend_taxable_first,
+            return_model=ReturnModel(volatility=0.0), block_size=10, max_paths=10)
+        self.assertAlmostEqual(out["final_wealth"], expected["final_wealth"], places=4)
+        self.assertEqual(out["success"], 1.0)
+
+    def test_invalid_budget_raises(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                            strategy_spend_taxable_first, time_budget=0)
+
+    def test_replayed_mean_path_equals_deterministic_wealth(self) -> None:
+        mean = ReturnModel().mean_returns(35, 25)
+        flows, final_wealth = deterministic_flows(
+            self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first, mean)
+        replayed = replay_flows(np.array([100_000.0, 50_000.0, 20_000.0]), flows, mean[None, :])
+        self.assertAlmostEqual(replayed[0], final_wealth, places=2)
+
+    def test_control_variate_reduces_stderr(self) -> None:
+        kwargs = dict(annual_spending=110_000, block_size=2_000, max_paths=4_000,
+                      target_success_stderr=0.0, seed=4)
+        plain = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                                strategy_spend_taxable_first, **kwargs)
+        reduced = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                                  strategy_spend_taxable_first,
+                                  variance_reduction=("antithetic", "control_variate"),
+                                  **kwargs)
+        self.assertLess(reduced["stderr"]["peak_wealth"], plain["stderr"]["peak_wealth"] / 3)
+        self.assertEqual(reduced["variance_reduction"], ["antithetic", "control_variate"])
+
+    def test_halton_runs_in_blocks(self) -> None:
+        out = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                              strategy_spend_taxable_first, variance_reduction="halton",
+                              target_success_stderr=0.0, block_size=200, max_paths=600, seed=5)
+        self.assertEqual(out["n_paths"], 600)
+        self.assertTrue(0.0 <= out["success"] <= 1.0)
+
+    def test_unknown_variance_reduction_raises(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                            strategy_spend_taxable_first, variance_reduction="importance")
+        with self.assertRaises(SimulationConfigError):
+            run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                            strategy_spend_taxable_first,
+                            variance_reduction=("halton", "sobol"))
+
+    def test_multi_asset_model_draws_inflation(self) -> None:
+        kwargs = dict(block_size=200, max_paths=400, seed=4)
+        calm = run_monte_carlo(self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                               return_model=MultiAssetModel(inflation_volatility=1e-9), **kwargs)
+        wild = run_monte_carlo(self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                               return_model=MultiAssetModel(inflation_volatility=0.03), **kwargs)
+        self.assertEqual(calm["n_paths"], 400)
+        self.assertNotEqual(calm["final_wealth"], wild["final_wealth"])
+        with self.assertRaises(SimulationConfigError):
+            run_monte_carlo(self.profile, contrib_max_tfsa_first, strategy_spend_taxable_first,
+                            return_model=MultiAssetModel(rebalance=False),
+                            variance_reduction="control_variate", **kwargs)
+
+    def test_mortality_weighted_success(self) -> None:
+        kwargs = dict(block_size=500, max_paths=1_000, seed=6, annual_spending=95_000)
+        fixed = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                                strategy_spend_taxable_first, **kwargs)
+        mortal = run_monte_carlo(self.profile, contrib_max_tfsa_first,
+                                 strategy_spend_taxable_first,
+                                 mortality=MortalityTable.gompertz(), **kwargs)
+        self.assertEqual(mortal["mortality_weighted_success"], mortal["success"])
+        # Fewer people live long enough to run out of money
+        self.assertGreater(mortal["success"], fixed["success"])
+        self.assertLess(mortal["median_death_age"], self.profile.end_age)
+
+
+class TestOptimizeStochastic(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.profile = PersonProfile(
+            name="CRN",
+            current_age=45,
+            end_age=90,
+            tax_deferred=TaxDeferredAccount("RRSP", 150_000.0),
+            tax_free=TaxFreeAccount("TFSA", 40_000.0),
+            taxable=TaxableAccount("Taxable", 30_000.0),
+            cpp_annual=12_000.0,
+            oas_annual=8_000.0,
+        )
+        self.contribs = [("TFSA-First", contrib_max_tfsa_first),
+                         ("RRSP-First", contrib_max_rrsp_first)]
+        self.withdrawals = [("Taxable-First", strategy_spend_taxable_first),
+                            ("Smooth", strategy_smooth_with_tfsa)]
+
+    def _optimize(self, **kwargs):
+        return Simulator.optimize(
+            self.profile, self.contribs, self.withdrawals,
+            years_working=20, annual_savings=25_000, annual_spending=70_000,
+            return_model=ReturnModel(), n_paths=300, seed=11, **kwargs)
+
+    def test_sorted_by_mean_tax_with_paired_differences(self) -> None:
+        results = self._optimize()
+        self.assertEqual(len(results), 4)
+        taxes = [r["total_tax_paid"] for r in results]
+        self.assertEqual(taxes, sorted(taxes))
+        best = results[0]["paired_vs_best"]["total_tax_paid"]
+        self.assertEqual(best["difference"], 0.0)
+        for r in results[1:]:
+            diff = r["paired_vs_best"]["total_tax_paid"]["difference"]
+            self.assertAlmostEqual(diff, r["total_tax_paid"] - results[0]["total_tax_paid"], places=4)
+
+    def test_shared_memory_workers_match_in_process(self) -> None:
+        local = self._optimize()
+        pooled = self._optimize(workers=2)
+        self.assertEqual([(r["contrib_strategy"], r["withdraw_strategy"]) for r in local],
+                         [(r["contrib_strategy"], r["withdraw_strategy"]) for r in pooled])
+        for a, b in zip(local, pooled):
+            self.assertEqual(a["total_tax_paid"], b["total_tax_paid"])
+            self.assertEqual(a["success"], b["success"])
+
+    def test_rejects_unused_options(self) -> None:
+        for options in ({"prun": True}, {"topk": 3}, {"n_paths": 500}):
+            with self.assertRaises(SimulationConfigError):
+                Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                   years_working=20, **options)
+        with self.assertRaises(SimulationConfigError):
+            self._optimize(n_path=500)
+        with self.assertRaises(SimulationConfigError):
+            self._optimize(initial_paths=100)
+        with self.assertRaises(SimulationConfigError):
+            self._optimize(successive_halving=True, workers=2)
+
+    def test_multi_asset_model_shares_inflation_paths(self) -> None:
+        model = MultiAssetModel(inflation_volatility=0.03)
+        kwargs = dict(years_working=20, annual_savings=25_000, annual_spending=70_000,
+                      return_model=model, n_paths=300, seed=11)
+        results = Simulator.optimize(self.profile, self.contribs, self.withdrawals, **kwargs)
+        pooled = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                    workers=2, **kwargs)
+        self.assertEqual([r["total_tax_paid"] for r in results],
+                         [r["total_tax_paid"] for r in pooled])
+        returns, inflation = model.sample_scenarios(300, 20, 25, np.random.default_rng(11))
+        for r in results:
+            contrib = dict(self.contribs)[r["contrib_strategy"]]
+            withdraw = dict(self.withdrawals)[r["withdraw_strategy"]]
+            batch = simulate_batch(self.profile, contrib, withdraw, returns,
+                                   years_working=20, annual_savings=25_000,
+                                   annual_spending=70_000, inflation_rate=inflation)
+            self.assertAlmostEqual(r["total_tax_paid"], batch.total_tax_paid.mean(), places=6)
+
+    def test_deterministic_optimize_unchanged(self) -> None:
+        results = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                     years_working=20)
+        self.assertIn("history", results[0])
+        self.assertNotIn("paired_vs_best", results[0])
+
+
+class TestRaceStrategies(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.profile = PersonProfile(
+            name="Race",
+            current_age=45,
+            end_age=90,
+            tax_deferred=TaxDeferredAccount("RRSP", 250_000.0),
+            tax_free=TaxFreeAccount("TFSA", 40_000.0),
+            taxable=TaxableAccount("Taxable", 30_000.0),
+            cpp_annual=12_000.0,
+            oas_annual=8_000.0,
+        )
+        self.contribs = [("TFSA-First", contrib_max_tfsa_first),
+                         ("RRSP-First", contrib_max_rrsp_first)]
+        self.withdrawals = [("Taxable-First", strategy_spend_taxable_first),
+                            ("RRSP-First", strategy_spend_rrsp_first),
+                            ("Smooth", strategy_smooth_with_tfsa)]
+
+    def _race(self, **kwargs):
+        return race_strategies(self.profile, self.contribs, self.withdrawals,
+                               years_working=20, annual_savings=25_000,
+                               annual_spending=80_000, initial_paths=100,
+                               max_paths=800, seed=5, **kwargs)
+
+    def test_halving_spends_paths_on_survivors(self) -> None:
+        results = self._race()
+        self.assertEqual(len(results), 6)
+        self.assertIsNone(results[0]["eliminated_in_round"])
+        rounds = [r["eliminated_in_round"] for r in results[1:]]
+        self.assertEqual(rounds, sorted(rounds, reverse=True))
+        # Round 0 drops half the field on the smallest budget
+        self.assertEqual(rounds.count(0), 3)
+        for r in results:
+            if r["eliminated_in_round"] == 0:
+                self.assertEqual(r["n_paths"], 100)
+        self.assertGreater(results[0]["n_paths"], 100)
+
+    def test_winner_has_confidence_against_runner_up(self) -> None:
+        results = self._race()
+        conf = results[0]["confidence"]
+        self.assertEqual(conf["runner_up"],
+                         (results[1]["contrib_strategy"], results[1]["withdraw_strategy"]))
+        self.assertGreaterEqual(conf["difference"], 0.0)
+        self.assertGreater(conf["probability_best"], 0.5)
+        self.assertLessEqual(conf["probability_best"], 1.0)
+
+    def test_multi_asset_model(self) -> None:
+        results = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                     years_working=20, annual_savings=25_000,
+                                     annual_spending=80_000, return_model=MultiAssetModel(),
+                                     n_paths=400, seed=5, successive_halving=True,
+                                     initial_paths=100)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0]["n_paths"], 400)
+        fixed = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                   years_working=20, annual_savings=25_000,
+                                   annual_spending=80_000,
+                                   return_model=MultiAssetModel(inflation_volatility=1e-9),
+                                   n_paths=400, seed=5, successive_halving=True,
+                                   initial_paths=100)
+        self.assertNotEqual([r["total_tax_paid"] for r in results],
+                            [r["total_tax_paid"] for r in fixed])
+
+    def test_winner_matches_full_crn_optimize(self) -> None:
+        raced = self._race()
+        full = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                  years_working=20, annual_savings=25_000,
+                                  annual_spending=80_000, return_model=ReturnModel(),
+                                  n_paths=800, seed=5)
+        self.assertEqual(
+            (raced[0]["contrib_strategy"], raced[0]["withdraw_strategy"]),
+            (full[0]["contrib_strategy"], full[0]["withdraw_strategy"]))
+
+    def test_optimize_dispatches_to_halving(self) -> None:
+        results = Simulator.optimize(self.profile, self.contribs, self.withdrawals,
+                                     years_working=20, annual_savings=25_000,
+                                     annual_spending=80_000, return_model=ReturnModel(),
+                                     n_paths=800, seed=5, successive_halving=True,
+                                     initial_paths=100)
+        self.assertEqual(results, self._race())
+
+    def test_invalid_options(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            self._race(keep_fraction=1.0)
+        with self.assertRaises(SimulationConfigError):
+            self._race(objective="median")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for retire_plan.simulation.mortality.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.engine import SimulationConfigError
+from retire_plan.simulation.mortality import MortalityTable
+
+
+class TestMortalityTable(unittest.TestCase):
+
+    def test_gompertz_default_is_plausible(self) -> None:
+        table = MortalityTable.gompertz()
+        self.assertEqual(table.max_age, 110)
+        self.assertAlmostEqual(table.life_expectancy(65), 20.4, delta=1.0)
+        self.assertTrue((np.diff(table.qx) > 0).all())
+
+    def test_survival_curve(self) -> None:
+        table = MortalityTable(60, [0.1, 0.5, 1.0])
+        np.testing.assert_allclose(table.survival(60), [1.0, 0.9, 0.45, 0.0])
+        np.testing.assert_allclose(table.survival(61), [1.0, 0.5, 0.0])
+        with self.assertRaises(SimulationConfigError):
+            table.survival(63)
+
+    def test_sampled_death_ages_follow_table(self) -> None:
+        table = MortalityTable(60, [0.1, 0.5, 1.0])
+        ages = table.sample_death_ages(100_000, 60, np.random.default_rng(0))
+        self.assertEqual(set(np.unique(ages)), {60, 61, 62})
+        np.testing.assert_allclose(np.bincount(ages - 60) / ages.size, [0.1, 0.45, 0.45],
+                                   atol=0.01)
+
+    def test_from_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.csv")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("age,qx\n71,0.5\n70,0.25\n72,1\n")
+            table = MortalityTable.from_csv(path)
+            self.assertEqual(table.start_age, 70)
+            np.testing.assert_allclose(table.qx, [0.25, 0.5, 1.0])
+
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("age,qx\n70,0.25\n72,1\n")
+            with self.assertRaises(SimulationConfigError):
+                MortalityTable.from_csv(path)
+
+    def test_invalid_probabilities(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            MortalityTable(60, [0.1, 1.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
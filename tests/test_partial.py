@@ -0,0 +1,113 @@
+"""
+Unit tests for retire_plan.simulation.partial.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator
+from retire_plan.simulation.partial import (
+    PartialResult,
+    QuantileSketch,
+    load_partials,
+    merge_partials,
+)
+from retire_plan.strategies.analysis import compare_strategies, summarize_results
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_quantiles_within_relative_accuracy(self) -> None:
+        values = np.random.default_rng(0).lognormal(12, 1, size=5_000)
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        sketch.add(values)
+        for q in (0.1, 0.5, 0.9):
+            exact = np.quantile(values, q, method="lower")
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1.0, delta=0.02)
+
+    def test_merge_adds_counts_and_handles_signs(self) -> None:
+        a, b = QuantileSketch(), QuantileSketch()
+        a.add([-5.0, 0.0, 3.0])
+        b.add([10.0])
+        merged = a.merge(b)
+        self.assertEqual(merged.count, 4)
+        self.assertLess(merged.quantile(0.0), 0)
+        self.assertAlmostEqual(merged.quantile(1.0), 10.0, delta=0.2)
+
+
+class TestPartialResult(unittest.TestCase):
+
+    def setUp(self) -> None:
+        returns = np.random.default_rng(3).normal(0.05, 0.12, size=(40, 40))
+        self.batch = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                                    strategy_spend_taxable_first, returns,
+                                    years_working=10, annual_savings=20_000,
+                                    annual_spending=75_000, record=True)
+
+    def test_single_history_reproduces_summarize_results(self) -> None:
+        sim = Simulator(make_profile())
+        outcome = sim.run_full_lifecycle(contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                         years_working=10, annual_spending=95_000)
+        expected = summarize_results("A", outcome["history"])
+        got = PartialResult.from_history("A", outcome["history"]).to_summary()
+        self.assertEqual(set(got), set(expected))
+        for key in ("lifetime_tax", "final_wealth", "avg_net_cash", "stdev_net_cash"):
+            self.assertAlmostEqual(got[key], expected[key], places=4)
+        self.assertEqual(got["ruin_age"], expected["ruin_age"])
+
+    def test_sharded_merge_equals_whole(self) -> None:
+        whole = PartialResult.from_batch("A", self.batch)
+        shards = []
+        for rows in np.array_split(np.arange(40), 4):
+            traj = self.batch.trajectories
+            shards.append(PartialResult.from_arrays(
+                "A", traj["age"], traj["end_balances"][rows].sum(axis=2),
+                traj["tax_paid"][rows], traj["net_cash_flow"][rows]))
+        left = shards[0].merge(shards[1]).merge(shards[2].merge(shards[3]))
+        right = merge_partials(reversed(shards))["A"]
+        for merged in (left, right):
+            self.assertEqual(merged.n_paths, 40)
+            self.assertEqual(merged.ruin_ages, whole.ruin_ages)
+            self.assertAlmostEqual(merged.mean("final_wealth"), whole.mean("final_wealth"), places=4)
+            self.assertAlmostEqual(merged.quantile("final_wealth", 0.5),
+                                   whole.quantile("final_wealth", 0.5))
+        self.assertAlmostEqual(whole.success_probability(), float(self.batch.success.mean()))
+
+    def test_file_round_trip_and_compare(self) -> None:
+        a = PartialResult.from_batch("A", self.batch)
+        b = PartialResult.from_history("B", [
+            {"age": 60, "tax_paid": 1.0, "net_cash_flow": 5.0,
+             "end_balances": {"tax_deferred": 10.0, "tax_free": 0.0, "taxable": 0.0}},
+        ])
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"{i}.json") for i in range(3)]
+            a.save(paths[0])
+            a.save(paths[1])
+            b.save(paths[2])
+            merged = load_partials(paths)
+        self.assertEqual(merged["A"].n_paths, 80)
+        self.assertEqual(merged["A"].to_summary(), a.merge(a).to_summary())
+        comparison = compare_strategies([p.to_summary() for p in merged.values()])
+        self.assertEqual(comparison["lowest_tax_strategy"], "B")
+
+    def test_merge_different_names_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            PartialResult("A").merge(PartialResult("B"))
+
+    def test_from_batch_requires_trajectories(self) -> None:
+        batch = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, np.zeros((2, 40)),
+                               years_working=10)
+        with self.assertRaises(ValueError):
+            PartialResult.from_batch("A", batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,16 @@
 import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator
+from retire_plan.simulation.metrics import TaxCalculator
 from retire_plan.strategies.policies import (
     contrib_max_tfsa_first, contrib_max_rrsp_first,
-    strategy_spend_taxable_first, strategy_spend_rrsp_first
+    strategy_spend_taxable_first, strategy_spend_rrsp_first,
+    strategy_smooth_with_tfsa, gross_up,
 )
 
 class TestPolicies(unittest.TestCase):
@@ -48,4 +57,46 @@ class TestPolicies(unittest.TestCase):
         self.assertEqual(plan_taxable["tax_free"], 0.0)   # ← TFSA untouched
 
         plan_rrsp = strategy_spend_rrsp_first(self.withdraw_state)
-        self.assertGreater(plan_rrsp["tax_deferred"], 50000)  # Takes most from RRSP first
\ No newline at end of file
+        self.assertGreater(plan_rrsp["tax_deferred"], 50000)  # Takes most from RRSP first
+
+
+class TestGrossUp(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.calc = TaxCalculator(indexation_rate=0.02)
+        self.profile = PersonProfile(
+            name="GrossUp", current_age=60, end_age=90,
+            tax_deferred=TaxDeferredAccount("RRSP", 900_000.0),
+            tax_free=TaxFreeAccount("TFSA", 80_000.0),
+            taxable=TaxableAccount("Taxable", 60_000.0),
+            cpp_annual=12_000.0, oas_annual=8_000.0,
+        )
+
+    def test_net_cash_meets_target(self) -> None:
+        for strategy in (strategy_spend_taxable_first, strategy_spend_rrsp_first):
+            outcome = Simulator(self.profile, self.calc).run_full_lifecycle(
+                contrib_max_tfsa_first, gross_up(strategy, self.calc),
+                years_working=0, annual_spending=60_000)
+            for record in outcome["history"][:20]:
+                self.assertAlmostEqual(record["net_cash_flow"], record["spending"], places=6)
+
+    def test_tfsa_top_up_never_falls_short(self) -> None:
+        # Beyond the 4% RRSP draw and the taxable account, the extra comes
+        # from the TFSA and the target is overshot rather than missed (until
+        # the TFSA runs out too)
+        outcome = Simulator(self.profile, self.calc).run_full_lifecycle(
+            contrib_max_tfsa_first, gross_up(strategy_smooth_with_tfsa, self.calc),
+            years_working=0, annual_spending=60_000)
+        for record in outcome["history"][:5]:
+            self.assertGreaterEqual(record["net_cash_flow"], record["spending"] - 1e-6)
+
+    def test_vectorized_kernel_matches_scalar(self) -> None:
+        strategy = gross_up(strategy_spend_rrsp_first, self.calc)
+        self.assertTrue(hasattr(strategy, "vectorized"))
+        expected = Simulator(self.profile, self.calc).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy, years_working=0, annual_spending=60_000)
+        result = simulate_batch(self.profile, contrib_max_tfsa_first, strategy,
+                                np.full((1, 30), 0.05), years_working=0,
+                                annual_spending=60_000, tax_calculator=self.calc)
+        self.assertEqual(result.total_tax_paid[0], expected["total_tax_paid"])
+        self.assertEqual(result.final_wealth[0], expected["final_wealth"])
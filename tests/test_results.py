@@ -0,0 +1,102 @@
+"""
+Unit tests for retire_plan.simulation.results.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.results import load_results, save_results
+from retire_plan.strategies.analysis import income_profile_by_age, summarize_results, wealth_path
+from retire_plan.strategies.policies import (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_smooth_with_tfsa,
+)
+
+from tests.helpers import make_profile
+
+
+class TestResultFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "plan.rpr")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_single_run_round_trip(self) -> None:
+        outcome = Simulator(make_profile(40)).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, years_working=25)
+        save_results(self.path, outcome)
+        (loaded,) = load_results(self.path)
+        self.assertEqual(list(loaded["history"]), outcome["history"])
+        for key in ("final_wealth", "total_tax_paid", "ruin_age", "success", "peak_wealth"):
+            self.assertEqual(loaded[key], outcome[key])
+        self.assertEqual(loaded["history"][-1], outcome["history"][-1])
+
+    def test_optimize_results_with_dropped_histories(self) -> None:
+        results = Simulator.optimize(
+            make_profile(40),
+            [("TFSA-First", contrib_max_tfsa_first), ("RRSP-First", contrib_max_rrsp_first)],
+            [("Taxable-First", strategy_spend_taxable_first), ("Smooth", strategy_smooth_with_tfsa)],
+            years_working=25, top_k=1,
+        )
+        save_results(self.path, results)
+        loaded = load_results(self.path)
+        self.assertEqual(len(loaded), 4)
+        self.assertEqual(list(loaded[0]["history"]), results[0]["history"])
+        self.assertNotIn("history", loaded[1])
+        self.assertEqual(loaded[1]["withdraw_strategy"], results[1]["withdraw_strategy"])
+
+    def test_analysis_reads_columns_with_identical_results(self) -> None:
+        outcome = Simulator(make_profile(60)).run_full_lifecycle(
+            contrib_max_rrsp_first, strategy_spend_taxable_first,
+            years_working=5, annual_spending=90_000)
+        save_results(self.path, outcome)
+        history = load_results(self.path)[0]["history"]
+        self.assertEqual(summarize_results("x", history),
+                         summarize_results("x", outcome["history"]))
+        self.assertEqual(income_profile_by_age(history),
+                         income_profile_by_age(outcome["history"]))
+        self.assertEqual(wealth_path(history), wealth_path(outcome["history"]))
+
+    def test_analysis_reads_working_only_history(self) -> None:
+        outcome = Simulator(make_profile(60, 65)).run_full_lifecycle(
+            contrib_max_rrsp_first, strategy_spend_taxable_first, years_working=5)
+        save_results(self.path, outcome)
+        history = load_results(self.path)[0]["history"]
+        self.assertNotIn("tax_paid", history.names)
+        self.assertEqual(summarize_results("x", history),
+                         summarize_results("x", outcome["history"]))
+        self.assertEqual(income_profile_by_age(history),
+                         income_profile_by_age(outcome["history"]))
+
+    def test_columns_are_memory_mapped(self) -> None:
+        outcome = Simulator(make_profile(40)).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, years_working=25)
+        save_results(self.path, outcome)
+        history = load_results(self.path)[0]["history"]
+        tax = history.column("tax_paid")
+        self.assertIsInstance(tax, np.memmap)
+        # Accumulation years have no tax_paid entry
+        self.assertTrue(np.isnan(tax[0]))
+        self.assertEqual(history.column("phase")[-1], "decumulation")
+        np.testing.assert_array_equal(
+            history.column("end_balances.tax_free"),
+            [r["end_balances"]["tax_free"] for r in outcome["history"]])
+
+    def test_rejects_other_files(self) -> None:
+        with open(self.path, "wb") as fh:
+            fh.write(b"{}")
+        with self.assertRaises(SimulationConfigError):
+            load_results(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for RRIF minimum withdrawals (retire_plan.accounts.rrif).
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxDeferredAccount
+from retire_plan.accounts.rrif import RRIF_MINIMUM_FACTORS, rrif_minimum_factor
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestFactors(unittest.TestCase):
+
+    def test_prescribed_factors(self) -> None:
+        self.assertAlmostEqual(RRIF_MINIMUM_FACTORS[65], 1 / 25)
+        self.assertAlmostEqual(RRIF_MINIMUM_FACTORS[71], 0.0528)
+        self.assertAlmostEqual(RRIF_MINIMUM_FACTORS[90], 0.1192)
+        self.assertAlmostEqual(RRIF_MINIMUM_FACTORS[100], 0.20)
+
+    def test_zero_before_conversion(self) -> None:
+        np.testing.assert_allclose(rrif_minimum_factor(np.array([70, 71, 72])),
+                                   [0.0, 0.0528, 0.0540])
+        self.assertEqual(rrif_minimum_factor(80, None), 0.0)
+        account = TaxDeferredAccount("RRIF", 100_000.0, rrif_conversion_age=65)
+        self.assertAlmostEqual(account.rrif_minimum(65), 4_000.0)
+        self.assertEqual(TaxDeferredAccount("RRSP", 100_000.0).rrif_minimum(80), 0.0)
+
+
+class TestEnforcement(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kwargs = dict(years_working=0, annual_spending=40_000)
+
+    def test_simulator_withdraws_minimum_and_reinvests(self) -> None:
+        outcome = Simulator(make_profile(60, rrsp=600_000.0, taxable=400_000.0, rrif_conversion_age=71)).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, **self.kwargs)
+        baseline = Simulator(make_profile(60, rrsp=600_000.0, taxable=400_000.0)).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, **self.kwargs)
+        by_age = {r["age"]: r for r in outcome["history"]}
+        rrsp_at_71 = by_age[70]["end_balances"]["tax_deferred"]
+        self.assertGreaterEqual(by_age[71]["gross_withdrawal"], 0.0528 * rrsp_at_71 - 1e-6)
+        # Spending is unchanged, the forced excess stays invested but is taxed
+        self.assertAlmostEqual(by_age[71]["net_cash_flow"] + by_age[71]["tax_paid"],
+                               baseline["history"][11]["net_cash_flow"]
+                               + baseline["history"][11]["tax_paid"], places=6)
+        self.assertAlmostEqual(outcome["final_wealth"], baseline["final_wealth"], places=4)
+        self.assertGreater(outcome["total_tax_paid"], baseline["total_tax_paid"])
+
+    def test_batch_matches_simulator(self) -> None:
+        returns = ReturnModel().sample(6, 0, 35, np.random.default_rng(2))
+        batch = simulate_batch(make_profile(60, rrsp=600_000.0, taxable=400_000.0, rrif_conversion_age=71), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, returns, **self.kwargs)
+        for p in range(returns.shape[0]):
+            expected = Simulator(make_profile(60, rrsp=600_000.0, taxable=400_000.0, rrif_conversion_age=71)).run_full_lifecycle(
+                contrib_max_tfsa_first, strategy_spend_taxable_first,
+                decumulation_return=returns[p], **self.kwargs)
+            self.assertEqual(batch.final_wealth[p], expected["final_wealth"])
+            self.assertEqual(batch.total_tax_paid[p], expected["total_tax_paid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
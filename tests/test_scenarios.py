@@ -0,0 +1,108 @@
+"""
+Unit tests for retire_plan.simulation.scenarios.
+"""
+
+import unittest
+from statistics import NormalDist
+
+import numpy as np
+
+from retire_plan.simulation.engine import SimulationConfigError
+from retire_plan.simulation.scenarios import (
+    MultiAssetModel,
+    ReturnModel,
+    halton,
+    norm_ppf,
+    standard_normals,
+)
+
+
+class TestSamplers(unittest.TestCase):
+
+    def test_norm_ppf_matches_statistics(self) -> None:
+        u = np.array([1e-6, 0.01, 0.3, 0.5, 0.8, 0.99, 1 - 1e-6])
+        expected = [NormalDist().inv_cdf(x) for x in u]
+        np.testing.assert_allclose(norm_ppf(u), expected, atol=1e-7)
+
+    def test_halton_points_are_in_unit_cube_and_even(self) -> None:
+        points = halton(1_024, 5, np.random.default_rng(0))
+        self.assertEqual(points.shape, (1_024, 5))
+        self.assertTrue(((points >= 0) & (points < 1)).all())
+        # Low discrepancy: each column's mean is very close to 1/2
+        np.testing.assert_allclose(points.mean(axis=0), 0.5, atol=0.01)
+
+    def test_antithetic_rows_mirror_each_other(self) -> None:
+        z = standard_normals(6, 4, np.random.default_rng(1), antithetic=True)
+        np.testing.assert_allclose(z[:3], -z[3:])
+
+    def test_antithetic_needs_even_count(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            standard_normals(5, 4, np.random.default_rng(1), antithetic=True)
+
+    def test_unknown_sampler_raises(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            standard_normals(4, 4, np.random.default_rng(1), sampler="latin")
+
+
+class TestReturnModel(unittest.TestCase):
+
+    def test_mean_path_switches_at_retirement(self) -> None:
+        path = ReturnModel(0.07, 0.05, 0.1).mean_returns(2, 3)
+        np.testing.assert_allclose(path, [0.07, 0.07, 0.05, 0.05, 0.05])
+
+    def test_glide_path_means(self) -> None:
+        model = ReturnModel(np.array([0.08, 0.06]), 0.04, 0.1)
+        np.testing.assert_allclose(model.mean_returns(2, 2), [0.08, 0.06, 0.04, 0.04])
+        with self.assertRaises(SimulationConfigError):
+            model.mean_returns(3, 2)
+
+    def test_sample_shape_and_center(self) -> None:
+        model = ReturnModel(0.07, 0.05, 0.1)
+        draws = model.sample(4_000, 2, 3, np.random.default_rng(2), sampler="halton")
+        self.assertEqual(draws.shape, (4_000, 5))
+        np.testing.assert_allclose(draws.mean(axis=0), model.mean_returns(2, 3), atol=0.005)
+
+
+class TestMultiAssetModel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.model = MultiAssetModel(allocations=((0.5, 0.5), (1.0, 0.0), (0.2, 0.8)))
+
+    def test_shapes_and_preallocated_output(self) -> None:
+        out = np.empty((10, 5, 3))
+        returns, inflation = self.model.sample_scenarios(10, 2, 3, np.random.default_rng(0), out=out)
+        self.assertIs(returns, out)
+        self.assertEqual(inflation.shape, (10, 3))
+        self.assertEqual(self.model.sample(4, 2, 3, np.random.default_rng(0)).shape, (4, 5, 3))
+
+    def test_moments_follow_covariance_and_allocations(self) -> None:
+        returns, inflation = self.model.sample_scenarios(100_000, 1, 1, np.random.default_rng(1))
+        np.testing.assert_allclose(returns.mean(axis=(0, 1)), self.model.mean_returns(1, 1)[0],
+                                   atol=0.002)
+        self.assertAlmostEqual(inflation.mean(), 0.02, places=3)
+        # The all-equity TFSA sees the equity/inflation correlation
+        corr = np.corrcoef(returns[:, 1, 1], inflation[:, 0])[0, 1]
+        self.assertAlmostEqual(corr, -0.1, delta=0.02)
+
+    def test_buy_and_hold_drifts_from_target_mix(self) -> None:
+        drift = MultiAssetModel(allocations=self.model.allocations, rebalance=False)
+        rebalanced = self.model.sample(200, 3, 0, np.random.default_rng(2))
+        held = drift.sample(200, 3, 0, np.random.default_rng(2))
+        np.testing.assert_allclose(held[:, 0], rebalanced[:, 0])
+        # Buy and hold compounds each asset separately
+        growth = np.prod(1 + held[:, :, 0], axis=1)
+        self.assertFalse(np.allclose(growth, np.prod(1 + rebalanced[:, :, 0], axis=1)))
+        # Single-asset accounts are unaffected by rebalancing
+        np.testing.assert_allclose(held[:, :, 1], rebalanced[:, :, 1])
+
+    def test_invalid_inputs(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            MultiAssetModel(allocations=((0.5, 0.4), (1.0, 0.0), (0.2, 0.8)))
+        with self.assertRaises(SimulationConfigError):
+            MultiAssetModel(correlation=((1, 0.9, 0.9), (0.9, 1, -0.9), (0.9, -0.9, 1)))
+        with self.assertRaises(SimulationConfigError):
+            self.model.sample_scenarios(3, 1, 1, np.random.default_rng(0), out=np.empty((3, 2, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
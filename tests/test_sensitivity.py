@@ -0,0 +1,95 @@
+"""
+Unit tests for retire_plan.simulation.sensitivity.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.simulation.sensitivity import SENSITIVITY_STEPS, sensitivity
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestSensitivity(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kwargs = dict(years_working=10, annual_savings=25_000, annual_spending=70_000)
+
+    def _simulate(self, **overrides) -> dict:
+        plan = {**self.kwargs, **overrides}
+        return Simulator(make_profile(50, cost_base=30_000.0)).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, **plan)
+
+    def test_rows_match_simulator(self) -> None:
+        result = sensitivity(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                             strategy_spend_taxable_first, **self.kwargs)
+        self.assertAlmostEqual(result["base"]["final_wealth"],
+                               self._simulate()["final_wealth"], places=4)
+        rows = {row["input"]: row for row in result["table"]}
+        self.assertEqual(set(rows), set(SENSITIVITY_STEPS))
+        checks = {
+            "years_working": ({"years_working": 9}, {"years_working": 11}),
+            "annual_spending": ({"annual_spending": 69_000}, {"annual_spending": 71_000}),
+            "annual_savings": ({"annual_savings": 24_000}, {"annual_savings": 26_000}),
+            "inflation_rate": ({"inflation_rate": 0.01}, {"inflation_rate": 0.03}),
+        }
+        for name, (low, high) in checks.items():
+            self.assertAlmostEqual(rows[name]["final_wealth_low"],
+                                   self._simulate(**low)["final_wealth"], places=4)
+            self.assertAlmostEqual(rows[name]["final_wealth_high"],
+                                   self._simulate(**high)["final_wealth"], places=4)
+        swings = [abs(r["final_wealth_high"] - r["final_wealth_low"]) for r in result["table"]]
+        self.assertEqual(swings, sorted(swings, reverse=True))
+        self.assertGreater(rows["return_rate"]["final_wealth_per_step"], 0)
+        self.assertLess(rows["annual_spending"]["final_wealth_per_step"], 0)
+
+    def test_stochastic_base_shares_scenarios(self) -> None:
+        result = sensitivity(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                             strategy_spend_taxable_first, steps={"annual_spending": 5_000},
+                             return_model=ReturnModel(), n_paths=40, seed=2, **self.kwargs)
+        returns = ReturnModel().sample(40, 10, 35, np.random.default_rng(2))
+        batch = simulate_batch(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, returns, **self.kwargs)
+        self.assertAlmostEqual(result["base"]["final_wealth"], batch.final_wealth.mean())
+        self.assertAlmostEqual(result["base"]["success"], batch.success.mean())
+        self.assertEqual(len(result["table"]), 1)
+
+    def test_retirement_inputs_share_working_years(self) -> None:
+        calls = []
+
+        def counted(state):
+            calls.append(state["age"])
+            return contrib_max_tfsa_first(state)
+
+        for steps, runs in (({"annual_spending": 1_000, "inflation_rate": 0.01}, 1),
+                            ({"annual_savings": 1_000}, 3)):
+            calls.clear()
+            sensitivity(make_profile(50, cost_base=30_000.0), counted, strategy_spend_taxable_first,
+                        steps=steps, **self.kwargs)
+            self.assertEqual(len(calls), 10 * runs)
+
+    def test_changes_are_clipped(self) -> None:
+        result = sensitivity(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                             strategy_spend_taxable_first,
+                             steps={"years_working": 1, "taxable": 150_000},
+                             years_working=0, annual_savings=0, annual_spending=40_000)
+        rows = {row["input"]: row for row in result["table"]}
+        self.assertEqual(rows["years_working"]["low"], 0)
+        self.assertEqual(rows["taxable"]["low"], -60_000.0)
+
+    def test_invalid_inputs(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            sensitivity(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                        strategy_spend_taxable_first, steps={"pension": 1.0})
+        with self.assertRaises(SimulationConfigError):
+            sensitivity(make_profile(50, cost_base=30_000.0), contrib_max_tfsa_first,
+                        strategy_spend_taxable_first, years_working=50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for retire_plan.simulation.session.
+"""
+
+import dataclasses
+import unittest
+
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.session import PlanningSession
+from retire_plan.strategies.policies import (
+    contrib_max_rrsp_first,
+    contrib_max_tfsa_first,
+    strategy_smooth_with_tfsa,
+    strategy_spend_rrsp_first,
+    strategy_spend_taxable_first,
+)
+
+from tests.helpers import make_profile
+
+CONTRIBUTIONS = [("TFSA-First", contrib_max_tfsa_first), ("RRSP-First", contrib_max_rrsp_first)]
+WITHDRAWALS = [
+    ("Taxable-First", strategy_spend_taxable_first),
+    ("RRSP-First", strategy_spend_rrsp_first),
+    ("Smooth-with-TFSA", strategy_smooth_with_tfsa),
+]
+
+
+def ranking(results):
+    return [(r["contrib_strategy"], r["withdraw_strategy"], r["final_wealth"],
+             r["total_tax_paid"]) for r in results]
+
+
+class TestPlanningSession(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.session = PlanningSession(make_profile(), CONTRIBUTIONS, WITHDRAWALS,
+                                       years_working=20, annual_savings=25_000)
+
+    def test_matches_optimize(self) -> None:
+        expected = Simulator.optimize(make_profile(), CONTRIBUTIONS, WITHDRAWALS,
+                                      years_working=20, annual_savings=25_000)
+        self.assertEqual(ranking(self.session.results()), ranking(expected))
+        self.assertEqual(self.session.runs, {"accumulation": 2, "decumulation": 6})
+
+    def test_decumulation_change_reuses_checkpoints(self) -> None:
+        self.session.results()
+        updated = self.session.update(annual_spending=60_000, inflation_rate=0.03,
+                                      cpp_start_age=70)
+        self.assertEqual(self.session.runs, {"accumulation": 2, "decumulation": 12})
+        profile = dataclasses.replace(make_profile(), cpp_start_age=70)
+        expected = []
+        for c_name, c in CONTRIBUTIONS:
+            for w_name, w in WITHDRAWALS:
+                outcome = Simulator(profile).run_full_lifecycle(
+                    c, w, years_working=20, annual_savings=25_000,
+                    annual_spending=60_000, inflation_rate=0.03)
+                expected.append({"contrib_strategy": c_name, "withdraw_strategy": w_name,
+                                 **outcome})
+        expected.sort(key=lambda r: r["total_tax_paid"])
+        self.assertEqual(ranking(updated), ranking(expected))
+
+    def test_accumulation_change_reruns_everything(self) -> None:
+        self.session.results()
+        updated = self.session.update(annual_savings=30_000)
+        self.assertEqual(self.session.runs, {"accumulation": 4, "decumulation": 12})
+        expected = Simulator.optimize(make_profile(), CONTRIBUTIONS, WITHDRAWALS,
+                                      years_working=20, annual_savings=30_000)
+        self.assertEqual(ranking(updated), ranking(expected))
+
+    def test_replacing_one_strategy_reruns_its_pairs(self) -> None:
+        self.session.results()
+        calls = []
+
+        def tracked(state):
+            calls.append(state["age"])
+            return strategy_smooth_with_tfsa(state)
+
+        self.session.update(withdrawal_strategies=WITHDRAWALS[:2] + [("Smooth-with-TFSA", tracked)])
+        self.assertEqual(self.session.runs, {"accumulation": 2, "decumulation": 8})
+        self.assertTrue(calls)
+
+    def test_invalid_updates(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            self.session.update(retirement_mood="great")
+        with self.assertRaises(ValueError):
+            self.session.update(oas_start_age=60)
+        with self.assertRaises(SimulationConfigError):
+            PlanningSession(make_profile(), CONTRIBUTIONS * 2, WITHDRAWALS)
+
+
+    def test_rejected_update_keeps_session(self) -> None:
+        before = ranking(self.session.results())
+        runs = dict(self.session.runs)
+        with self.assertRaises(SimulationConfigError):
+            self.session.update(annual_spending=-1)
+        with self.assertRaises(SimulationConfigError):
+            self.session.update(years_working=-5, annual_spending=60_000)
+        self.assertEqual(self.session.inputs["annual_spending"], 80_000)
+        self.assertEqual(ranking(self.session.results()), before)
+        self.assertEqual(self.session.runs["accumulation"], runs["accumulation"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for retire_plan.strategies.specs.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+from retire_plan.simulation.engine import Simulator
+from retire_plan.strategies.policies import (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_spend_rrsp_first,
+    strategy_smooth_with_tfsa,
+)
+from retire_plan.strategies.specs import Step, StrategySpec, compile_spec, dedupe_strategies
+
+
+BUILTINS = (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_spend_rrsp_first,
+    strategy_smooth_with_tfsa,
+)
+
+
+def make_states(rng: np.random.Generator, n: int = 200) -> list:
+    states = []
+    for _ in range(n):
+        states.append({
+            "age": int(rng.integers(30, 95)),
+            "annual_savings_available": float(rng.uniform(0, 60_000)),
+            "target_net_cash": float(rng.uniform(0, 120_000)),
+            "cpp_income": 12_000.0,
+            "oas_income": 8_000.0,
+            "balances": {
+                "tax_deferred": float(rng.uniform(0, 400_000)),
+                "tax_free": float(rng.uniform(0, 100_000)),
+                "taxable": float(rng.choice([0.0, rng.uniform(0, 80_000)])),
+            },
+        })
+    return states
+
+
+class TestCompiledSpecs(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.states = make_states(np.random.default_rng(0))
+
+    def test_builtin_specs_reproduce_hand_written_policies(self) -> None:
+        for strategy in BUILTINS:
+            compiled = compile_spec(strategy.spec)
+            for state in self.states:
+                self.assertEqual(compiled(state), strategy(state), strategy.__name__)
+
+    def test_kernel_matches_scalar_function(self) -> None:
+        spec = StrategySpec("withdrawal", (
+            Step("tax_deferred", cap=20_000, before_age=72),
+            Step("taxable", pct_of_balance=0.5),
+            Step("tax_deferred", from_age=72),
+            Step("tax_free"),
+        ))
+        strategy = compile_spec(spec)
+        batch = {
+            "age": np.array([s["age"] for s in self.states]),
+            "target_net_cash": np.array([s["target_net_cash"] for s in self.states]),
+            "cpp_income": 12_000.0,
+            "oas_income": 8_000.0,
+            "balances": {key: np.array([s["balances"][key] for s in self.states])
+                         for key in ("tax_deferred", "tax_free", "taxable")},
+        }
+        plans = strategy.vectorized(batch)
+        for p, state in enumerate(self.states):
+            for key, amount in strategy(state).items():
+                self.assertEqual(plans[key][p], amount)
+
+    def test_age_window(self) -> None:
+        spec = StrategySpec("contribution", (
+            Step("tax_deferred", cap=10_000, from_age=50),
+            Step("taxable"),
+        ))
+        strategy = compile_spec(spec)
+        young = strategy({"age": 40, "annual_savings_available": 15_000})
+        older = strategy({"age": 50, "annual_savings_available": 15_000})
+        self.assertEqual(young, {"tax_deferred": 0.0, "tax_free": 0.0, "taxable": 15_000})
+        self.assertEqual(older, {"tax_deferred": 10_000, "tax_free": 0.0, "taxable": 5_000})
+
+    def test_withdrawal_never_exceeds_balance(self) -> None:
+        spec = StrategySpec("withdrawal", (Step("taxable", cap=5_000), Step("taxable")))
+        plan = compile_spec(spec)({
+            "target_net_cash": 50_000, "cpp_income": 0, "oas_income": 0,
+            "balances": {"tax_deferred": 0, "tax_free": 0, "taxable": 8_000},
+        })
+        self.assertEqual(plan["taxable"], 8_000)
+
+    def test_invalid_specs(self) -> None:
+        with self.assertRaises(ValueError):
+            Step("rrsp")
+        with self.assertRaises(ValueError):
+            StrategySpec("contribution", (Step("tax_free", pct_of_balance=0.1),))
+        with self.assertRaises(ValueError):
+            StrategySpec("spending", ())
+
+
+class TestCanonicalSpecs(unittest.TestCase):
+
+    def test_equivalent_spellings_share_canonical_form(self) -> None:
+        verbose = StrategySpec("contribution", (
+            Step("tax_free", cap=5_000),
+            Step("tax_free", cap=2_500),
+            Step("tax_deferred", cap=0),
+            Step("tax_deferred", cap=35_000),
+            Step("tax_deferred", from_age=60, before_age=60),
+            Step("taxable"),
+            Step("tax_free"),
+        ))
+        self.assertEqual(verbose.canonical(), contrib_max_tfsa_first.spec.canonical())
+
+    def test_withdrawal_account_exhaustion(self) -> None:
+        spec = StrategySpec("withdrawal", (
+            Step("taxable"),
+            Step("tax_deferred", pct_of_balance=1.5),
+            Step("taxable", cap=1_000),
+            Step("tax_free"),
+        ))
+        self.assertEqual(spec.canonical(), strategy_spend_taxable_first.spec.canonical())
+
+    def test_different_rules_stay_distinct(self) -> None:
+        self.assertNotEqual(strategy_spend_taxable_first.spec.canonical(),
+                            strategy_spend_rrsp_first.spec.canonical())
+
+    def test_dedupe_strategies(self) -> None:
+        custom = compile_spec(StrategySpec("withdrawal", (
+            Step("taxable"), Step("tax_deferred"), Step("tax_free"),
+        )))
+        unique, aliases = dedupe_strategies([
+            ("Taxable-First", strategy_spend_taxable_first),
+            ("Smooth", strategy_smooth_with_tfsa),
+            ("Custom", custom),
+            ("Smooth-again", strategy_smooth_with_tfsa),
+        ])
+        self.assertEqual([name for name, _ in unique], ["Taxable-First", "Smooth"])
+        self.assertEqual(aliases, {"Taxable-First": ["Custom"], "Smooth": ["Smooth-again"]})
+
+
+class TestOptimizeDeduplication(unittest.TestCase):
+
+    def test_duplicates_evaluated_once_and_reported(self) -> None:
+        profile = PersonProfile(
+            name="Spec",
+            current_age=50,
+            end_age=85,
+            tax_deferred=TaxDeferredAccount("RRSP", 200_000.0),
+            tax_free=TaxFreeAccount("TFSA", 50_000.0),
+            taxable=TaxableAccount("Taxable", 30_000.0),
+            cpp_annual=12_000.0,
+            oas_annual=8_000.0,
+        )
+        calls = []
+        custom = compile_spec(strategy_spend_rrsp_first.spec)
+
+        def counted(state):
+            calls.append(state["age"])
+            return custom(state)
+        counted.spec = custom.spec
+
+        results = Simulator.optimize(
+            profile,
+            [("TFSA-First", contrib_max_tfsa_first)],
+            [("RRSP-First", strategy_spend_rrsp_first), ("Custom", counted)],
+            years_working=10,
+        )
+        self.assertEqual(calls, [])
+        self.assertEqual([r["withdraw_strategy"] for r in results], ["RRSP-First", "Custom"])
+        self.assertEqual(results[0]["total_tax_paid"], results[1]["total_tax_paid"])
+
+        kept = Simulator.optimize(
+            profile,
+            [("TFSA-First", contrib_max_tfsa_first)],
+            [("RRSP-First", strategy_spend_rrsp_first), ("Custom", counted)],
+            years_working=10, top_k=1,
+        )
+        self.assertEqual(sum("history" in r for r in kept), 1)
+        self.assertEqual(kept[1]["total_tax_paid"], kept[0]["total_tax_paid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
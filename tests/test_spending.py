@@ -0,0 +1,121 @@
+"""
+Unit tests for retire_plan.strategies.spending.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import Simulator
+from retire_plan.simulation.montecarlo import run_monte_carlo
+from retire_plan.simulation.scenarios import ReturnModel
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+from retire_plan.strategies.spending import (
+    FloorCeiling,
+    GuytonKlinger,
+    PercentOfPortfolio,
+    SpendingRule,
+)
+
+from tests.helpers import make_profile
+
+
+class TestRules(unittest.TestCase):
+
+    def test_guyton_klinger_guardrails(self) -> None:
+        rule = GuytonKlinger()
+        spending, state = rule.start(np.full(3, 40_000.0), np.full(3, 1_000_000.0))
+        new = rule.update(spending, state,
+                          wealth=np.array([1_000_000.0, 600_000.0, 2_000_000.0]),
+                          portfolio_return=np.array([0.05, -0.2, 0.3]),
+                          inflation=0.02, years_left=25)
+        # Normal year; losing year with a high rate (freeze + cut); prosperity raise
+        np.testing.assert_allclose(new, [40_800.0, 36_000.0, 40_800.0 * 1.1])
+
+    def test_no_cuts_in_final_years(self) -> None:
+        rule = GuytonKlinger()
+        spending, state = rule.start(np.array([40_000.0]), np.array([1_000_000.0]))
+        new = rule.update(spending, state, np.array([500_000.0]), np.array([0.01]), 0.02, 10)
+        np.testing.assert_allclose(new, [40_800.0])
+
+    def test_percent_of_portfolio(self) -> None:
+        rule = PercentOfPortfolio()
+        spending, state = rule.start(np.array([40_000.0]), np.array([1_000_000.0]))
+        np.testing.assert_allclose(spending, [40_000.0])
+        new = rule.update(spending, state, np.array([800_000.0]), np.array([-0.1]), 0.02, 20)
+        np.testing.assert_allclose(new, [32_000.0])
+
+    def test_floor_ceiling(self) -> None:
+        rule = FloorCeiling(rate=0.04, floor=0.9, ceiling=1.2)
+        spending, state = rule.start(np.full(2, 40_000.0), np.full(2, 1_000_000.0))
+        new = rule.update(spending, state, np.array([500_000.0, 3_000_000.0]),
+                          np.zeros(2), 0.0, 20)
+        np.testing.assert_allclose(new, [36_000.0, 48_000.0])
+
+    def test_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            PercentOfPortfolio(rate=1.5)
+        with self.assertRaises(ValueError):
+            FloorCeiling(floor=1.1)
+
+    def test_incomplete_rule_cannot_be_created(self) -> None:
+        class StartOnly(SpendingRule):
+            def start(self, spending, wealth):
+                return spending, {}
+
+        with self.assertRaises(TypeError):
+            StartOnly()
+
+
+class TestEngines(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.kwargs = dict(years_working=5, annual_savings=20_000, annual_spending=60_000)
+        self.returns = ReturnModel().sample(8, 5, 35, np.random.default_rng(4))
+
+    def test_batch_matches_simulator(self) -> None:
+        for rule in (GuytonKlinger(), PercentOfPortfolio(), FloorCeiling()):
+            batch = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                                   strategy_spend_taxable_first, self.returns,
+                                   spending_rule=rule, **self.kwargs)
+            for p in range(self.returns.shape[0]):
+                outcome = Simulator(make_profile()).run_full_lifecycle(
+                    contrib_max_tfsa_first, strategy_spend_taxable_first,
+                    accumulation_return=self.returns[p, :5],
+                    decumulation_return=self.returns[p, 5:],
+                    spending_rule=rule, **self.kwargs)
+                self.assertAlmostEqual(outcome["final_wealth"], batch.final_wealth[p], places=4)
+                self.assertAlmostEqual(outcome["total_tax_paid"], batch.total_tax_paid[p], places=4)
+
+    def test_percent_of_portfolio_never_runs_out(self) -> None:
+        fixed = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, self.returns, **self.kwargs)
+        dynamic = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                                 strategy_spend_taxable_first, self.returns,
+                                 spending_rule=PercentOfPortfolio(rate=0.04), **self.kwargs)
+        self.assertTrue(dynamic.success.all())
+        self.assertGreaterEqual(dynamic.success.mean(), fixed.success.mean())
+
+    def test_rule_state_follows_dropped_paths(self) -> None:
+        death_ages = np.array([62, 95, 70, 95, 66, 95, 95, 80])
+        batch = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                               strategy_spend_taxable_first, self.returns,
+                               spending_rule=FloorCeiling(), death_ages=death_ages,
+                               record=True, **self.kwargs)
+        full = simulate_batch(make_profile(), contrib_max_tfsa_first,
+                              strategy_spend_taxable_first, self.returns,
+                              spending_rule=FloorCeiling(), record=True, **self.kwargs)
+        alive = ~np.isnan(batch.trajectories["spending"])
+        np.testing.assert_array_equal(batch.trajectories["spending"][alive],
+                                      full.trajectories["spending"][alive])
+
+    def test_monte_carlo_accepts_rule(self) -> None:
+        summary = run_monte_carlo(make_profile(), contrib_max_tfsa_first,
+                                  strategy_spend_taxable_first, spending_rule=GuytonKlinger(),
+                                  block_size=200, max_paths=400, seed=1, **self.kwargs)
+        self.assertIn("success", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Unit tests for retire_plan.simulation.stress.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.engine import Simulator, SimulationConfigError
+from retire_plan.simulation.stress import STRESS_SCENARIOS, StressScenario, stress_test
+from retire_plan.strategies.policies import contrib_max_tfsa_first, strategy_spend_taxable_first
+
+from tests.helpers import make_profile
+
+
+class TestStressTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sim = Simulator(make_profile())
+        self.kwargs = dict(years_working=10, annual_savings=20_000, annual_spending=70_000)
+
+    def test_one_row_per_scenario(self) -> None:
+        rows = self.sim.stress_test(contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                    **self.kwargs)
+        self.assertEqual([r["scenario"] for r in rows], list(STRESS_SCENARIOS))
+        self.assertEqual(rows[0]["final_wealth_vs_first"], 0.0)
+        for row in rows[1:]:
+            self.assertLess(row["final_wealth"], rows[0]["final_wealth"], row["scenario"])
+
+    def test_baseline_matches_full_lifecycle(self) -> None:
+        expected = Simulator(make_profile()).run_full_lifecycle(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, **self.kwargs)
+        baseline = self.sim.stress_test(contrib_max_tfsa_first, strategy_spend_taxable_first,
+                                        scenarios=[STRESS_SCENARIOS["baseline"]], **self.kwargs)[0]
+        self.assertEqual(baseline["final_wealth"], expected["final_wealth"])
+        self.assertEqual(baseline["total_tax_paid"], expected["total_tax_paid"])
+        self.assertEqual(baseline["ruin_age"], expected["ruin_age"])
+
+    def test_early_crash_ruins_sooner_than_late_crash(self) -> None:
+        rows = {r["scenario"]: r for r in self.sim.stress_test(
+            contrib_max_tfsa_first, strategy_spend_taxable_first, **self.kwargs)}
+        self.assertLess(rows["early_crash"]["ruin_age"], rows["late_crash"]["ruin_age"])
+
+    def test_custom_scenario_overrides(self) -> None:
+        scenario = StressScenario("pre_retirement_dip", "Crash just before retiring",
+                                  returns=((-1, -0.5), (100, 0.9)), inflation=((0, 0.1),))
+        returns, inflation = scenario.apply(np.full(5, 0.05), np.full(3, 0.02), years_working=2)
+        np.testing.assert_allclose(returns, [0.05, -0.5, 0.05, 0.05, 0.05])
+        np.testing.assert_allclose(inflation, [0.1, 0.02, 0.02])
+
+    def test_needs_a_scenario(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            stress_test(make_profile(), contrib_max_tfsa_first, strategy_spend_taxable_first,
+                        scenarios=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Unit tests for retire_plan.simulation.surface.
+"""
+
+import unittest
+
+import numpy as np
+
+from retire_plan.simulation.batch import simulate_batch
+from retire_plan.simulation.engine import SimulationConfigError
+from retire_plan.simulation.scenarios import MultiAssetModel, ReturnModel, retime_returns
+from retire_plan.simulation.surface import success_surface
+from retire_plan.strategies.policies import contrib_max_rrsp_first, strategy_smooth_with_tfsa
+
+from tests.helpers import make_profile
+
+
+class TestSuccessSurface(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.levels = [40_000.0, 60_000.0, 80_000.0]
+        self.ages = [50, 58, 65]
+
+    def _cell(self, returns, latest, model, age, spending, **kwargs):
+        work = age - 50
+        return simulate_batch(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                              retime_returns(model, returns, latest, work),
+                              years_working=work, annual_savings=20_000,
+                              annual_spending=spending, **kwargs)
+
+    def test_cells_match_independent_runs(self) -> None:
+        grid = success_surface(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                               self.levels, self.ages, annual_savings=20_000,
+                               n_paths=60, seed=4)
+        self.assertEqual(grid["success"].shape, (3, 3))
+        returns = ReturnModel().sample(60, 15, 27, np.random.default_rng(4))
+        for a, age in enumerate(self.ages):
+            for j, spending in enumerate(self.levels):
+                cell = self._cell(returns, 15, ReturnModel(), age, spending)
+                self.assertEqual(grid["success"][a, j], cell.success.mean())
+                self.assertAlmostEqual(grid["final_wealth"][a, j], cell.final_wealth.mean(),
+                                       places=4)
+
+    def test_multi_asset_inflation_follows_calendar(self) -> None:
+        model = MultiAssetModel()
+        grid = success_surface(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                               self.levels, self.ages, annual_savings=20_000,
+                               return_model=model, n_paths=40, seed=5)
+        returns, inflation = model.sample_scenarios(40, 0, 42, np.random.default_rng(5))
+        cell = self._cell(returns, 0, model, 58, 60_000.0, inflation_rate=inflation[:, 8:])
+        self.assertEqual(grid["success"][1, 1], cell.success.mean())
+        self.assertAlmostEqual(grid["final_wealth"][1, 1], cell.final_wealth.mean(), places=4)
+
+    def test_success_falls_with_spending_and_rises_with_age(self) -> None:
+        grid = success_surface(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                               [30_000, 60_000, 120_000], [50, 60, 70], n_paths=200, seed=1)
+        self.assertTrue((np.diff(grid["success"], axis=1) <= 0).all())
+        self.assertTrue((np.diff(grid["success"], axis=0) >= 0).all())
+
+    def test_invalid_grid(self) -> None:
+        with self.assertRaises(SimulationConfigError):
+            success_surface(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                            self.levels, [45])
+        with self.assertRaises(SimulationConfigError):
+            success_surface(make_profile(50, 92, cost_base=30_000.0, rrif_conversion_age=71), contrib_max_rrsp_first, strategy_smooth_with_tfsa,
+                            [], self.ages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for retire_plan.simulation.sweep.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from retire_plan.accounts.models import TaxDeferredAccount, TaxFreeAccount, TaxableAccount
+from retire_plan.accounts.profile import PersonProfile
+from retire_plan.simulation.engine import SimulationConfigError
+from retire_plan.simulation.sweep import lifecycle_sweep, run_sweep, unit_seed
+from retire_plan.strategies.policies import (
+    contrib_max_tfsa_first,
+    contrib_max_rrsp_first,
+    strategy_spend_taxable_first,
+    strategy_spend_rrsp_first,
+)
+
+
+class Preempted(Exception):
+    pass
+
+
+class TestRunSweep(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sweep.jsonl")
+        self.units = {f"u{i}": {"x": i} for i in range(6)}
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    @staticmethod
+    def evaluate(params):
+        rng = np.random.default_rng(unit_seed(7, f"u{params['x']}"))
+        return {"value": rng.normal(), "pair": (params["x"], np.int64(2))}
+
+    def test_resume_matches_uninterrupted_run(self) -> None:
+        expected = run_sweep(self.units, self.evaluate)
+
+        calls = []
+
+        def flaky(params):
+            if len(calls) == 3:
+                raise Preempted
+            calls.append(params["x"])
+            return self.evaluate(params)
+
+        with self.assertRaises(Preempted):
+            run_sweep(self.units, flaky, self.path)
+
+        resumed_calls = []
+
+        def counting(params):
+            resumed_calls.append(params["x"])
+            return self.evaluate(params)
+
+        resumed = run_sweep(self.units, counting, self.path)
+        self.assertEqual(resumed, expected)
+        self.assertEqual(resumed_calls, [3, 4, 5])
+
+    def test_torn_last_line_is_discarded(self) -> None:
+        run_sweep(dict(list(self.units.items())[:2]), self.evaluate, self.path)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write('{"key": "u2", "par')
+        calls = []
+        run_sweep(self.units, lambda p: calls.append(p["x"]) or self.evaluate(p), self.path)
+        self.assertEqual(calls, [2, 3, 4, 5])
+        self.assertEqual(run_sweep(self.units, self.evaluate, self.path),
+                         run_sweep(self.units, self.evaluate))
+
+    def test_changed_params_are_rejected(self) -> None:
+        run_sweep(self.units, self.evaluate, self.path)
+        with self.assertRaises(SimulationConfigError):
+            run_sweep({"u0": {"x": 99}}, self.evaluate, self.path)
+
+
+class TestLifecycleSweep(unittest.TestCase):
+
+    def test_rows_in_order_and_resumable(self) -> None:
+        profiles = {
+            "A": PersonProfile("A", 50, 85, TaxDeferredAccount("RRSP", 100_000.0),
+                               TaxFreeAccount("TFSA", 20_000.0),
+                               TaxableAccount("Taxable", 10_000.0), 10_000.0, 7_000.0),
+        }
+        args = (profiles,
+                [("TFSA", contrib_max_tfsa_first), ("RRSP", contrib_max_rrsp_first)],
+                [("Taxable", strategy_spend_taxable_first), ("RRSP", strategy_spend_rrsp_first)],
+                [50_000, 70_000])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "lifecycle.jsonl")
+            first = lifecycle_sweep(*args, checkpoint_path=path, years_working=10)
+            second = lifecycle_sweep(*args, checkpoint_path=path, years_working=10)
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 8)
+        self.assertEqual((first[0]["contrib_strategy"], first[0]["annual_spending"]),
+                         ("TFSA", 50_000.0))
+        self.assertIn("total_tax_paid", first[0])
+        self.assertNotIn("history", first[0])
+
+
+if __name__ == "__main__":
+    unittest.main()